@@ -3,14 +3,20 @@
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
+import json
 from app.models.evaluation import (
     EvaluationRequest,
     EvaluationResponse
 )
-from app.services.evaluation_generator import generate_complete_evaluation
+from app.services.evaluation_generator import (
+    generate_complete_evaluation,
+    generate_complete_evaluation_stream
+)
 from app.services.answer_analyzer import generate_instant_feedback
+from app.services.evaluation_session import get_evaluation_session_store
 
 router = APIRouter()
 
@@ -19,6 +25,10 @@ class InstantFeedbackRequest(BaseModel):
     question: str = Field(..., description="질문")
     answer: str = Field(..., description="답변")
     questionType: str = Field(default="competency", description="질문 타입")
+    interviewId: Optional[str] = Field(
+        default=None,
+        description="인터뷰 ID (지정 시 답변을 백그라운드에서 분석해 두고 최종 평가에 재사용)"
+    )
 
 class InstantFeedbackResponse(BaseModel):
     feedback: str = Field(..., description="전체 피드백")
@@ -52,10 +62,12 @@ async def generate_evaluation(request: EvaluationRequest):
         job_posting = request.jobPosting if request.jobPosting else None
         
         # 평가 생성
-        evaluation_result = generate_complete_evaluation(
+        evaluation_result = await generate_complete_evaluation(
             conversation_history=conversation_list,
             candidate_profile=candidate_profile,
-            job_posting=job_posting
+            job_posting=job_posting,
+            scoring_mode=request.scoringMode,
+            interview_id=request.interviewId
         )
         
         return EvaluationResponse(
@@ -75,6 +87,55 @@ async def generate_evaluation(request: EvaluationRequest):
         )
 
 
+@router.post("/generate-evaluation-stream")
+async def generate_evaluation_stream(request: EvaluationRequest):
+    """
+    인터뷰 평가 생성 (Streaming)
+    
+    Server-Sent Events (SSE)로 답변별 분석 결과 → 집계 점수 → 종합 피드백 필드 순서로
+    완료되는 대로 전송합니다. 마지막 done 이벤트에 /generate-evaluation과 같은 평가가 담깁니다.
+    """
+    if not request.conversationHistory or len(request.conversationHistory) < 2:
+        raise HTTPException(
+            status_code=400,
+            detail="최소 2개 이상의 대화 기록이 필요합니다."
+        )
+    
+    # 대화 히스토리 변환
+    conversation_list = [
+        {"role": msg["role"], "content": msg["content"]}
+        for msg in request.conversationHistory
+    ]
+    
+    async def event_generator():
+        try:
+            async for event in generate_complete_evaluation_stream(
+                conversation_history=conversation_list,
+                candidate_profile=request.candidateProfile,
+                job_posting=request.jobPosting,
+                scoring_mode=request.scoringMode,
+                interview_id=request.interviewId
+            ):
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+            
+            # 스트리밍 종료 신호
+            yield "data: [DONE]\n\n"
+        
+        except Exception as e:
+            print(f"[Evaluation API] 평가 Streaming 오류: {e}")
+            yield f"data: {json.dumps({'type': 'error', 'error': str(e)}, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # Nginx 버퍼링 비활성화
+        }
+    )
+
+
 @router.post("/instant-feedback", response_model=InstantFeedbackResponse)
 async def get_instant_feedback(request: InstantFeedbackRequest):
     """
@@ -89,6 +150,14 @@ async def get_instant_feedback(request: InstantFeedbackRequest):
                 detail="질문과 답변이 모두 필요합니다."
             )
         
+        # 최종 평가용 답변 분석을 백그라운드로 예약 (피드백 응답을 기다리게 하지 않음)
+        if request.interviewId:
+            get_evaluation_session_store().submit(
+                request.interviewId,
+                request.question,
+                request.answer
+            )
+        
         # 답변이 너무 짧으면 경고
         if len(request.answer.strip()) < 10:
             return InstantFeedbackResponse(
@@ -99,7 +168,7 @@ async def get_instant_feedback(request: InstantFeedbackRequest):
             )
         
         # 즉시 피드백 생성
-        feedback_result = generate_instant_feedback(
+        feedback_result = await generate_instant_feedback(
             question=request.question,
             answer=request.answer,
             question_type=request.questionType
@@ -9,6 +9,13 @@ from datetime import datetime
 import psutil
 import os
 
+from app.services.embedding_cache import get_embedding_cache_stats
+from app.services.matching_reason_store import get_matching_reason_cache_stats
+from app.services.evaluation_session import get_evaluation_session_stats
+from app.services.evaluation_cache import get_evaluation_cache_stats
+from app.services.audio_transcoding import get_transcoding_stats
+from app.services.tts_cache import get_tts_cache_stats
+
 router = APIRouter()
 
 
@@ -44,6 +51,12 @@ async def detailed_health_check():
                 "count": psutil.cpu_count(),
             },
             "uptime_seconds": round(process.create_time()),
+            "embedding_cache": get_embedding_cache_stats(),
+            "matching_reason_cache": get_matching_reason_cache_stats(),
+            "evaluation_sessions": get_evaluation_session_stats(),
+            "evaluation_cache": get_evaluation_cache_stats(),
+            "stt_transcoding": get_transcoding_stats(),
+            "tts_cache": get_tts_cache_stats(),
         },
     }
 
@@ -2,7 +2,10 @@
 매칭 API 라우터
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List
+import json
 from app.models.matching import (
     MatchingRequest,
     MatchingResult,
@@ -11,13 +14,16 @@ from app.models.matching import (
     RecommendCandidatesRequest,
     RecommendCandidatesResponse,
     JobRecommendation,
-    CandidateRecommendation
+    CandidateRecommendation,
+    MatchingReasonResponse
 )
 from app.services.matching_service import (
     match_candidate_with_job,
     find_best_matches_for_candidate,
-    find_best_candidates_for_job
+    find_best_candidates_for_job,
+    MATCHING_REASON_TIMEOUT
 )
+from app.services.matching_reason_store import get_matching_reason_store
 
 router = APIRouter()
 
@@ -31,7 +37,7 @@ async def calculate_match(request: MatchingRequest):
         candidate_dict = request.candidateProfile.model_dump()
         job_dict = request.jobPosting.model_dump()
         
-        result = match_candidate_with_job(candidate_dict, job_dict)
+        result = await match_candidate_with_job(candidate_dict, job_dict)
         
         return MatchingResult(
             matchingScore=result["matchingScore"],
@@ -53,19 +59,26 @@ async def recommend_jobs(request: RecommendJobsRequest):
     """
     try:
         candidate_dict = request.candidateProfile.model_dump()
-        jobs_list = [job.model_dump() for job in request.jobPostings]
+        # 공고 리스트가 없으면 서버 측 공고 인덱스에서 검색
+        jobs_list = (
+            [job.model_dump() for job in request.jobPostings]
+            if request.jobPostings is not None
+            else None
+        )
         
-        matches = find_best_matches_for_candidate(
+        matches = await find_best_matches_for_candidate(
             candidate_dict,
             jobs_list,
-            request.topK
+            request.topK,
+            defer_reasons=request.deferReasons
         )
         
         recommendations = [
             JobRecommendation(
                 jobPosting=match["jobPosting"],
                 matchingScore=match["matchingScore"],
-                matchingReason=match["matchingReason"]
+                matchingReason=match["matchingReason"],
+                reasonId=match["reasonId"]
             )
             for match in matches
         ]
@@ -90,19 +103,27 @@ async def recommend_candidates(request: RecommendCandidatesRequest):
     """
     try:
         job_dict = request.jobPosting.model_dump()
-        candidates_list = [candidate.model_dump() for candidate in request.candidateProfiles]
+        # 후보자 리스트가 없으면 서버 측 구직자 인덱스에서 필터 검색
+        candidates_list = (
+            [candidate.model_dump() for candidate in request.candidateProfiles]
+            if request.candidateProfiles is not None
+            else None
+        )
         
-        matches = find_best_candidates_for_job(
+        matches = await find_best_candidates_for_job(
             job_dict,
             candidates_list,
-            request.topK
+            request.topK,
+            request.filters.model_dump() if request.filters else None,
+            defer_reasons=request.deferReasons
         )
         
         recommendations = [
             CandidateRecommendation(
                 candidate=match["candidate"],
                 matchingScore=match["matchingScore"],
-                matchingReason=match["matchingReason"]
+                matchingReason=match["matchingReason"],
+                reasonId=match["reasonId"]
             )
             for match in matches
         ]
@@ -119,3 +140,70 @@ async def recommend_candidates(request: RecommendCandidatesRequest):
             detail=f"후보자 추천 중 오류가 발생했습니다: {str(e)}"
         )
 
+
+
+@router.get("/matching-reasons/stream")
+async def stream_matching_reasons(
+    ids: List[str] = Query(..., description="매칭 근거 핸들 (reasonId) 목록"),
+    timeout: float = Query(default=None, description="최대 대기 시간 (초)")
+):
+    """
+    매칭 근거 스트리밍 (Server-Sent Events)
+    
+    deferReasons로 받은 reasonId들의 근거를 완료되는 순서대로 전송합니다.
+    이미 완료된 근거는 즉시, 알 수 없는 핸들은 status=unknown으로 전송합니다.
+    """
+    store = get_matching_reason_store()
+    
+    async def event_generator():
+        try:
+            async for reason_id, status, reason in store.stream(
+                ids,
+                timeout=MATCHING_REASON_TIMEOUT if timeout is None else timeout
+            ):
+                event = {"reasonId": reason_id, "status": status, "matchingReason": reason}
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+            
+            # 스트리밍 종료 신호
+            yield "data: [DONE]\n\n"
+        
+        except Exception as e:
+            print(f"[Matching API] 매칭 근거 스트리밍 오류: {e}")
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # Nginx 버퍼링 비활성화
+        }
+    )
+
+
+@router.get("/matching-reasons/{reason_id}", response_model=MatchingReasonResponse)
+async def get_matching_reason(
+    reason_id: str,
+    wait: float = Query(default=0, ge=0, description="생성 중이면 최대 대기 시간 (초)")
+):
+    """
+    매칭 근거 조회 (deferReasons로 받은 reasonId)
+    
+    wait초 안에 완료되지 않으면 status=timeout, wait 없이 조회한 생성 중 근거는 status=pending
+    """
+    store = get_matching_reason_store()
+    
+    if store.status(reason_id) == "unknown":
+        raise HTTPException(
+            status_code=404,
+            detail=f"알 수 없는 매칭 근거입니다: {reason_id}"
+        )
+    
+    reason = await store.wait(reason_id, timeout=wait) if wait else store.get(reason_id)
+    
+    return MatchingReasonResponse(
+        reasonId=reason_id,
+        status="done" if reason is not None else ("timeout" if wait else "pending"),
+        matchingReason=reason
+    )
@@ -0,0 +1,131 @@
+"""
+매칭 인덱스 API 라우터
+서버 측 공고/구직자 인덱스 등록/삭제
+(recommend-jobs / recommend-candidates에서 리스트 없이 검색)
+"""
+
+from fastapi import APIRouter, HTTPException
+from typing import Dict
+from app.models.matching import (
+    IndexJobPostingsRequest,
+    IndexCandidateProfilesRequest,
+    IndexUpsertResponse,
+    IndexDeleteResponse
+)
+from app.services.matching_service import (
+    index_job_postings,
+    remove_job_posting,
+    index_candidate_profiles,
+    remove_candidate_profile
+)
+from app.services.vector_index import get_job_index, get_candidate_index
+from app.utils.executor import run_cpu_bound
+
+router = APIRouter()
+
+
+# pgvector 백엔드는 크기/통계 조회가 동기 DB 쿼리이므로 작업 스레드에서 실행
+def _index_size(get_index) -> int:
+    return len(get_index())
+
+
+def _index_stats(get_index) -> Dict:
+    return get_index().stats()
+
+
+@router.put("/jobs", response_model=IndexUpsertResponse)
+async def upsert_job_postings(request: IndexJobPostingsRequest):
+    """
+    공고 인덱스에 공고 등록/갱신 (id 기준)
+    """
+    try:
+        jobs_list = [job.model_dump() for job in request.jobPostings]
+        upserted = await index_job_postings(jobs_list)
+        
+        return IndexUpsertResponse(
+            upserted=upserted,
+            total=await run_cpu_bound(_index_size, get_job_index)
+        )
+    
+    except Exception as e:
+        print(f"[Matching Index API] 공고 등록 오류: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"공고 인덱스 등록 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+@router.delete("/jobs/{job_id}", response_model=IndexDeleteResponse)
+async def delete_job_posting(job_id: str):
+    """
+    공고 인덱스에서 공고 삭제
+    """
+    deleted = await remove_job_posting(job_id)
+    
+    if not deleted:
+        raise HTTPException(
+            status_code=404,
+            detail=f"인덱스에 없는 공고입니다: {job_id}"
+        )
+    
+    return IndexDeleteResponse(
+        deleted=deleted,
+        total=await run_cpu_bound(_index_size, get_job_index)
+    )
+
+
+@router.get("/jobs/stats")
+async def job_index_stats():
+    """
+    공고 인덱스 상태 조회
+    """
+    return await run_cpu_bound(_index_stats, get_job_index)
+
+
+@router.put("/candidates", response_model=IndexUpsertResponse)
+async def upsert_candidate_profiles(request: IndexCandidateProfilesRequest):
+    """
+    구직자 인덱스에 프로필 등록/갱신 (userId 기준)
+    """
+    try:
+        candidates_list = [candidate.model_dump() for candidate in request.candidateProfiles]
+        upserted = await index_candidate_profiles(candidates_list)
+        
+        return IndexUpsertResponse(
+            upserted=upserted,
+            total=await run_cpu_bound(_index_size, get_candidate_index)
+        )
+    
+    except Exception as e:
+        print(f"[Matching Index API] 구직자 등록 오류: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"구직자 인덱스 등록 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+@router.delete("/candidates/{user_id}", response_model=IndexDeleteResponse)
+async def delete_candidate_profile(user_id: str):
+    """
+    구직자 인덱스에서 프로필 삭제
+    """
+    deleted = await remove_candidate_profile(user_id)
+    
+    if not deleted:
+        raise HTTPException(
+            status_code=404,
+            detail=f"인덱스에 없는 구직자입니다: {user_id}"
+        )
+    
+    return IndexDeleteResponse(
+        deleted=deleted,
+        total=await run_cpu_bound(_index_size, get_candidate_index)
+    )
+
+
+@router.get("/candidates/stats")
+async def candidate_index_stats():
+    """
+    구직자 인덱스 상태 조회
+    """
+    return await run_cpu_bound(_index_stats, get_candidate_index)
@@ -19,12 +19,50 @@ from app.services.question_generator import (
 )
 import json
 import os
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 router = APIRouter()
 
 # OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# 질문 세트 고정 질문 (TTS 캐시 미리 합성 대상)
+ICE_BREAKING_QUESTION = "간단하게 자기소개 부탁드립니다. 본인의 강점과 경험을 중심으로 말씀해주세요."
+MOTIVATION_QUESTION = "{job_title}에 지원하신 이유는 무엇인가요?"
+
+# 생성된 역량 질문이 8개가 안 될 때 채우는 기본 질문
+DEFAULT_COMPETENCY_QUESTIONS = [
+    {"text": "가장 어려웠던 프로젝트 경험과 그것을 어떻게 해결했는지 말씀해주세요.", "category": "문제 해결", "max_follow_ups": 2},
+    {"text": "팀원과 의견 충돌이 있었던 경험이 있나요? 어떻게 해결하셨나요?", "category": "커뮤니케이션", "max_follow_ups": 2},
+    {"text": "새로운 기술이나 도구를 빠르게 학습해야 했던 경험에 대해 말씀해주세요.", "category": "유연성/사고력", "max_follow_ups": 1},
+    {"text": "업무 중 우선순위를 정하는 본인만의 기준이 있나요?", "category": "협업/성실성", "max_follow_ups": 1},
+    {"text": "본인의 핵심 기술 역량은 무엇이며, 실제로 어떻게 활용해보셨나요?", "category": "기술 역량", "max_follow_ups": 2},
+    {"text": "프로젝트 마감 기한을 맞추지 못할 상황이라면 어떻게 대처하시겠습니까?", "category": "문제 해결", "max_follow_ups": 1}
+]
+
+# 질문 세트 생성 실패 시 반환하는 기본 질문 세트
+FALLBACK_QUESTION_SET = [
+    {"id": "q1", "text": "간단하게 자기소개 부탁드립니다.", "type": "ice_breaking", "category": "아이스브레이킹", "max_follow_ups": 0},
+    {"id": "q2", "text": "이 직무에 지원하신 이유는 무엇인가요?", "type": "common", "category": "지원 동기", "max_follow_ups": 1},
+    {"id": "q3", "text": "본인의 가장 큰 강점은 무엇이라고 생각하시나요?", "type": "competency", "category": "자기 인식", "max_follow_ups": 1},
+    {"id": "q4", "text": "가장 어려웠던 프로젝트 경험에 대해 말씀해주세요.", "type": "competency", "category": "문제 해결", "max_follow_ups": 2},
+    {"id": "q5", "text": "팀원과 협업할 때 중요하게 생각하는 가치는 무엇인가요?", "type": "competency", "category": "협업", "max_follow_ups": 1},
+    {"id": "q6", "text": "새로운 기술을 학습할 때 어떤 방식으로 접근하시나요?", "type": "competency", "category": "학습 능력", "max_follow_ups": 1},
+    {"id": "q7", "text": "업무 우선순위를 어떻게 설정하시나요?", "type": "competency", "category": "시간 관리", "max_follow_ups": 1},
+    {"id": "q8", "text": "의견 충돌 상황을 어떻게 해결하시나요?", "type": "competency", "category": "커뮤니케이션", "max_follow_ups": 2},
+    {"id": "q9", "text": "실패한 경험과 그로부터 배운 점을 말씀해주세요.", "type": "competency", "category": "성장", "max_follow_ups": 2},
+    {"id": "q10", "text": "5년 후 본인의 모습은 어떨 것 같나요?", "type": "competency", "category": "비전", "max_follow_ups": 1}
+]
+
+
+def fixed_question_texts() -> list:
+    """질문 세트에 그대로 나가는 고정 질문 문장 (공고 없는 지원 동기 질문 포함)"""
+    return [
+        ICE_BREAKING_QUESTION,
+        MOTIVATION_QUESTION.format(job_title="이 직무"),
+        *(question["text"] for question in DEFAULT_COMPETENCY_QUESTIONS),
+        *(question["text"] for question in FALLBACK_QUESTION_SET),
+    ]
 
 
 @router.post("/generate-question", response_model=QuestionGenerationResponse)
@@ -40,7 +78,7 @@ async def generate_question(request: QuestionGenerationRequest):
             candidate_profile = request.candidateProfile.model_dump() if request.candidateProfile else None
             job_posting = request.jobPosting.model_dump() if request.jobPosting else None
             
-            question = generate_first_question(
+            question = await generate_first_question(
                 candidate_profile=candidate_profile,
                 job_posting=job_posting
             )
@@ -72,7 +110,7 @@ async def generate_question(request: QuestionGenerationRequest):
             candidate_profile = request.candidateProfile.model_dump() if request.candidateProfile else None
             job_posting = request.jobPosting.model_dump() if request.jobPosting else None
             
-            question = generate_next_question(
+            question = await generate_next_question(
                 conversation_history=conversation_list,
                 last_answer=request.lastAnswer,
                 candidate_profile=candidate_profile,
@@ -134,7 +172,7 @@ async def generate_question_stream(request: QuestionGenerationRequest):
         async def event_generator():
             try:
                 # OpenAI Streaming 호출
-                for content_chunk in generate_next_question_stream(
+                async for content_chunk in generate_next_question_stream(
                     conversation_history=conversation_list,
                     last_answer=request.lastAnswer,
                     candidate_profile=candidate_profile,
@@ -192,7 +230,7 @@ async def generate_question_set(request: QuestionSetRequest):
         # Q1: 아이스브레이킹 (고정)
         questions.append(QuestionItem(
             id="q1",
-            text="간단하게 자기소개 부탁드립니다. 본인의 강점과 경험을 중심으로 말씀해주세요.",
+            text=ICE_BREAKING_QUESTION,
             type="ice_breaking",
             category="아이스브레이킹",
             max_follow_ups=0
@@ -202,7 +240,7 @@ async def generate_question_set(request: QuestionSetRequest):
         job_title = request.jobPosting.position if request.jobPosting and request.jobPosting.position else "이 직무"
         questions.append(QuestionItem(
             id="q2",
-            text=f"{job_title}에 지원하신 이유는 무엇인가요?",
+            text=MOTIVATION_QUESTION.format(job_title=job_title),
             type="common",
             category="지원 동기",
             max_follow_ups=1
@@ -255,7 +293,7 @@ async def generate_question_set(request: QuestionSetRequest):
 
 JSON 형식으로만 응답해주세요."""
 
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=os.getenv("OPENAI_MODEL", "gpt-4o"),
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -280,18 +318,9 @@ JSON 형식으로만 응답해주세요."""
             ))
         
         # 8개가 안 되면 기본 질문으로 채우기
-        default_questions = [
-            {"text": "가장 어려웠던 프로젝트 경험과 그것을 어떻게 해결했는지 말씀해주세요.", "category": "문제 해결", "max_follow_ups": 2},
-            {"text": "팀원과 의견 충돌이 있었던 경험이 있나요? 어떻게 해결하셨나요?", "category": "커뮤니케이션", "max_follow_ups": 2},
-            {"text": "새로운 기술이나 도구를 빠르게 학습해야 했던 경험에 대해 말씀해주세요.", "category": "유연성/사고력", "max_follow_ups": 1},
-            {"text": "업무 중 우선순위를 정하는 본인만의 기준이 있나요?", "category": "협업/성실성", "max_follow_ups": 1},
-            {"text": "본인의 핵심 기술 역량은 무엇이며, 실제로 어떻게 활용해보셨나요?", "category": "기술 역량", "max_follow_ups": 2},
-            {"text": "프로젝트 마감 기한을 맞추지 못할 상황이라면 어떻게 대처하시겠습니까?", "category": "문제 해결", "max_follow_ups": 1}
-        ]
-        
         while len(questions) < 10:
             idx = len(questions)
-            default_q = default_questions[idx - 3] if idx - 3 < len(default_questions) else default_questions[0]
+            default_q = DEFAULT_COMPETENCY_QUESTIONS[idx - 3] if idx - 3 < len(DEFAULT_COMPETENCY_QUESTIONS) else DEFAULT_COMPETENCY_QUESTIONS[0]
             questions.append(QuestionItem(
                 id=f"q{idx + 1}",
                 text=default_q["text"],
@@ -317,17 +346,6 @@ JSON 형식으로만 응답해주세요."""
         
         # 에러 발생 시 기본 질문 세트 반환
         print("[Question API] Fallback 질문 세트 반환")
-        fallback_questions = [
-            QuestionItem(id="q1", text="간단하게 자기소개 부탁드립니다.", type="ice_breaking", category="아이스브레이킹", max_follow_ups=0),
-            QuestionItem(id="q2", text="이 직무에 지원하신 이유는 무엇인가요?", type="common", category="지원 동기", max_follow_ups=1),
-            QuestionItem(id="q3", text="본인의 가장 큰 강점은 무엇이라고 생각하시나요?", type="competency", category="자기 인식", max_follow_ups=1),
-            QuestionItem(id="q4", text="가장 어려웠던 프로젝트 경험에 대해 말씀해주세요.", type="competency", category="문제 해결", max_follow_ups=2),
-            QuestionItem(id="q5", text="팀원과 협업할 때 중요하게 생각하는 가치는 무엇인가요?", type="competency", category="협업", max_follow_ups=1),
-            QuestionItem(id="q6", text="새로운 기술을 학습할 때 어떤 방식으로 접근하시나요?", type="competency", category="학습 능력", max_follow_ups=1),
-            QuestionItem(id="q7", text="업무 우선순위를 어떻게 설정하시나요?", type="competency", category="시간 관리", max_follow_ups=1),
-            QuestionItem(id="q8", text="의견 충돌 상황을 어떻게 해결하시나요?", type="competency", category="커뮤니케이션", max_follow_ups=2),
-            QuestionItem(id="q9", text="실패한 경험과 그로부터 배운 점을 말씀해주세요.", type="competency", category="성장", max_follow_ups=2),
-            QuestionItem(id="q10", text="5년 후 본인의 모습은 어떨 것 같나요?", type="competency", category="비전", max_follow_ups=1)
-        ]
+        fallback_questions = [QuestionItem(**question) for question in FALLBACK_QUESTION_SET]
         return QuestionSetResponse(questions=fallback_questions)
 
@@ -7,17 +7,118 @@ import asyncio
 import json
 import os
 import base64
-import io
-from typing import List, Dict
+import struct
+import time
+from typing import AsyncIterator, List, Dict, Optional
 from openai import AsyncOpenAI
 from elevenlabs.client import AsyncElevenLabs
+from app.utils.executor import run_cpu_bound
+from app.services.audio_transcoding import STT_TRANSCODE_POLICY, prepare_for_transcription
+from app.services.long_transcription import encode_segment
+from app.services.tts_cache import get_tts_cache, prewarm_tts_cache, tts_cache_key
+from app.utils.text_segmenter import SentenceSegmenter
+from app.services.voice_activity import (
+    VAD_SAMPLE_RATE,
+    EndpointDetector,
+    WebmChunkBuffer,
+    ms_to_samples,
+    pcm_to_wav
+)
+
+# VAD 구간 업로드 형식: Opus(ogg)로 인코딩, 변환 정책이 never(ffmpeg 없음)면 WAV
+STREAMING_SEGMENT_FORMAT = "wav" if STT_TRANSCODE_POLICY == "never" else "opus"
 
 router = APIRouter()
 
+
 # API 클라이언트 초기화
 openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 elevenlabs_client = AsyncElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
 
+# 파이프라인 모드: LLM 응답을 문장 단위로 끊어 문장이 완성되는 즉시 TTS 시작
+# (false면 질문 전체 생성 후 TTS)
+STREAMING_INTERVIEW_PIPELINED = os.getenv("STREAMING_INTERVIEW_PIPELINED", "true").lower() == "true"
+# 이보다 짧은 문장은 다음 문장과 합쳐서 TTS 요청
+STREAMING_TTS_MIN_SENTENCE_CHARS = int(os.getenv("STREAMING_TTS_MIN_SENTENCE_CHARS", "10"))
+# 동시에 합성할 수 있는 문장 수 (재생 중인 문장 + 미리 합성할 문장)
+STREAMING_TTS_PREFETCH = int(os.getenv("STREAMING_TTS_PREFETCH", "2"))
+
+# ElevenLabs 스트리밍 TTS 설정
+# - 출력 형식: mp3_44100_128(기본, 고음질) / mp3_22050_32, pcm_16000 등 저지연 형식
+# - 지연 최적화 단계: 0(없음) ~ 4(최대, 숫자/약어 정규화 생략), 비우면 API 기본값
+ELEVENLABS_VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID", "pNInz6obpgDQGcFmaJgB")  # Adam (남성)
+ELEVENLABS_MODEL_ID = os.getenv("ELEVENLABS_MODEL_ID", "eleven_multilingual_v2")
+ELEVENLABS_OUTPUT_FORMAT = os.getenv("ELEVENLABS_OUTPUT_FORMAT", "mp3_44100_128")
+ELEVENLABS_OPTIMIZE_STREAMING_LATENCY = os.getenv("ELEVENLABS_OPTIMIZE_STREAMING_LATENCY", "3") or None
+
+# WebSocket 프로토콜 버전
+# - 1: 오디오를 JSON + base64로 전송 (기존)
+# - 2: 오디오는 바이너리 프레임, 제어 메시지만 JSON
+#   프레임 = 헤더 6바이트 [유형 1B][플래그 1B][순번 4B, big-endian] + 오디오
+PROTOCOL_JSON = 1
+PROTOCOL_BINARY = 2
+FRAME_CLIENT_AUDIO = 0x01
+FRAME_AI_AUDIO = 0x02
+_FRAME_HEADER = struct.Struct("!BBI")
+
+# 서버 VAD 기본값 (hello의 "vad"로 세션별 지정 가능)
+# - true: 청크를 누적해 서버에서 발화 끝 감지, 쉼 구간마다 부분 STT
+#   (hello 없이 MediaRecorder timeslice 조각을 보내는 웹 클라이언트도 조각을 한 발화로 모음)
+# - false: 오디오 메시지 1개 = 발화 1개 (녹음 전체를 한 메시지로 보내는 클라이언트)
+STREAMING_VAD_ENABLED = os.getenv("STREAMING_VAD_ENABLED", "true").lower() == "true"
+# 음성 감지 후 청크가 이 시간(ms) 동안 오지 않으면 발화 끝으로 처리
+STREAMING_VAD_IDLE_MS = int(os.getenv("STREAMING_VAD_IDLE_MS", "1200"))
+
+# 캐시된 음성을 보낼 때의 청크 크기 (스트리밍 합성 청크와 비슷한 크기)
+TTS_CACHE_CHUNK_BYTES = 16 * 1024
+
+# 연결 직후 인사말 (모든 세션에서 같으므로 TTS 캐시 미리 합성 대상)
+INITIAL_GREETING = (
+    "안녕하세요! AI 면접관입니다. 오늘 인터뷰를 시작하겠습니다. "
+    "먼저 간단하게 자기소개를 부탁드립니다."
+)
+
+
+def pack_audio_frame(frame_type: int, sequence: int, payload: bytes) -> bytes:
+    """오디오 바이너리 프레임 생성 (프로토콜 2)"""
+    return _FRAME_HEADER.pack(frame_type, 0, sequence & 0xFFFFFFFF) + payload
+
+
+def unpack_audio_frame(frame: bytes) -> tuple:
+    """오디오 바이너리 프레임 해석 → (유형, 순번, 오디오), 헤더보다 짧으면 ValueError"""
+    if len(frame) < _FRAME_HEADER.size:
+        raise ValueError(f"프레임이 너무 짧습니다: {len(frame)}바이트")
+    frame_type, _flags, sequence = _FRAME_HEADER.unpack_from(frame)
+    return frame_type, sequence, frame[_FRAME_HEADER.size:]
+
+
+def _elevenlabs_cache_key(text: str) -> str:
+    """ElevenLabs 음성 캐시 키"""
+    return tts_cache_key(text, ELEVENLABS_VOICE_ID, ELEVENLABS_MODEL_ID, 1.0, ELEVENLABS_OUTPUT_FORMAT)
+
+
+async def _elevenlabs_stream(text: str) -> AsyncIterator[bytes]:
+    """ElevenLabs /stream 엔드포인트 호출 (빈 청크 제외)"""
+    async for chunk in elevenlabs_client.text_to_speech.convert_as_stream(
+        voice_id=ELEVENLABS_VOICE_ID,
+        text=text,
+        model_id=ELEVENLABS_MODEL_ID,
+        output_format=ELEVENLABS_OUTPUT_FORMAT,
+        optimize_streaming_latency=ELEVENLABS_OPTIMIZE_STREAMING_LATENCY
+    ):
+        if chunk:
+            yield chunk
+
+
+async def _synthesize_elevenlabs(text: str) -> bytes:
+    """ElevenLabs 음성 전체 합성 (미리 합성용)"""
+    return b"".join([chunk async for chunk in _elevenlabs_stream(text)])
+
+
+async def prewarm_interview_audio() -> int:
+    """인사말 음성 미리 합성"""
+    return await prewarm_tts_cache([INITIAL_GREETING], _elevenlabs_cache_key, _synthesize_elevenlabs)
+
 
 class StreamingInterviewPipeline:
     """스트리밍 면접 파이프라인"""
@@ -27,6 +128,71 @@ class StreamingInterviewPipeline:
         self.conversation_history: List[Dict] = []
         self.is_processing = False
         self.is_first_question = True
+        # 첫 오디오까지 지연 측정 (답변 인식 완료 시점 기준)
+        self._turn_started: Optional[float] = None
+        self._first_audio_ms: Optional[float] = None
+        # 협상된 프로토콜 버전과 송수신 오디오 프레임 순번
+        # (AI 발화 하나는 ai_audio_start 시점의 프로토콜로 끝까지 전송)
+        self.protocol = PROTOCOL_JSON
+        self._audio_protocol = PROTOCOL_JSON
+        self._sent_sequence = 0
+        self._received_sequence: Optional[int] = None
+        # 답변 오디오 수신 여부 (첫 오디오 이후의 hello는 무시)
+        self.audio_received = False
+        # 응답 대기열: 처리 중에 들어온 발화도 버리지 않고 순서대로 응답
+        #   ("speak", 읽을 문장) | ("audio", WebM 발화) | ("transcript", 변환 결과 Task)
+        self._turns: asyncio.Queue = asyncio.Queue()
+        self._turn_worker: Optional[asyncio.Task] = None
+        # 서버 VAD 상태
+        self.vad_enabled = STREAMING_VAD_ENABLED
+        self._vad_buffer = WebmChunkBuffer()
+        self._vad_detector = EndpointDetector()
+        self._vad_inbox: List[bytes] = []
+        self._vad_segments: List[asyncio.Task] = []
+        self._vad_wakeup = asyncio.Event()
+        self._vad_end_requested = False
+        self._vad_task: Optional[asyncio.Task] = None
+        self._vad_pcm = None
+    
+    def start(self):
+        """응답 작업자 시작 (서버 VAD 사용 시 발화 감지 작업 포함)"""
+        self._turn_worker = asyncio.create_task(self._run_turns())
+        if self.vad_enabled:
+            self._vad_task = asyncio.create_task(self._run_vad())
+    
+    def set_vad(self, enabled: bool):
+        """서버 VAD 사용 여부 변경 (첫 답변 오디오 전 hello에서만 호출)"""
+        self.vad_enabled = enabled
+        if enabled and self._vad_task is None and self._turn_worker is not None:
+            self._vad_task = asyncio.create_task(self._run_vad())
+        elif not enabled and self._vad_task is not None:
+            self._vad_task.cancel()
+            self._vad_task = None
+    
+    def say(self, text: str):
+        """문장 음성 변환을 응답 대기열에 추가 (인사말 - 이후 답변 응답보다 먼저 재생)"""
+        self._turns.put_nowait(("speak", text))
+    
+    async def close(self):
+        """진행 중인 작업 정리"""
+        for task in (self._turn_worker, self._vad_task, *self._vad_segments):
+            if task is not None:
+                task.cancel()
+    
+    async def _run_turns(self):
+        """대기열의 발화를 순서대로 처리 (한 번에 한 응답)"""
+        while True:
+            kind, payload = await self._turns.get()
+            if kind == "speak":
+                await self.speak_question(payload)
+                continue
+            if kind == "audio":
+                await self.process_audio_stream(payload)
+                continue
+            
+            transcript = await payload
+            if transcript:
+                await self.respond_to_transcript(transcript)
         
     async def process_audio_stream(self, audio_data: bytes):
         """
@@ -35,26 +201,42 @@ class StreamingInterviewPipeline:
         Args:
             audio_data: WebM 형식 오디오 데이터
         """
+        # 1단계: STT (Whisper)
+        transcript = await self.transcribe_audio(audio_data)
+        
+        if not transcript:
+            return
+        
+        await self.respond_to_transcript(transcript)
+    
+    async def respond_to_transcript(self, transcript: str):
+        """
+        인식된 답변 → AI 응답 → 음성
+        
+        Args:
+            transcript: 인식된 사용자 답변
+        """
         try:
             self.is_processing = True
             
-            # 1단계: STT (Whisper)
-            transcript = await self.transcribe_audio(audio_data)
-            
-            if not transcript:
-                return
-            
             # 프론트엔드에 텍스트 전송 (자막용)
             await self.websocket.send_json({
                 "type": "user_transcript",
                 "text": transcript
             })
             
-            # 2단계: LLM (GPT-4o Streaming)
-            question = await self.generate_next_question(transcript)
+            self._turn_started = time.perf_counter()
+            self._first_audio_ms = None
             
-            # 3단계: TTS (ElevenLabs Streaming)
-            await self.speak_question(question)
+            if STREAMING_INTERVIEW_PIPELINED:
+                # 2+3단계: LLM 문장이 완성되는 대로 TTS (생성과 음성 변환을 겹쳐 실행)
+                await self.generate_and_speak(transcript)
+            else:
+                # 2단계: LLM (GPT-4o Streaming)
+                question = await self.generate_next_question(transcript)
+                
+                # 3단계: TTS (ElevenLabs Streaming)
+                await self.speak_question(question)
             
         except Exception as e:
             print(f"[Pipeline] 에러: {e}")
@@ -79,33 +261,17 @@ class StreamingInterviewPipeline:
             변환된 텍스트
         """
         try:
-            # pydub로 WebM → WAV 변환
-            try:
-                from pydub import AudioSegment
-                
-                audio = AudioSegment.from_file(io.BytesIO(audio_data), format="webm")
-                wav_io = io.BytesIO()
-                audio.export(wav_io, format="wav")
-                wav_io.seek(0)
-                
-                # Whisper API 호출
-                response = await openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=("audio.wav", wav_io, "audio/wav"),
-                    language="ko"
-                )
-                
-                return response.text
-                
-            except ImportError:
-                print("[STT] Warning: pydub 없음, WebM 직접 전송 시도")
-                # pydub 없으면 WebM 직접 전송
-                response = await openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=("audio.webm", io.BytesIO(audio_data), "audio/webm"),
-                    language="ko"
-                )
-                return response.text
+            # 지원 형식(WebM/Opus)은 그대로, 필요한 경우에만 작은 코덱으로 변환
+            file = await prepare_for_transcription(audio_data)
+            
+            # Whisper API 호출
+            response = await openai_client.audio.transcriptions.create(
+                model="whisper-1",
+                file=file,
+                language="ko"
+            )
+            
+            return response.text
             
         except Exception as e:
             print(f"[STT] 에러: {e}")
@@ -113,15 +279,55 @@ class StreamingInterviewPipeline:
             traceback.print_exc()
             return ""
     
-    async def generate_next_question(self, user_answer: str) -> str:
+    async def _transcribe_segment(self, pcm) -> str:
+        """
+        VAD로 나눈 PCM 구간 → 텍스트 (부분 결과는 자막용으로 바로 전송)
+        
+        구간은 Opus(ogg)로 인코딩해 업로드한다 (WAV 대비 약 1/10 크기).
+        인코딩에 실패하면 WAV로 보낸다.
+        
+        Args:
+            pcm: 16kHz 모노 int16 PCM
+            
+        Returns:
+            변환된 텍스트 (실패 시 빈 문자열)
+        """
+        try:
+            file = await run_cpu_bound(encode_segment, pcm, STREAMING_SEGMENT_FORMAT)
+        except Exception as e:
+            print(f"[STT] 구간 인코딩 실패, WAV로 전송: {e}")
+            file = ("audio.wav", pcm_to_wav(pcm), "audio/wav")
+        
+        try:
+            response = await openai_client.audio.transcriptions.create(
+                model="whisper-1",
+                file=file,
+                language="ko"
+            )
+            text = response.text.strip()
+        except Exception as e:
+            print(f"[STT] 구간 변환 에러: {e}")
+            return ""
+        
+        if text:
+            await self.websocket.send_json({
+                "type": "user_transcript_partial",
+                "text": text
+            })
+        return text
+    
+    async def _stream_question(self, user_answer: str) -> AsyncIterator[str]:
         """
         GPT-4o로 다음 질문 생성 (Streaming)
         
+        텍스트 조각은 생성되는 대로 프론트엔드에 전송하고,
+        생성이 끝나면 질문 전체를 대화 히스토리에 추가한다.
+        
         Args:
             user_answer: 사용자 답변
             
-        Returns:
-            생성된 질문
+        Yields:
+            질문 텍스트 조각 (오류 시 Fallback 질문 전체)
         """
         # 대화 히스토리 업데이트
         self.conversation_history.append({
@@ -170,6 +376,7 @@ class StreamingInterviewPipeline:
                         "type": "ai_transcript_chunk",
                         "text": content
                     })
+                    yield content
             
             question = "".join(question_chunks)
             
@@ -179,55 +386,308 @@ class StreamingInterviewPipeline:
                 "content": question
             })
             
-            return question
-            
         except Exception as e:
             print(f"[LLM] 에러: {e}")
             import traceback
             traceback.print_exc()
             
-            # Fallback 질문
+            # Fallback 질문 (이미 보낸 조각이 있으면 이어서 말하지 않음)
+            if question_chunks:
+                self.conversation_history.append({
+                    "role": "assistant",
+                    "content": "".join(question_chunks)
+                })
+                return
+            
             fallback = "말씀해주신 내용에 대해 더 자세히 설명해주시겠어요?"
             self.conversation_history.append({
                 "role": "assistant",
                 "content": fallback
             })
-            return fallback
+            yield fallback
+    
+    async def generate_next_question(self, user_answer: str) -> str:
+        """
+        GPT-4o로 다음 질문 생성 (Streaming, 질문 전체 반환)
+        
+        Args:
+            user_answer: 사용자 답변
+            
+        Returns:
+            생성된 질문
+        """
+        return "".join([chunk async for chunk in self._stream_question(user_answer)])
+    
+    async def generate_and_speak(self, user_answer: str):
+        """
+        질문 생성과 음성 변환을 문장 단위로 겹쳐 실행 (파이프라인 모드)
+        
+        LLM 토큰을 문장 단위로 끊어 문장이 완성되는 즉시 TTS를 시작하고,
+        앞 문장의 오디오를 보내는 동안 뒤 문장을 생성/합성한다.
+        오디오는 문장 순서대로 전송하며 문장마다 ai_audio_segment를 먼저 보낸다.
+        
+        Args:
+            user_answer: 사용자 답변
+        """
+        segmenter = SentenceSegmenter(min_chars=STREAMING_TTS_MIN_SENTENCE_CHARS)
+        # 문장별 (텍스트, 오디오 청크 큐) - 큐의 None은 해당 문장 합성 종료
+        segments: asyncio.Queue = asyncio.Queue()
+        tts_slots = asyncio.Semaphore(STREAMING_TTS_PREFETCH)
+        tts_tasks: List[asyncio.Task] = []
+        
+        async def synthesize(sentence: str, audio: asyncio.Queue):
+            try:
+                async with tts_slots:
+                    async for chunk in self._tts_chunks(sentence):
+                        await audio.put(chunk)
+            except Exception as e:
+                print(f"[TTS] 문장 합성 에러: {e}")
+            finally:
+                await audio.put(None)
+        
+        async def schedule(sentence: str):
+            audio: asyncio.Queue = asyncio.Queue()
+            tts_tasks.append(asyncio.create_task(synthesize(sentence, audio)))
+            await segments.put((sentence, audio))
+        
+        async def produce():
+            try:
+                async for token in self._stream_question(user_answer):
+                    for sentence in segmenter.feed(token):
+                        await schedule(sentence)
+                for sentence in segmenter.flush():
+                    await schedule(sentence)
+            finally:
+                await segments.put(None)
+        
+        await self._send_audio_start()
+        
+        producer = asyncio.create_task(produce())
+        try:
+            index = 0
+            while (segment := await segments.get()) is not None:
+                sentence, audio = segment
+                await self.websocket.send_json({
+                    "type": "ai_audio_segment",
+                    "index": index,
+                    "text": sentence
+                })
+                while (chunk := await audio.get()) is not None:
+                    await self._send_audio_chunk(chunk)
+                index += 1
+            
+            await producer
+        finally:
+            # 연결 종료 등으로 중단되면 남은 생성/합성 작업 정리
+            producer.cancel()
+            for task in tts_tasks:
+                task.cancel()
+        
+        await self._send_audio_end()
+    
+    
+    async def _tts_chunks(self, text: str) -> AsyncIterator[bytes]:
+        """
+        ElevenLabs 스트리밍 TTS로 텍스트 → 음성 변환
+        
+        /stream 엔드포인트를 사용하므로 전체 음성이 합성되기 전에
+        도착한 오디오 프레임부터 바로 반환한다.
+        같은 문장을 이미 합성했으면 API 호출 없이 캐시된 음성을 반환한다.
+        
+        Args:
+            text: 변환할 텍스트
+            
+        Yields:
+            오디오 청크 (ELEVENLABS_OUTPUT_FORMAT 형식)
+        """
+        cache = get_tts_cache()
+        key = _elevenlabs_cache_key(text)
+        audio = cache.get(key) if cache is not None else None
+        if audio is not None:
+            for start in range(0, len(audio), TTS_CACHE_CHUNK_BYTES):
+                yield audio[start:start + TTS_CACHE_CHUNK_BYTES]
+            return
+        
+        chunks = []
+        async for chunk in _elevenlabs_stream(text):
+            chunks.append(chunk)
+            yield chunk
+        
+        # 끝까지 받은 음성만 캐시에 저장
+        if cache is not None:
+            cache.put(key, b"".join(chunks))
+    
+    async def _send_audio_start(self):
+        """발화 시작 신호 (클라이언트가 디코더를 고를 수 있도록 오디오 형식 전달)"""
+        self._audio_protocol = self.protocol
+        await self.websocket.send_json({
+            "type": "ai_audio_start",
+            "format": ELEVENLABS_OUTPUT_FORMAT
+        })
+    
+    async def _send_audio_chunk(self, chunk: bytes):
+        """오디오 청크 전송 (턴의 첫 청크면 지연 시간 기록)"""
+        if self._turn_started is not None:
+            self._first_audio_ms = round((time.perf_counter() - self._turn_started) * 1000, 1)
+            self._turn_started = None
+            mode = "pipelined" if STREAMING_INTERVIEW_PIPELINED else "sequential"
+            print(f"[Pipeline] 첫 오디오까지 {self._first_audio_ms}ms ({mode})")
+        
+        if self._audio_protocol == PROTOCOL_BINARY:
+            await self.websocket.send_bytes(
+                pack_audio_frame(FRAME_AI_AUDIO, self._sent_sequence, chunk)
+            )
+            self._sent_sequence += 1
+            return
+        
+        # Base64 인코딩하여 전송
+        await self.websocket.send_json({
+            "type": "ai_audio_chunk",
+            "audio": base64.b64encode(chunk).decode()
+        })
+    
+    def receive_audio(self, audio_data: bytes):
+        """
+        수신한 답변 오디오 처리 (AI가 응답 중이어도 버리지 않음)
+        
+        서버 VAD를 쓰면 청크를 누적해 발화 끝을 감지하고,
+        아니면 메시지 하나를 발화 하나로 보고 응답 대기열에 넣는다.
+        """
+        self.audio_received = True
+        if self.vad_enabled:
+            self._vad_inbox.append(audio_data)
+            self._vad_wakeup.set()
+        else:
+            self._turns.put_nowait(("audio", audio_data))
+    
+    def end_utterance(self):
+        """클라이언트가 발화 끝을 알림 (서버 VAD 사용 시 침묵을 기다리지 않고 바로 종료)"""
+        if self.vad_enabled:
+            self._vad_end_requested = True
+            self._vad_wakeup.set()
+    
+    async def _run_vad(self):
+        """
+        서버 VAD 루프
+        
+        청크가 들어올 때마다 현재 발화를 디코딩해 새 프레임을 분석하고,
+        쉼 구간은 바로 부분 STT를 시작하며 발화 끝이면 변환 결과를 응답 대기열에 넣는다.
+        """
+        while True:
+            idle_timeout = STREAMING_VAD_IDLE_MS / 1000 if self._vad_detector.speech_started else None
+            try:
+                await asyncio.wait_for(self._vad_wakeup.wait(), timeout=idle_timeout)
+            except asyncio.TimeoutError:
+                # 말하다가 청크가 끊김 (녹음 중지 등)
+                self._vad_finish(*self._vad_detector.finish()[1:])
+                continue
+            self._vad_wakeup.clear()
+            
+            inbox, self._vad_inbox = self._vad_inbox, []
+            for chunk in inbox:
+                # 새 녹음이 시작되면 이전 녹음의 발화는 끝난 것으로 처리
+                if WebmChunkBuffer.starts_stream(chunk) and self._vad_buffer.has_audio:
+                    await self._vad_flush()
+                    self._vad_buffer.reset(keep_last=False)
+                self._vad_buffer.append(chunk)
+            
+            if inbox:
+                await self._vad_analyze()
+            
+            if self._vad_end_requested:
+                self._vad_end_requested = False
+                await self._vad_flush()
+    
+    async def _vad_analyze(self):
+        """누적된 발화 디코딩 (완료된 Cluster는 보관한 PCM 재사용) 후 VAD 이벤트 처리"""
+        try:
+            pcm = await run_cpu_bound(self._vad_buffer.decode_pcm)
+        except Exception as e:
+            # 청크 경계가 프레임 중간이면 다음 청크가 와야 디코딩되는 경우가 있음
+            print(f"[VAD] 디코딩 실패, 다음 청크 대기: {e}")
+            return
+        
+        self._vad_pcm = pcm
+        for kind, start_ms, end_ms in self._vad_detector.feed(pcm):
+            if kind == "partial":
+                self._vad_segments.append(asyncio.create_task(
+                    self._transcribe_segment(pcm[ms_to_samples(start_ms):ms_to_samples(end_ms)])
+                ))
+            else:
+                self._vad_finish(start_ms, end_ms)
+        
+        # 말하기 전이면 최근 청크만 남김 (매 청크 전체 재디코딩 비용이 대기 시간에 비례해 커지지 않도록)
+        if self._vad_detector.waiting_for_speech and self._vad_buffer.trim_preroll(len(pcm) * 1000 // VAD_SAMPLE_RATE):
+            self._vad_detector.restart()
+            self._vad_pcm = None
+    
+    async def _vad_flush(self):
+        """현재까지의 발화를 마무리 (새 녹음 시작/클라이언트 종료 신호)"""
+        await self._vad_analyze()
+        if not self._vad_detector.ended:
+            self._vad_finish(*self._vad_detector.finish()[1:])
+    
+    def _vad_finish(self, start_ms: int, end_ms: int):
+        """발화 끝: 남은 구간 변환을 시작하고, 부분 결과와 합친 전체 답변을 응답 대기열에 추가"""
+        segments = self._vad_segments
+        if self._vad_detector.speech_started and end_ms > start_ms and self._vad_pcm is not None:
+            segments.append(asyncio.create_task(
+                self._transcribe_segment(self._vad_pcm[ms_to_samples(start_ms):ms_to_samples(end_ms)])
+            ))
+        
+        speech_detected = self._vad_detector.speech_started
+        self._vad_segments = []
+        self._vad_detector = EndpointDetector()
+        self._vad_buffer.reset(keep_last=True)
+        self._vad_pcm = None
+        
+        if not speech_detected or not segments:
+            return
+        
+        async def join_segments() -> str:
+            texts = await asyncio.gather(*segments)
+            return " ".join(text for text in texts if text)
+        
+        self._turns.put_nowait(("transcript", asyncio.create_task(join_segments())))
+    
+    def receive_audio_frame(self, frame: bytes):
+        """바이너리 오디오 프레임 수신 (프로토콜 2)"""
+        frame_type, sequence, audio_data = unpack_audio_frame(frame)
+        if frame_type != FRAME_CLIENT_AUDIO:
+            print(f"[Streaming Interview] 알 수 없는 프레임 유형 무시: {frame_type}")
+            return
+        
+        expected = None if self._received_sequence is None else self._received_sequence + 1
+        if expected is not None and sequence != expected:
+            print(f"[Streaming Interview] 프레임 순번 불일치: 기대 {expected}, 수신 {sequence}")
+        self._received_sequence = sequence
+        
+        self.receive_audio(audio_data)
+    
+    async def _send_audio_end(self):
+        """TTS 완료 신호 (측정된 경우 첫 오디오까지 지연 포함)"""
+        message = {"type": "ai_audio_end"}
+        if self._first_audio_ms is not None:
+            message["firstAudioMs"] = self._first_audio_ms
+            self._first_audio_ms = None
+        await self.websocket.send_json(message)
     
     async def speak_question(self, text: str):
         """
-        ElevenLabs로 텍스트 → 음성 변환 (Streaming)
+        ElevenLabs로 텍스트 → 음성 변환 후 전송 (Streaming)
         
         Args:
             text: 변환할 텍스트
         """
         try:
-            # ElevenLabs Streaming API
-            voice_id = os.getenv("ELEVENLABS_VOICE_ID", "pNInz6obpgDQGcFmaJgB")  # Adam (남성)
-            
-            audio_stream = await elevenlabs_client.text_to_speech.convert(
-                voice_id=voice_id,
-                text=text,
-                model_id="eleven_multilingual_v2",
-                output_format="mp3_44100_128"
-            )
+            await self._send_audio_start()
             
-            # 오디오 데이터를 프론트엔드로 스트리밍
-            # ElevenLabs API는 Generator를 반환하므로 async iteration
-            for chunk in audio_stream:
-                if chunk:
-                    # Base64 인코딩하여 전송
-                    audio_base64 = base64.b64encode(chunk).decode()
-                    
-                    await self.websocket.send_json({
-                        "type": "ai_audio_chunk",
-                        "audio": audio_base64
-                    })
+            # 오디오 데이터를 도착하는 대로 프론트엔드로 스트리밍
+            async for chunk in self._tts_chunks(text):
+                await self._send_audio_chunk(chunk)
             
             # TTS 완료 신호
-            await self.websocket.send_json({
-                "type": "ai_audio_end"
-            })
+            await self._send_audio_end()
             
         except Exception as e:
             print(f"[TTS] 에러: {e}")
@@ -235,21 +695,64 @@ class StreamingInterviewPipeline:
             traceback.print_exc()
 
 
+async def _handle_hello(websocket: WebSocket, pipeline: "StreamingInterviewPipeline", data: Dict):
+    """
+    프로토콜 협상 (hello)
+    
+    첫 답변 오디오 전이면 언제든 받으며, 이미 전송 중인 AI 발화(인사말 등)는
+    시작할 때의 프로토콜로 끝까지 보내고 다음 발화부터 새 프로토콜을 사용한다.
+    """
+    if pipeline.audio_received:
+        print("[Streaming Interview] 오디오 수신 후의 hello 무시")
+        return
+    
+    requested = int(data.get("protocol", PROTOCOL_JSON))
+    pipeline.protocol = PROTOCOL_BINARY if requested >= PROTOCOL_BINARY else PROTOCOL_JSON
+    if "vad" in data:
+        pipeline.set_vad(bool(data["vad"]))
+    await websocket.send_json({
+        "type": "hello_ack",
+        "protocol": pipeline.protocol,
+        "vad": pipeline.vad_enabled,
+        "audioFormat": ELEVENLABS_OUTPUT_FORMAT
+    })
+    print(f"[Streaming Interview] 프로토콜 {pipeline.protocol} 사용")
+
+
 @router.websocket("/ws/streaming-interview")
 async def streaming_interview_endpoint(websocket: WebSocket):
     """
     WebSocket 엔드포인트: 스트리밍 면접
     
+    프로토콜 협상 (선택):
+        클라이언트 → 서버 (첫 답변 오디오 전): {"type": "hello", "protocol": 2, "vad": true}
+        서버 → 클라이언트: {"type": "hello_ack", "protocol": 2, "vad": true, "audioFormat": "mp3_44100_128"}
+        hello 없이 시작하면 버전 1 (JSON + base64 오디오), VAD는 STREAMING_VAD_ENABLED (기본 true)
+        인사말은 hello를 기다리지 않고 바로 보내며, 새 프로토콜은 hello 이후 시작하는 AI 발화부터 적용
+    
+    서버 VAD (vad=true):
+        녹음 청크(MediaRecorder timeslice)를 끊지 않고 계속 보내면 서버가 침묵으로 발화 끝을 감지
+        발화 중 쉼마다 부분 STT 결과를 user_transcript_partial로 전송
+        {"type": "end_of_utterance"}로 침묵을 기다리지 않고 발화를 끝낼 수 있음
+    
+    프로토콜 2 오디오 (바이너리 프레임, 헤더 [유형 1B][플래그 1B][순번 4B] + 오디오):
+        클라이언트 → 서버: 유형 0x01 답변 오디오 (WebM)
+        서버 → 클라이언트: 유형 0x02 AI 음성 청크 (ai_audio_chunk 대신)
+    
     프로토콜:
         클라이언트 → 서버:
-            - {"type": "audio_chunk", "audio": "base64_encoded_audio"}
+            - {"type": "audio_chunk", "audio": "base64_encoded_audio"}  (버전 1)
+            - {"type": "end_of_utterance"}  (서버 VAD)
             - {"type": "end_interview"}
         
         서버 → 클라이언트:
+            - {"type": "user_transcript_partial", "text": "..."}  (서버 VAD, 구간별 인식 결과)
             - {"type": "user_transcript", "text": "..."}
             - {"type": "ai_transcript_chunk", "text": "..."}
-            - {"type": "ai_audio_chunk", "audio": "base64_encoded_audio"}
-            - {"type": "ai_audio_end"}
+            - {"type": "ai_audio_start", "format": "mp3_44100_128"}  (발화 시작, 오디오 형식)
+            - {"type": "ai_audio_segment", "index": 0, "text": "..."}  (파이프라인 모드, 문장별 오디오 시작)
+            - {"type": "ai_audio_chunk", "audio": "base64_encoded_audio"}  (버전 1)
+            - {"type": "ai_audio_end", "firstAudioMs": 850.0}
             - {"type": "interview_ended"}
             - {"type": "error", "message": "..."}
     """
@@ -259,20 +762,19 @@ async def streaming_interview_endpoint(websocket: WebSocket):
     pipeline = StreamingInterviewPipeline(websocket)
     
     # 초기 인사말 (중복 방지: 연결 직후 한 번만)
-    initial_greeting = (
-        "안녕하세요! AI 면접관입니다. 오늘 인터뷰를 시작하겠습니다. "
-        "먼저 간단하게 자기소개를 부탁드립니다."
-    )
+    initial_greeting = INITIAL_GREETING
     
     try:
+        pipeline.start()
+        
         # 초기 인사말 전송 (텍스트)
         await websocket.send_json({
             "type": "ai_transcript_chunk",
             "text": initial_greeting
         })
         
-        # 초기 인사말 음성 변환
-        await pipeline.speak_question(initial_greeting)
+        # 초기 인사말 음성 변환 (응답 대기열에서 재생하므로 그동안 hello/답변 수신 가능)
+        pipeline.say(initial_greeting)
         
         # 대화 히스토리에 추가
         pipeline.conversation_history.append({
@@ -283,16 +785,30 @@ async def streaming_interview_endpoint(websocket: WebSocket):
         
         # 메시지 수신 루프
         while True:
-            # 프론트엔드로부터 메시지 수신
-            message = await websocket.receive_json()
+            # 프론트엔드로부터 메시지 수신 (텍스트: 제어 JSON, 바이너리: 오디오 프레임)
+            raw = await websocket.receive()
             
-            if message["type"] == "audio_chunk":
-                # 오디오 청크 수신
-                audio_data = base64.b64decode(message["audio"])
-                
-                # 파이프라인 실행 (비동기)
-                if not pipeline.is_processing:
-                    asyncio.create_task(pipeline.process_audio_stream(audio_data))
+            if raw["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(raw.get("code", 1000))
+            
+            if raw.get("bytes") is not None:
+                try:
+                    pipeline.receive_audio_frame(raw["bytes"])
+                except ValueError as e:
+                    print(f"[Streaming Interview] 잘못된 프레임 무시: {e}")
+                continue
+            
+            message = json.loads(raw["text"])
+            
+            if message["type"] == "hello":
+                await _handle_hello(websocket, pipeline, message)
+            
+            elif message["type"] == "audio_chunk":
+                # 오디오 청크 수신 (응답 대기열 또는 서버 VAD로 전달)
+                pipeline.receive_audio(base64.b64decode(message["audio"]))
+            
+            elif message["type"] == "end_of_utterance":
+                pipeline.end_utterance()
                     
             elif message["type"] == "end_interview":
                 # 인터뷰 종료
@@ -309,5 +825,5 @@ async def streaming_interview_endpoint(websocket: WebSocket):
         import traceback
         traceback.print_exc()
     finally:
+        await pipeline.close()
         print("[Streaming Interview] 세션 종료")
-
@@ -1,22 +1,66 @@
 """
 STT (Speech-to-Text) API
 Whisper API를 사용하여 음성을 텍스트로 변환
+
+업로드 파일은 디스크에 다시 쓰지 않고, 요청 파싱 때 만들어진 스풀 파일을
+그대로 Whisper 요청 본문으로 스트리밍한다. (STT_SPOOL_MAX_MEMORY_MB 이하는 메모리,
+그보다 큰 업로드만 디스크로 넘어감)
 """
 
 from fastapi import APIRouter, File, UploadFile, HTTPException
-from openai import OpenAI
+from openai import AsyncOpenAI
+from starlette.formparsers import MultiPartParser
 import os
-import tempfile
-from typing import Dict
+from typing import BinaryIO, Dict, Tuple
 import traceback
 import logging
 
+from app.services.long_transcription import STT_LONG_MAX_SEC, decode_audio_pcm, transcribe_long_audio
+from app.services.voice_activity import VAD_SAMPLE_RATE
+from app.utils.executor import run_cpu_bound
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# 업로드를 메모리에 두는 최대 크기 (초과분만 디스크로 넘어감, 기본 Starlette 값은 1MB)
+STT_SPOOL_MAX_MEMORY = int(os.getenv("STT_SPOOL_MAX_MEMORY_MB", "8")) * 1024 * 1024
+
+# 긴 오디오 변환 최대 업로드 크기 (길이 상한은 STT_LONG_MAX_SEC)
+STT_LONG_MAX_BYTES = int(os.getenv("STT_LONG_MAX_MB", "200")) * 1024 * 1024
+
+
+def configure_upload_spool():
+    """
+    멀티파트 업로드 스풀의 메모리 한도를 STT_SPOOL_MAX_MEMORY로 변경
+    
+    Starlette 전역 설정이므로 앱 시작 시 한 번 호출한다. (이 서비스의 파일 업로드는 STT뿐)
+    """
+    MultiPartParser.max_file_size = STT_SPOOL_MAX_MEMORY
+
+
+def _upload_body(audio: UploadFile, default_suffix: str = ".webm") -> Tuple[Tuple[str, BinaryIO, str], int]:
+    """
+    업로드 파일 → Whisper 파일 튜플 (복사/임시 파일 없이 스풀 파일 그대로 사용)
+    
+    Returns:
+        ((파일명, 파일 객체, Content-Type), 크기)
+    """
+    file = audio.file
+    size = audio.size
+    if size is None:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+    file.seek(0)
+    
+    # Whisper는 파일명 확장자로 형식을 판단
+    filename = audio.filename or f"audio{default_suffix}"
+    if not os.path.splitext(filename)[1]:
+        filename += default_suffix
+    return (filename, file, audio.content_type or "application/octet-stream"), size
 
 
 @router.post("/transcribe")
@@ -32,13 +76,11 @@ async def transcribe_audio(
     Returns:
         Dict: {"text": "변환된 텍스트"}
     """
-    temp_audio_path = None
     try:
         logger.info(f"[STT] 음성 변환 요청 시작: {audio.filename}, content_type: {audio.content_type}")
         
-        # 오디오 파일 읽기
-        content = await audio.read()
-        content_size = len(content)
+        # 업로드 크기 확인 (본문은 Whisper 요청으로 바로 스트리밍)
+        upload, content_size = _upload_body(audio)
         logger.info(f"[STT] 오디오 파일 크기: {content_size} bytes ({content_size / 1024:.2f} KB)")
         
         # 파일 크기 검증 (최대 25MB)
@@ -62,14 +104,6 @@ async def transcribe_audio(
         if file_ext and file_ext not in supported_formats:
             logger.warning(f"[STT] 지원되지 않는 형식일 수 있음: {file_ext}")
         
-        # 임시 파일로 저장 (Whisper API는 파일 경로가 필요)
-        suffix = file_ext if file_ext else ".webm"
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_audio:
-            temp_audio.write(content)
-            temp_audio_path = temp_audio.name
-        
-        logger.info(f"[STT] 임시 파일 저장 완료: {temp_audio_path}")
-        
         # OpenAI API 키 확인
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
@@ -82,18 +116,14 @@ async def transcribe_audio(
         logger.info("[STT] Whisper API 호출 시작")
         
         # Whisper API 호출
-        with open(temp_audio_path, "rb") as audio_file:
-            transcription = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="ko"  # 한국어 지정
-            )
+        transcription = await client.audio.transcriptions.create(
+            model="whisper-1",
+            file=upload,
+            language="ko"  # 한국어 지정
+        )
         
         logger.info(f"[STT] 변환 성공: {transcription.text[:100]}..." if len(transcription.text) > 100 else f"[STT] 변환 성공: {transcription.text}")
         
-        # 임시 파일 삭제
-        os.unlink(temp_audio_path)
-        
         return {
             "text": transcription.text
         }
@@ -108,14 +138,6 @@ async def transcribe_audio(
         logger.error(f"[STT] 에러 타입: {type(e).__name__}")
         logger.error(f"[STT] 스택 트레이스:\n{traceback.format_exc()}")
         
-        # 에러 시 임시 파일 정리
-        if temp_audio_path and os.path.exists(temp_audio_path):
-            try:
-                os.unlink(temp_audio_path)
-                logger.info("[STT] 임시 파일 정리 완료")
-            except Exception as cleanup_error:
-                logger.error(f"[STT] 임시 파일 정리 실패: {cleanup_error}")
-        
         # 사용자에게 더 구체적인 에러 메시지 제공
         error_detail = f"음성 변환 실패: {str(e)}"
         
@@ -146,29 +168,20 @@ async def transcribe_audio_realtime(
     """
     try:
         # 파일 크기 확인 (10MB 제한)
-        content = await audio.read()
-        if len(content) > 10 * 1024 * 1024:  # 10MB
+        upload, content_size = _upload_body(audio)
+        if content_size > 10 * 1024 * 1024:  # 10MB
             raise HTTPException(
                 status_code=400,
                 detail="파일 크기가 너무 큽니다 (최대 10MB)"
             )
         
-        # 임시 파일 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as temp_audio:
-            temp_audio.write(content)
-            temp_audio_path = temp_audio.name
-        
         # Whisper API 호출
-        with open(temp_audio_path, "rb") as audio_file:
-            transcription = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language=language,
-                response_format="text"  # 텍스트만 반환
-            )
-        
-        # 임시 파일 삭제
-        os.unlink(temp_audio_path)
+        transcription = await client.audio.transcriptions.create(
+            model="whisper-1",
+            file=upload,
+            language=language,
+            response_format="text"  # 텍스트만 반환
+        )
         
         # response_format="text"일 때는 문자열로 반환됨
         text = transcription if isinstance(transcription, str) else transcription.text
@@ -177,16 +190,79 @@ async def transcribe_audio_realtime(
             "text": text,
             "language": language
         }
+    
+    except HTTPException:
+        raise
         
     except Exception as e:
-        if 'temp_audio_path' in locals():
-            try:
-                os.unlink(temp_audio_path)
-            except:
-                pass
-        
         raise HTTPException(
             status_code=500,
             detail=f"실시간 음성 변환 실패: {str(e)}"
         )
 
+
+@router.post("/transcribe-long")
+async def transcribe_long(
+    audio: UploadFile = File(..., description="긴 오디오 파일 (면접 전체 녹음 등, 25MB 초과 가능)"),
+    language: str = "ko"
+) -> Dict:
+    """
+    긴 음성 변환 (침묵 구간 분할 + 병렬 변환)
+    
+    Args:
+        audio: 업로드된 오디오 파일
+        language: 언어 코드 (기본: ko)
+        
+    Returns:
+        Dict: {
+            "text": "전체 텍스트",
+            "language": "ko",
+            "duration": 1800.0,
+            "segments": [{"start": 0.0, "end": 4.2, "text": "..."}],
+            "chunks": 15,
+            "failedChunks": [{"index": 3, "start": 360.0, "end": 480.0}]
+        }
+    """
+    try:
+        upload, content_size = _upload_body(audio)
+        if content_size == 0:
+            raise HTTPException(status_code=400, detail="오디오 파일이 비어있습니다.")
+        if content_size > STT_LONG_MAX_BYTES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"파일 크기가 너무 큽니다 (최대 {STT_LONG_MAX_BYTES // 1024 // 1024}MB)"
+            )
+        
+        logger.info(f"[STT] 긴 음성 변환 요청: {audio.filename}, {content_size / 1024 / 1024:.2f}MB")
+        
+        # 디코딩은 CPU 작업 스레드 풀에서 (확장자는 형식 힌트로만 사용)
+        file_ext = os.path.splitext(audio.filename or '')[1].lower().lstrip(".") or None
+        try:
+            pcm = await run_cpu_bound(decode_audio_pcm, upload[1], file_ext)
+        except Exception as e:
+            logger.error(f"[STT] 오디오 디코딩 실패: {e}")
+            raise HTTPException(status_code=400, detail=f"오디오를 읽을 수 없습니다: {str(e)}")
+        
+        if len(pcm) > STT_LONG_MAX_SEC * VAD_SAMPLE_RATE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"오디오가 너무 깁니다 (최대 {STT_LONG_MAX_SEC / 60:.0f}분)"
+            )
+        
+        result = await transcribe_long_audio(pcm, language=language)
+        logger.info(
+            f"[STT] 긴 음성 변환 완료: {result['duration']}초, "
+            f"{result['chunks']}개 구간 (실패 {len(result['failedChunks'])})"
+        )
+        return result
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        logger.error(f"[STT] 긴 음성 변환 실패: {str(e)}")
+        logger.error(f"[STT] 스택 트레이스:\n{traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"긴 음성 변환 실패: {str(e)}"
+        )
@@ -1,17 +1,61 @@
 """
 TTS (Text-to-Speech) API
 OpenAI TTS API를 사용하여 텍스트를 음성으로 변환
+
+합성된 음성은 OpenAI 응답 본문을 받는 대로 청크 단위로 클라이언트에 전달한다.
+(전체 합성을 기다리지 않으므로 첫 소리까지의 지연이 짧음)
+
+긴 텍스트(TTS_SEGMENT_THRESHOLD자 초과)는 문장 경계에서 구간으로 나눠 동시에 합성하고,
+구간 순서대로 이어서 전송한다. (첫 구간은 짧게 잘라 첫 문장 합성 직후 재생 시작)
 """
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from openai import OpenAI
+from openai import AsyncOpenAI
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple
+import asyncio
 import os
-import io
+import time
+
+from app.api.question import fixed_question_texts
+from app.services.tts_cache import get_tts_cache, prewarm_tts_cache, tts_cache_key
+from app.utils.text_segmenter import pack_sentences, split_sentences
 
 router = APIRouter()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# 시작 시 고정 질문을 미리 합성할 음성 목록 (쉼표 구분, 모델 tts-1 / 속도 1.0)
+TTS_PREWARM_VOICES = [voice.strip() for voice in os.getenv("TTS_PREWARM_VOICES", "onyx").split(",") if voice.strip()]
+# 클라이언트로 보내는 청크 크기 (작을수록 첫 소리가 빠름)
+TTS_STREAM_CHUNK_BYTES = int(os.getenv("TTS_STREAM_CHUNK_BYTES", "4096"))
+
+# 긴 텍스트 구간 분할 합성
+# - 이보다 긴 텍스트는 문장 경계에서 나눠 합성 (OpenAI 요청 한도는 4096자)
+# - 첫 구간 / 이후 구간 최대 글자 수, 동시에 합성할 구간 수, 요청 텍스트 최대 길이
+OPENAI_TTS_MAX_CHARS = 4096
+TTS_SEGMENT_THRESHOLD = int(os.getenv("TTS_SEGMENT_THRESHOLD", "300"))
+TTS_SEGMENT_FIRST_CHARS = int(os.getenv("TTS_SEGMENT_FIRST_CHARS", "80"))
+TTS_SEGMENT_MAX_CHARS = min(int(os.getenv("TTS_SEGMENT_MAX_CHARS", "600")), OPENAI_TTS_MAX_CHARS)
+TTS_SEGMENT_CONCURRENCY = int(os.getenv("TTS_SEGMENT_CONCURRENCY", "3"))
+TTS_MAX_TEXT_CHARS = int(os.getenv("TTS_MAX_TEXT_CHARS", "20000"))
+# 이어 붙여도 재생되는 형식 (mp3/aac 프레임, raw PCM)
+# - wav/flac은 헤더가 중복되고, opus(Ogg)는 체인 스트림을 끝까지 재생하지 못하는 플레이어가 많아 한 번에 합성
+SEGMENTABLE_FORMATS = ("mp3", "aac", "pcm")
+# 구간 합성 실패 시 재시도 횟수 (재시도도 실패하면 스트림 중단)
+TTS_SEGMENT_RETRIES = int(os.getenv("TTS_SEGMENT_RETRIES", "1"))
+
+# 응답 형식 → (Content-Type, 확장자)
+# - opus: Ogg Opus, 저지연/저용량 (브라우저 MediaSource/WebAudio 재생)
+# - pcm: 24kHz 16bit 모노 little-endian raw, 디코딩 없이 바로 재생 (가장 빠름)
+AUDIO_FORMATS: Dict[str, Tuple[str, str]] = {
+    "mp3": ("audio/mpeg", "mp3"),
+    "opus": ("audio/ogg", "opus"),
+    "aac": ("audio/aac", "aac"),
+    "flac": ("audio/flac", "flac"),
+    "wav": ("audio/wav", "wav"),
+    "pcm": ("audio/pcm", "pcm"),
+}
 
 
 class TTSRequest(BaseModel):
@@ -19,6 +63,308 @@ class TTSRequest(BaseModel):
     voice: str = "alloy"  # alloy, echo, fable, onyx, nova, shimmer
     model: str = "tts-1"  # tts-1 (빠름) 또는 tts-1-hd (고품질)
     speed: float = 1.0  # 0.25 ~ 4.0
+    response_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] = "mp3"
+
+
+async def synthesize_speech(text: str, voice: str, model: str, speed: float, response_format: str = "mp3") -> bytes:
+    """OpenAI TTS 호출 → 오디오 전체"""
+    response = await client.audio.speech.create(
+        model=model,
+        voice=voice,
+        input=text,
+        speed=speed,
+        response_format=response_format
+    )
+    return response.content
+
+
+async def open_speech_stream(
+    text: str,
+    voice: str,
+    model: str,
+    speed: float,
+    response_format: str = "mp3"
+) -> Tuple[AsyncIterator[bytes], float]:
+    """
+    OpenAI TTS 스트리밍 호출 (응답 헤더까지 받은 뒤 반환, 본문은 반환된 iterator로 수신)
+    
+    API 오류는 여기서 예외로 전달되므로 스트리밍 시작 전에 HTTP 오류로 응답할 수 있다.
+    
+    Returns:
+        (오디오 청크 iterator, 응답 헤더 수신까지 걸린 시간 ms)
+    """
+    started = time.perf_counter()
+    manager = client.audio.speech.with_streaming_response.create(
+        model=model,
+        voice=voice,
+        input=text,
+        speed=speed,
+        response_format=response_format
+    )
+    response = await manager.__aenter__()
+    upstream_ms = round((time.perf_counter() - started) * 1000, 1)
+    
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            first_chunk = True
+            async for chunk in response.iter_bytes(TTS_STREAM_CHUNK_BYTES):
+                if first_chunk:
+                    first_chunk = False
+                    ttfb_ms = round((time.perf_counter() - started) * 1000, 1)
+                    print(f"[TTS] 첫 바이트 {ttfb_ms}ms (헤더 {upstream_ms}ms, {response_format}, {len(text)}자)")
+                yield chunk
+        finally:
+            # 클라이언트가 중간에 끊어도 OpenAI 연결 정리
+            await manager.__aexit__(None, None, None)
+    
+    return body(), upstream_ms
+
+
+async def speech_chunks(
+    text: str,
+    voice: str,
+    model: str,
+    speed: float,
+    response_format: str = "mp3"
+) -> Tuple[AsyncIterator[bytes], bool, Optional[float]]:
+    """
+    TTS 캐시 조회 후 없으면 스트리밍 합성 (끝까지 받은 음성은 캐시에 저장)
+    
+    스트리밍 합성은 캐시의 합성 Task로 등록되어, 같은 키로 동시에 들어온 요청은
+    API를 다시 호출하지 않고 먼저 시작한 합성이 끝나기를 기다려 같은 음성을 받는다.
+    먼저 요청한 클라이언트가 연결을 끊어도 합성은 끝까지 받아 캐시에 저장한다.
+    
+    Returns:
+        (오디오 청크 iterator, 캐시 히트 여부, OpenAI 응답 헤더 수신 시간 ms)
+    """
+    cache = get_tts_cache()
+    key = tts_cache_key(text, voice, model, speed, response_format)
+    audio = cache.get(key) if cache is not None else None
+    if audio is not None:
+        return _replay(audio), True, None
+    
+    if cache is None:
+        stream, upstream_ms = await open_speech_stream(text, voice, model, speed, response_format)
+        return stream, False, upstream_ms
+    
+    # 합성 Task가 받은 청크를 그대로 전달 (None은 수신 종료)
+    received: asyncio.Queue = asyncio.Queue()
+    opened = asyncio.get_running_loop().create_future()
+    
+    async def synthesize() -> bytes:
+        try:
+            stream, upstream_ms = await open_speech_stream(text, voice, model, speed, response_format)
+            opened.set_result(upstream_ms)
+        except Exception as e:
+            opened.set_exception(e)
+            raise
+        finally:
+            # 연결 전에 취소되면 기다리던 요청도 취소
+            if not opened.done():
+                opened.cancel()
+        
+        chunks = []
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                received.put_nowait(chunk)
+        finally:
+            received.put_nowait(None)
+        return b"".join(chunks)
+    
+    task, shared = cache.start(key, synthesize)
+    if shared:
+        # 같은 문장을 합성 중 - 끝나면 전체 음성을 재생
+        return _replay(await asyncio.shield(task)), False, None
+    
+    upstream_ms = await opened
+    
+    async def relay() -> AsyncIterator[bytes]:
+        while (chunk := await received.get()) is not None:
+            yield chunk
+        # 수신 중 오류는 클라이언트 응답에도 전달
+        await asyncio.shield(task)
+    
+    return relay(), False, upstream_ms
+
+
+def _replay(audio: bytes) -> AsyncIterator[bytes]:
+    """완성된 음성 → 스트리밍 청크"""
+    async def chunks() -> AsyncIterator[bytes]:
+        for start in range(0, len(audio), TTS_STREAM_CHUNK_BYTES):
+            yield audio[start:start + TTS_STREAM_CHUNK_BYTES]
+    return chunks()
+
+
+def split_speech_text(text: str) -> List[str]:
+    """긴 텍스트 → TTS 구간 (한국어 문장 경계 기준, 첫 구간은 짧게)"""
+    return pack_sentences(
+        split_sentences(text),
+        max_chars=TTS_SEGMENT_MAX_CHARS,
+        first_chars=TTS_SEGMENT_FIRST_CHARS
+    )
+
+
+async def segmented_speech_chunks(
+    segments: List[str],
+    voice: str,
+    model: str,
+    speed: float,
+    response_format: str = "mp3"
+) -> AsyncIterator[bytes]:
+    """
+    구간별 동시 합성 후 순서대로 스트리밍
+    
+    TTS_SEGMENT_CONCURRENCY개 구간을 동시에 합성하고, 앞 구간을 보내는 동안
+    뒤 구간의 오디오는 큐에 쌓아 둔다. 실패한 구간은 TTS_SEGMENT_RETRIES번 다시 합성하고
+    (이미 일부 청크를 보낸 구간은 중복 재생되므로 재시도하지 않음), 그래도 실패하면
+    구간을 건너뛰지 않고 스트림을 중단한다.
+    
+    Yields:
+        오디오 청크 (구간 순서)
+    
+    Raises:
+        Exception: 재시도 후에도 구간 합성 실패
+    """
+    slots = asyncio.Semaphore(TTS_SEGMENT_CONCURRENCY)
+    # 구간별 오디오 청크 큐 - None은 해당 구간 합성 종료, 예외는 합성 실패
+    queues: List[asyncio.Queue] = [asyncio.Queue() for _ in segments]
+    
+    async def synthesize(index: int, segment: str):
+        async with slots:
+            for attempt in range(TTS_SEGMENT_RETRIES + 1):
+                sent = False
+                try:
+                    chunks, _, _ = await speech_chunks(segment, voice, model, speed, response_format)
+                    async for chunk in chunks:
+                        sent = True
+                        await queues[index].put(chunk)
+                    await queues[index].put(None)
+                    return
+                except Exception as e:
+                    if sent or attempt >= TTS_SEGMENT_RETRIES:
+                        print(f"[TTS] 구간 {index} 합성 실패, 스트림 중단: {e}")
+                        await queues[index].put(e)
+                        return
+                    print(f"[TTS] 구간 {index} 합성 에러, 재시도: {e}")
+    
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(synthesize(index, segment)) for index, segment in enumerate(segments)]
+    try:
+        for queue in queues:
+            while (chunk := await queue.get()) is not None:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        print(
+            f"[TTS] 구간 {len(segments)}개 ({sum(len(segment) for segment in segments)}자) "
+            f"전송 완료: {time.perf_counter() - started:.1f}초"
+        )
+    finally:
+        # 클라이언트가 중간에 끊으면 남은 합성 작업 정리
+        for task in tasks:
+            task.cancel()
+
+
+async def _with_first_chunk(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    첫 청크를 미리 받아 둔 스트림
+    
+    첫 오디오가 나오기 전에 모든 구간 합성이 실패하면 응답 시작 전에 예외가 나므로
+    HTTP 오류로 응답할 수 있다.
+    """
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        raise RuntimeError("합성된 음성이 없습니다")
+    
+    async def stream() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+    
+    return stream()
+
+
+def _speech_response(
+    chunks: AsyncIterator[bytes],
+    response_format: str,
+    filename: str,
+    cache_hit: Optional[bool],
+    upstream_ms: Optional[float],
+    extra_headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """오디오 스트리밍 응답 (캐시 여부/OpenAI 응답 시간 헤더 포함, 구간 합성은 캐시 헤더 생략)"""
+    media_type, extension = AUDIO_FORMATS[response_format]
+    headers = {
+        "Content-Disposition": f"inline; filename={filename}.{extension}",
+        **(extra_headers or {}),
+    }
+    if cache_hit is not None:
+        headers["X-TTS-Cache"] = "hit" if cache_hit else "miss"
+    if upstream_ms is not None:
+        headers["Server-Timing"] = f"tts;dur={upstream_ms}"
+    if response_format == "pcm":
+        headers["X-Audio-Sample-Rate"] = "24000"
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+
+async def _stream_speech(
+    text: str,
+    voice: str,
+    model: str,
+    speed: float,
+    response_format: str,
+    filename: str,
+    extra_headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """
+    텍스트 → 오디오 스트리밍 응답
+    
+    TTS_SEGMENT_THRESHOLD자를 넘는 텍스트는 문장 경계로 나눠 동시 합성하고 순서대로 전송한다.
+    (이어 붙일 수 없는 wav/flac/opus는 한 번에 합성)
+    """
+    if len(text) > TTS_MAX_TEXT_CHARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"텍스트가 너무 깁니다 (최대 {TTS_MAX_TEXT_CHARS}자)"
+        )
+    
+    if len(text) > TTS_SEGMENT_THRESHOLD and response_format in SEGMENTABLE_FORMATS:
+        segments = split_speech_text(text)
+        chunks = await _with_first_chunk(
+            segmented_speech_chunks(segments, voice, model, speed, response_format)
+        )
+        return _speech_response(
+            chunks,
+            response_format,
+            filename,
+            cache_hit=None,
+            upstream_ms=None,
+            extra_headers={**(extra_headers or {}), "X-TTS-Segments": str(len(segments))}
+        )
+    
+    if len(text) > OPENAI_TTS_MAX_CHARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{response_format} 형식은 최대 {OPENAI_TTS_MAX_CHARS}자까지 지원합니다"
+        )
+    
+    # OpenAI TTS 스트리밍 호출 (같은 문장/음성/모델/속도/형식은 캐시 재사용)
+    chunks, cache_hit, upstream_ms = await speech_chunks(text, voice, model, speed, response_format)
+    return _speech_response(chunks, response_format, filename, cache_hit, upstream_ms, extra_headers)
+
+
+async def prewarm_fixed_phrases() -> int:
+    """질문 세트 고정 질문 미리 합성 (TTS_PREWARM_VOICES 음성별)"""
+    created = 0
+    for voice in TTS_PREWARM_VOICES:
+        created += await prewarm_tts_cache(
+            fixed_question_texts(),
+            make_key=lambda text: tts_cache_key(text, voice, "tts-1", 1.0, "mp3"),
+            synthesize=lambda text: synthesize_speech(text, voice, "tts-1", 1.0)
+        )
+    return created
 
 
 @router.post("/speak")
@@ -27,41 +373,28 @@ async def text_to_speech(request: TTSRequest):
     텍스트를 음성으로 변환
     
     Args:
-        request: TTS 요청 (text, voice, model, speed)
+        request: TTS 요청 (text, voice, model, speed, response_format)
         
     Returns:
-        StreamingResponse: MP3 오디오 스트림
+        StreamingResponse: 오디오 스트림 (기본 MP3, opus/pcm 등 저지연 형식 지원)
     """
     try:
         # 입력 검증
         if not request.text or not request.text.strip():
             raise HTTPException(status_code=400, detail="텍스트가 비어있습니다.")
         
-        if len(request.text) > 4096:
-            raise HTTPException(
-                status_code=400,
-                detail="텍스트가 너무 깁니다 (최대 4096자)"
-            )
-        
-        # OpenAI TTS API 호출
-        response = client.audio.speech.create(
-            model=request.model,
-            voice=request.voice,
-            input=request.text,
-            speed=request.speed
-        )
-        
-        # 오디오 데이터를 바이너리로 변환
-        audio_data = response.content
-        
-        # MP3 스트림 반환
-        return StreamingResponse(
-            io.BytesIO(audio_data),
-            media_type="audio/mpeg",
-            headers={
-                "Content-Disposition": f"inline; filename=speech.mp3"
-            }
+        # 받는 대로 스트리밍 (긴 텍스트는 문장 구간별 동시 합성)
+        return await _stream_speech(
+            request.text,
+            request.voice,
+            request.model,
+            request.speed,
+            request.response_format,
+            "speech"
         )
+    
+    except HTTPException:
+        raise
         
     except Exception as e:
         raise HTTPException(
@@ -79,7 +412,7 @@ async def text_to_speech_korean(request: TTSRequest):
         request: TTS 요청
         
     Returns:
-        StreamingResponse: MP3 오디오 스트림
+        StreamingResponse: 오디오 스트림 (기본 MP3)
     """
     try:
         if not request.text or not request.text.strip():
@@ -89,24 +422,19 @@ async def text_to_speech_korean(request: TTSRequest):
         # alloy: 중성적, nova: 여성, onyx: 남성
         voice = request.voice if request.voice else "onyx"
         
-        # TTS 생성
-        response = client.audio.speech.create(
-            model=request.model,
-            voice=voice,
-            input=request.text,
-            speed=request.speed
-        )
-        
-        audio_data = response.content
-        
-        return StreamingResponse(
-            io.BytesIO(audio_data),
-            media_type="audio/mpeg",
-            headers={
-                "Content-Disposition": f"inline; filename=speech_kr.mp3",
-                "Cache-Control": "no-cache"
-            }
+        # TTS 스트리밍 생성 (긴 텍스트는 문장 구간별 동시 합성)
+        return await _stream_speech(
+            request.text,
+            voice,
+            request.model,
+            request.speed,
+            request.response_format,
+            "speech_kr",
+            extra_headers={"Cache-Control": "no-cache"}
         )
+    
+    except HTTPException:
+        raise
         
     except Exception as e:
         raise HTTPException(
@@ -176,6 +504,14 @@ async def list_voices():
                 "latency": "보통"
             }
         ],
+        "formats": [
+            {"id": "mp3", "description": "기본 형식, 모든 브라우저 재생"},
+            {"id": "opus", "description": "저지연/저용량 (Ogg Opus)"},
+            {"id": "aac", "description": "모바일 재생"},
+            {"id": "flac", "description": "무손실"},
+            {"id": "wav", "description": "무압축"},
+            {"id": "pcm", "description": "24kHz 16bit 모노 raw, 디코딩 없이 재생 (최저 지연)"}
+        ],
         "speed_range": {
             "min": 0.25,
             "max": 4.0,
@@ -6,6 +6,8 @@ Service 2: AI 질문 생성, 답변 분석, 평가, 매칭 알고리즘
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+from typing import List
+import asyncio
 import os
 
 # 환경 변수 로딩
@@ -53,11 +55,11 @@ async def health_check():
     
     if openai_api_key and openai_api_key.startswith("sk-"):
         try:
-            from openai import OpenAI
-            test_client = OpenAI(api_key=openai_api_key)
+            from openai import AsyncOpenAI
+            test_client = AsyncOpenAI(api_key=openai_api_key, timeout=5.0)
             
             # 모델 리스트 조회로 API 키 유효성 검증 (timeout 5초)
-            models = test_client.models.list()
+            await test_client.models.list()
             openai_connection = True
             
         except Exception as e:
@@ -75,7 +77,46 @@ async def health_check():
 
 
 # ===== AI API 라우터 =====
-from app.api import question, evaluation, matching, health, stt, tts, streaming_interview
+from app.api import question, evaluation, matching, matching_index, health, stt, tts, streaming_interview
+from app.services.vector_index import load_indexes, save_indexes, periodic_save_indexes
+from app.services.pgvector_index import close_pgvector_pool
+from app.utils.executor import shutdown_cpu_executor
+
+# 시작 시 띄운 백그라운드 작업 (종료 시 취소)
+_background_tasks: List[asyncio.Task] = []
+
+
+async def prewarm_tts():
+    """고정 문장 음성 미리 합성 (인사말: ElevenLabs, 질문 세트 고정 질문: OpenAI TTS)"""
+    if os.getenv("ELEVENLABS_API_KEY"):
+        await streaming_interview.prewarm_interview_audio()
+    if os.getenv("OPENAI_API_KEY"):
+        await tts.prewarm_fixed_phrases()
+
+
+@app.on_event("startup")
+async def on_startup():
+    """업로드 스풀 설정 + 저장된 매칭 인덱스 로드 + 주기적 저장 시작 + TTS 캐시 미리 합성"""
+    # 멀티파트 파서는 Starlette 전역 설정 - STT 업로드를 STT_SPOOL_MAX_MEMORY_MB까지 메모리에 둠
+    stt.configure_upload_spool()
+    load_indexes()
+    _background_tasks.append(asyncio.create_task(periodic_save_indexes()))
+    if os.getenv("TTS_CACHE_PREWARM", "true").lower() == "true":
+        _background_tasks.append(asyncio.create_task(prewarm_tts()))
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """백그라운드 작업 취소 후 매칭 인덱스 저장 + pgvector 커넥션 풀 / CPU 작업 스레드 풀 종료"""
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
+    
+    save_indexes()
+    close_pgvector_pool()
+    shutdown_cpu_executor()
+
 
 # 헬스 체크
 app.include_router(health.router, tags=["헬스 체크"])
@@ -87,6 +128,7 @@ app.include_router(question.router, prefix="/api/v1/ai", tags=["Question Generat
 app.include_router(evaluation.router, prefix="/internal/ai", tags=["Evaluation (Internal)"])
 app.include_router(evaluation.router, prefix="/api/v1/ai", tags=["Evaluation (External)"])
 app.include_router(matching.router, prefix="/internal/ai", tags=["Matching"])
+app.include_router(matching_index.router, prefix="/internal/ai/index", tags=["Matching Index"])
 app.include_router(stt.router, prefix="/api/v1/ai/stt", tags=["STT (Speech-to-Text)"])
 app.include_router(tts.router, prefix="/api/v1/ai/tts", tags=["TTS (Text-to-Speech)"])
 app.include_router(streaming_interview.router, prefix="/api/v1/ai", tags=["Streaming Interview"])
@@ -3,7 +3,7 @@
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
 
 
 class EvaluationRequest(BaseModel):
@@ -12,6 +12,10 @@ class EvaluationRequest(BaseModel):
     conversationHistory: List[Dict] = Field(..., description="전체 대화 기록")
     candidateProfile: Optional[Dict] = Field(default=None, description="구직자 프로필")
     jobPosting: Optional[Dict] = Field(default=None, description="채용 공고")
+    scoringMode: Optional[Literal["per_answer", "batch"]] = Field(
+        default=None,
+        description="답변 채점 방식 (per_answer: 답변별 호출, batch: 전체 Q&A 일괄 채점, 기본: 서버 설정)"
+    )
 
 
 class ScoresModel(BaseModel):
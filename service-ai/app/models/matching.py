@@ -3,7 +3,7 @@
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 
 
 class CandidateProfileForMatching(BaseModel):
@@ -42,29 +42,58 @@ class MatchingResult(BaseModel):
 class RecommendJobsRequest(BaseModel):
     """구직자 추천 공고 요청"""
     candidateProfile: CandidateProfileForMatching = Field(..., description="구직자 프로필")
-    jobPostings: List[JobPostingForMatching] = Field(..., description="공고 리스트")
+    jobPostings: Optional[List[JobPostingForMatching]] = Field(
+        default=None,
+        description="공고 리스트 (생략 시 공고 인덱스에서 검색)"
+    )
     topK: int = Field(default=5, description="상위 몇 개 반환")
+    deferReasons: bool = Field(
+        default=False,
+        description="True면 매칭 근거를 기다리지 않고 점수와 reasonId만 즉시 반환"
+    )
+
+
+class CandidateSearchFilters(BaseModel):
+    """구직자 인덱스 검색 필터"""
+    experienceMin: Optional[int] = Field(default=None, description="최소 경력 (년)")
+    experienceMax: Optional[int] = Field(default=None, description="최대 경력 (년)")
+    desiredPositions: List[str] = Field(default=[], description="희망 직무 (하나라도 일치)")
+    skills: List[str] = Field(default=[], description="기술 스택")
+    skillsMatch: Literal["any", "all"] = Field(default="any", description="기술 일치 방식 (any|all)")
 
 
 class RecommendCandidatesRequest(BaseModel):
     """공고 추천 후보자 요청"""
     jobPosting: JobPostingForMatching = Field(..., description="채용 공고")
-    candidateProfiles: List[CandidateProfileForMatching] = Field(..., description="후보자 리스트")
+    candidateProfiles: Optional[List[CandidateProfileForMatching]] = Field(
+        default=None,
+        description="후보자 리스트 (생략 시 구직자 인덱스에서 검색)"
+    )
+    filters: Optional[CandidateSearchFilters] = Field(
+        default=None,
+        description="구직자 인덱스 검색 필터 (candidateProfiles 생략 시 적용)"
+    )
     topK: int = Field(default=5, description="상위 몇 명 반환")
+    deferReasons: bool = Field(
+        default=False,
+        description="True면 매칭 근거를 기다리지 않고 점수와 reasonId만 즉시 반환"
+    )
 
 
 class JobRecommendation(BaseModel):
     """공고 추천 결과"""
     jobPosting: Dict[str, Any] = Field(..., description="공고 정보")
     matchingScore: float = Field(..., description="매칭 점수")
-    matchingReason: str = Field(..., description="매칭 근거")
+    matchingReason: Optional[str] = Field(default=None, description="매칭 근거 (deferReasons면 생성 전까지 None)")
+    reasonId: str = Field(..., description="매칭 근거 핸들 (/matching-reasons로 조회)")
 
 
 class CandidateRecommendation(BaseModel):
     """후보자 추천 결과"""
     candidate: Dict[str, Any] = Field(..., description="후보자 정보")
     matchingScore: float = Field(..., description="매칭 점수")
-    matchingReason: str = Field(..., description="매칭 근거")
+    matchingReason: Optional[str] = Field(default=None, description="매칭 근거 (deferReasons면 생성 전까지 None)")
+    reasonId: str = Field(..., description="매칭 근거 핸들 (/matching-reasons로 조회)")
 
 
 class RecommendJobsResponse(BaseModel):
@@ -78,3 +107,32 @@ class RecommendCandidatesResponse(BaseModel):
     recommendations: List[CandidateRecommendation] = Field(..., description="추천 후보자 리스트")
     total: int = Field(..., description="추천 후보자 수")
 
+
+class MatchingReasonResponse(BaseModel):
+    """매칭 근거 조회 응답"""
+    reasonId: str = Field(..., description="매칭 근거 핸들")
+    status: Literal["done", "pending", "timeout"] = Field(..., description="생성 상태")
+    matchingReason: Optional[str] = Field(default=None, description="매칭 근거 (완료 시)")
+
+
+
+class IndexJobPostingsRequest(BaseModel):
+    """공고 인덱스 등록/갱신 요청"""
+    jobPostings: List[JobPostingForMatching] = Field(..., description="등록할 공고 리스트")
+
+
+class IndexCandidateProfilesRequest(BaseModel):
+    """구직자 인덱스 등록/갱신 요청"""
+    candidateProfiles: List[CandidateProfileForMatching] = Field(..., description="등록할 구직자 프로필 리스트")
+
+
+class IndexUpsertResponse(BaseModel):
+    """인덱스 등록/갱신 응답"""
+    upserted: int = Field(..., description="반영된 항목 수")
+    total: int = Field(..., description="인덱스 전체 항목 수")
+
+
+class IndexDeleteResponse(BaseModel):
+    """인덱스 삭제 응답"""
+    deleted: bool = Field(..., description="삭제 여부")
+    total: int = Field(..., description="인덱스 전체 항목 수")
@@ -3,27 +3,127 @@
 각 답변의 품질을 분석하고 점수를 매김
 """
 
-from typing import Dict, List
-from openai import OpenAI
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from openai import AsyncOpenAI
+import asyncio
 import os
 import json
 
+from app.utils.token_budget import chunk_by_token_budget, estimate_tokens
+
 # OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# 답변 분석 동시 호출 수 (전체 요청 공유) / 답변별 재시도 횟수 / 호출 제한 시간(초)
+ANSWER_ANALYSIS_CONCURRENCY = int(os.getenv("ANSWER_ANALYSIS_CONCURRENCY", "5"))
+ANSWER_ANALYSIS_RETRIES = int(os.getenv("ANSWER_ANALYSIS_RETRIES", "1"))
+ANSWER_ANALYSIS_TIMEOUT = float(os.getenv("ANSWER_ANALYSIS_TIMEOUT", "60"))
+_analysis_semaphore = asyncio.Semaphore(ANSWER_ANALYSIS_CONCURRENCY)
 
-def analyze_single_answer(
-    question: str,
-    answer: str,
-    candidate_profile: Dict = None
-) -> Dict:
+# 답변 채점 방식
+# - per_answer: 답변마다 GPT 1회 호출 (동시 실행)
+# - batch: 모든 Q&A를 한 요청으로 채점, 토큰 예산을 넘으면 여러 요청으로 분할
+SCORING_MODES = ("per_answer", "batch")
+EVALUATION_SCORING_MODE = os.getenv("EVALUATION_SCORING_MODE", "per_answer")
+# batch 모드 요청 1건에 담을 Q&A 토큰 예산 (답변별 응답 토큰 추정치 포함)
+ANSWER_BATCH_TOKEN_BUDGET = int(os.getenv("ANSWER_BATCH_TOKEN_BUDGET", "6000"))
+# 답변 1건당 응답 JSON 토큰 추정치
+ANSWER_BATCH_OUTPUT_TOKENS = 120
+
+# batch 모드 응답 구조 (Structured Outputs - 답변별 분석 배열)
+ANSWER_BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "answer_batch_analysis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "answers": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "index": {"type": "integer"},
+                            "technical_score": {"type": "number"},
+                            "communication_score": {"type": "number"},
+                            "problem_solving_score": {"type": "number"},
+                            "keywords": {"type": "array", "items": {"type": "string"}},
+                            "depth_level": {"type": "string"},
+                            "reasoning": {"type": "string"},
+                        },
+                        "required": [
+                            "index",
+                            "technical_score",
+                            "communication_score",
+                            "problem_solving_score",
+                            "keywords",
+                            "depth_level",
+                            "reasoning",
+                        ],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["answers"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _fallback_analysis() -> Dict:
+    """분석 실패 시 기본 점수 (degraded 표시 - 평가 캐시에 보관하지 않도록)"""
+    return {
+        "technical_score": 5.0,
+        "communication_score": 5.0,
+        "problem_solving_score": 5.0,
+        "keywords": [],
+        "depth_level": "보통",
+        "reasoning": "분석 중 오류가 발생했습니다.",
+        "degraded": True
+    }
+
+
+def _clamp_analysis_scores(result: Dict) -> Dict:
+    """점수 검증 (0-10 범위)"""
+    result["technical_score"] = max(0, min(10, result.get("technical_score", 5)))
+    result["communication_score"] = max(0, min(10, result.get("communication_score", 5)))
+    result["problem_solving_score"] = max(0, min(10, result.get("problem_solving_score", 5)))
+    return result
+
+
+def _valid_batch_entry(entry) -> bool:
+    """batch 응답 항목 형식 검증 (스키마를 지원하지 않는 모델의 응답도 걸러냄)"""
+    if not isinstance(entry, dict) or type(entry.get("index")) is not int:
+        return False
+    scores_ok = all(
+        isinstance(entry.get(field), (int, float)) and not isinstance(entry.get(field), bool)
+        for field in ("technical_score", "communication_score", "problem_solving_score")
+    )
+    keywords = entry.get("keywords")
+    return (
+        scores_ok
+        and isinstance(keywords, list)
+        and all(isinstance(keyword, str) for keyword in keywords)
+        and isinstance(entry.get("depth_level"), str)
+        and isinstance(entry.get("reasoning"), str)
+    )
+
+
+def resolve_scoring_mode(scoring_mode: Optional[str] = None) -> str:
+    """요청/환경 변수의 채점 방식 확인 (알 수 없는 값은 per_answer)"""
+    mode = (scoring_mode or EVALUATION_SCORING_MODE).lower()
+    return mode if mode in SCORING_MODES else "per_answer"
+
+
+async def request_answer_analysis(question: str, answer: str) -> Dict:
     """
-    단일 답변 분석
+    단일 답변 분석 GPT 호출 (재시도 후에도 실패하면 마지막 예외를 그대로 전달)
     
     Args:
         question: 질문
         answer: 답변
-        candidate_profile: 구직자 프로필
     
     Returns:
         분석 결과 딕셔너리 (scores, keywords, depth_level)
@@ -54,50 +154,181 @@ def analyze_single_answer(
 
 위 답변을 분석하고 평가해주세요."""
 
+    # 일시적 오류(타임아웃, 429 등)는 ANSWER_ANALYSIS_RETRIES회까지 재시도
+    for attempt in range(ANSWER_ANALYSIS_RETRIES + 1):
+        try:
+            async with _analysis_semaphore:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=os.getenv("OPENAI_MODEL", "gpt-4o"),
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        response_format={"type": "json_object"}  # JSON 응답 강제
+                    ),
+                    timeout=ANSWER_ANALYSIS_TIMEOUT
+                )
+            
+            result = json.loads(response.choices[0].message.content)
+            
+            # 점수 검증 (0-10 범위)
+            return _clamp_analysis_scores(result)
+            
+        except Exception as e:
+            print(f"[Answer Analyzer] 답변 분석 오류 (시도 {attempt + 1}/{ANSWER_ANALYSIS_RETRIES + 1}): {e!r}")
+            if attempt >= ANSWER_ANALYSIS_RETRIES:
+                raise
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+
+async def analyze_single_answer(
+    question: str,
+    answer: str,
+    candidate_profile: Dict = None
+) -> Dict:
+    """
+    단일 답변 분석
+    
+    Args:
+        question: 질문
+        answer: 답변
+        candidate_profile: 구직자 프로필
+    
+    Returns:
+        분석 결과 딕셔너리 (scores, keywords, depth_level)
+    """
     try:
-        response = client.chat.completions.create(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            response_format={"type": "json_object"}  # JSON 응답 강제
+        return await request_answer_analysis(question, answer)
+    except Exception:
+        # 재시도 후에도 실패하면 기본 점수 반환
+        return _fallback_analysis()
+
+
+async def _analyze_answer_chunk(chunk: List[Tuple[int, Tuple[str, str]]]) -> Dict[int, Dict]:
+    """
+    Q&A 묶음을 GPT 1회 호출로 채점
+
+    Args:
+        chunk: (전체 순번, (질문, 답변)) 리스트
+
+    Returns:
+        전체 순번 → 분석 결과 (응답에서 빠진 답변은 포함되지 않음)
+    """
+    
+    system_prompt = """당신은 HR 면접 평가 전문가입니다.
+번호가 매겨진 여러 질문과 답변을 각각 독립적으로 분석하여 다음 기준으로 평가하세요:
+
+1. 기술 역량 (Technical): 기술적 지식의 정확성과 깊이
+2. 커뮤니케이션 (Communication): 명확성, 논리성, 표현력
+3. 문제 해결 능력 (Problem Solving): 사고의 체계성, 해결 접근법
+
+각 항목을 0-10점으로 평가하고, 모든 답변의 결과를 번호와 함께 JSON 형식으로 응답하세요.
+
+응답 형식:
+{
+  "answers": [
+    {
+      "index": 1,
+      "technical_score": 8.5,
+      "communication_score": 7.0,
+      "problem_solving_score": 9.0,
+      "keywords": ["Python", "Django", "문제 해결"],
+      "depth_level": "상세",
+      "reasoning": "답변의 평가 근거"
+    }
+  ]
+}"""
+
+    blocks = [
+        f"[{number}]\n질문: {question}\n답변: {answer}"
+        for number, (_, (question, answer)) in enumerate(chunk, start=1)
+    ]
+    user_prompt = "\n\n".join(blocks) + f"\n\n위 {len(chunk)}개 답변을 각각 분석하고 평가해주세요."
+    
+    for attempt in range(ANSWER_ANALYSIS_RETRIES + 1):
+        try:
+            async with _analysis_semaphore:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=os.getenv("OPENAI_MODEL", "gpt-4o"),
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        response_format=ANSWER_BATCH_RESPONSE_FORMAT
+                    ),
+                    timeout=ANSWER_ANALYSIS_TIMEOUT
+                )
+            
+            entries = json.loads(response.choices[0].message.content).get("answers", [])
+            
+            # 형식이 맞지 않거나 번호가 범위를 벗어난 항목은 버림 (누락 답변은 답변별 분석으로 재채점)
+            results = {}
+            for entry in entries if isinstance(entries, list) else []:
+                if not _valid_batch_entry(entry):
+                    continue
+                number = entry.pop("index")
+                if 1 <= number <= len(chunk):
+                    results[chunk[number - 1][0]] = _clamp_analysis_scores(entry)
+            return results
+            
+        except Exception as e:
+            print(f"[Answer Analyzer] 일괄 분석 오류 (시도 {attempt + 1}/{ANSWER_ANALYSIS_RETRIES + 1}): {e!r}")
+            if attempt < ANSWER_ANALYSIS_RETRIES:
+                await asyncio.sleep(0.5 * 2 ** attempt)
+    
+    return {}
+
+
+async def analyze_answers_batch(qa_pairs: List[Tuple[str, str]]) -> List[Dict]:
+    """
+    여러 Q&A를 묶어서 채점 (batch 모드)
+    
+    토큰 예산(ANSWER_BATCH_TOKEN_BUDGET) 단위로 나눈 묶음마다 GPT를 1회 호출하고,
+    응답에서 빠지거나 실패한 답변만 답변별 분석으로 다시 채점한다.
+    
+    Args:
+        qa_pairs: (질문, 답변) 리스트
+    
+    Returns:
+        입력 순서와 같은 분석 결과 리스트
+    """
+    
+    chunks = chunk_by_token_budget(
+        list(enumerate(qa_pairs)),
+        ANSWER_BATCH_TOKEN_BUDGET,
+        lambda item: estimate_tokens(item[1][0]) + estimate_tokens(item[1][1]) + ANSWER_BATCH_OUTPUT_TOKENS
+    )
+    print(f"[Answer Analyzer] 일괄 채점: 답변 {len(qa_pairs)}개 → 요청 {len(chunks)}건")
+    
+    results: Dict[int, Dict] = {}
+    for chunk_results in await asyncio.gather(*(_analyze_answer_chunk(chunk) for chunk in chunks)):
+        results.update(chunk_results)
+    
+    missing = [i for i in range(len(qa_pairs)) if i not in results]
+    if missing:
+        print(f"[Answer Analyzer] 일괄 채점 누락 {len(missing)}개 → 답변별 분석")
+        retried = await asyncio.gather(
+            *(analyze_single_answer(*qa_pairs[i]) for i in missing)
         )
-        
-        result = json.loads(response.choices[0].message.content)
-        
-        # 점수 검증 (0-10 범위)
-        result["technical_score"] = max(0, min(10, result.get("technical_score", 5)))
-        result["communication_score"] = max(0, min(10, result.get("communication_score", 5)))
-        result["problem_solving_score"] = max(0, min(10, result.get("problem_solving_score", 5)))
-        
-        return result
-        
-    except Exception as e:
-        print(f"[Answer Analyzer] 답변 분석 오류: {e}")
-        # 기본 점수 반환
-        return {
-            "technical_score": 5.0,
-            "communication_score": 5.0,
-            "problem_solving_score": 5.0,
-            "keywords": [],
-            "depth_level": "보통",
-            "reasoning": "분석 중 오류가 발생했습니다."
-        }
+        results.update(zip(missing, retried))
+    
+    return [results[i] for i in range(len(qa_pairs))]
 
 
-def analyze_all_answers(conversation_history: List[Dict]) -> List[Dict]:
+def extract_qa_pairs(conversation_history: List[Dict]) -> List[Tuple[str, str]]:
     """
-    모든 답변 분석
+    대화 기록에서 (질문, 답변) 쌍 추출
     
     Args:
         conversation_history: 전체 대화 기록
     
     Returns:
-        각 답변의 분석 결과 리스트
+        (질문, 답변) 리스트 (대화 순서)
     """
     
-    analyzed_answers = []
+    qa_pairs = []
     
     # ✅ 디버깅: 대화 기록 출력
     print(f"[Answer Analyzer] 전체 대화 기록 개수: {len(conversation_history)}")
@@ -115,12 +346,92 @@ def analyze_all_answers(conversation_history: List[Dict]) -> List[Dict]:
             answer = conversation_history[i + 1]["content"]
             
             print(f"[Answer Analyzer] Q&A 쌍 발견: Q={question[:30]}... A={answer[:30]}...")
-            
-            analysis = analyze_single_answer(question, answer)
-            analysis["question"] = question
-            analysis["answer"] = answer
-            
-            analyzed_answers.append(analysis)
+            qa_pairs.append((question, answer))
+    
+    return qa_pairs
+
+
+async def iter_answer_analyses(
+    qa_pairs: List[Tuple[str, str]],
+    scoring_mode: Optional[str] = None,
+    interview_id: Optional[str] = None
+) -> AsyncIterator[Tuple[int, Dict]]:
+    """
+    답변 분석 결과를 완료되는 순서대로 반환
+    
+    interview_id가 있으면 인터뷰 중 미리 분석해 둔 평가 세션 결과를 먼저 반환하고,
+    세션에 없는 답변만 새로 분석한다. batch 모드는 일괄 채점이 끝난 뒤 한꺼번에 반환한다.
+    
+    Args:
+        qa_pairs: (질문, 답변) 리스트
+        scoring_mode: 채점 방식 (per_answer|batch, 기본: EVALUATION_SCORING_MODE)
+        interview_id: 인터뷰 ID (평가 세션 조회용)
+    
+    Yields:
+        (qa_pairs 내 순번, 분석 결과 - question/answer 필드 포함)
+    """
+    
+    def with_pair(index: int, analysis: Dict) -> Tuple[int, Dict]:
+        question, answer = qa_pairs[index]
+        analysis["question"] = question
+        analysis["answer"] = answer
+        return index, analysis
+    
+    analyses: List[Optional[Dict]] = [None] * len(qa_pairs)
+    if interview_id:
+        from app.services.evaluation_session import get_evaluation_session_store
+        analyses = await get_evaluation_session_store().collect(interview_id, qa_pairs)
+    
+    missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+    if interview_id:
+        print(f"[Answer Analyzer] 평가 세션 결과 재사용: {len(qa_pairs) - len(missing)}/{len(qa_pairs)}개")
+    
+    for i, analysis in enumerate(analyses):
+        if analysis is not None:
+            yield with_pair(i, analysis)
+    
+    if not missing:
+        return
+    
+    if resolve_scoring_mode(scoring_mode) == "batch":
+        fresh = await analyze_answers_batch([qa_pairs[i] for i in missing])
+        for i, analysis in zip(missing, fresh):
+            yield with_pair(i, analysis)
+        return
+    
+    # 답변별 분석을 동시에 실행 (동시 호출 수는 ANSWER_ANALYSIS_CONCURRENCY로 제한)
+    async def analyze(index: int) -> Tuple[int, Dict]:
+        return index, await analyze_single_answer(*qa_pairs[index])
+    
+    for next_done in asyncio.as_completed([analyze(i) for i in missing]):
+        yield with_pair(*await next_done)
+
+
+async def analyze_all_answers(
+    conversation_history: List[Dict],
+    scoring_mode: Optional[str] = None,
+    interview_id: Optional[str] = None
+) -> List[Dict]:
+    """
+    모든 답변 분석
+    
+    interview_id가 있으면 인터뷰 중 미리 분석해 둔 평가 세션 결과를 재사용하고,
+    세션에 없는 답변만 새로 분석한다.
+    
+    Args:
+        conversation_history: 전체 대화 기록
+        scoring_mode: 채점 방식 (per_answer|batch, 기본: EVALUATION_SCORING_MODE)
+        interview_id: 인터뷰 ID (평가 세션 조회용)
+    
+    Returns:
+        각 답변의 분석 결과 리스트 (질문 순서)
+    """
+    
+    qa_pairs = extract_qa_pairs(conversation_history)
+    
+    analyzed_answers: List[Optional[Dict]] = [None] * len(qa_pairs)
+    async for index, analysis in iter_answer_analyses(qa_pairs, scoring_mode, interview_id):
+        analyzed_answers[index] = analysis
     
     print(f"[Answer Analyzer] 분석된 답변 개수: {len(analyzed_answers)}")
     return analyzed_answers
@@ -178,7 +489,7 @@ def calculate_aggregate_scores(analyzed_answers: List[Dict]) -> Dict:
     }
 
 
-def generate_instant_feedback(
+async def generate_instant_feedback(
     question: str,
     answer: str,
     question_type: str = "competency"
@@ -221,7 +532,7 @@ JSON 형식으로 응답하세요:
 위 답변에 대한 즉시 피드백을 제공해주세요."""
     
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=os.getenv("OPENAI_MODEL", "gpt-4o"),
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -0,0 +1,150 @@
+"""
+STT 업로드 오디오 변환 정책
+Whisper가 그대로 받을 수 있는 형식은 재인코딩 없이 보내고, 필요한 경우에만 작은 코덱으로 변환
+
+- 파일 앞부분(매직 바이트)으로 컨테이너 판별 (파일명/Content-Type은 신뢰하지 않음)
+- 지원 형식(webm/opus, ogg, mp3, m4a, wav, flac): 원본 그대로 전송
+- 그 외(판별 불가 포함): CPU 작업 스레드 풀에서 ffmpeg로 Opus(ogg, 16kHz 모노) 변환
+- 변환 실패 시 원본을 그대로 보내 Whisper가 판단하도록 함 (기존 동작과 동일)
+
+STT_TRANSCODE_POLICY
+    auto: 지원 형식은 그대로, 나머지만 변환 (기본)
+    always: 모든 입력을 변환 (업로드 크기 우선)
+    never: 변환하지 않음 (ffmpeg 없는 환경)
+"""
+
+from typing import Dict, Optional, Tuple
+import io
+import os
+
+from app.utils.executor import run_cpu_bound
+
+# Whisper 업로드 지원 형식 → (파일 확장자, Content-Type)
+WHISPER_FORMATS: Dict[str, Tuple[str, str]] = {
+    "webm": ("webm", "audio/webm"),
+    "ogg": ("ogg", "audio/ogg"),
+    "mp3": ("mp3", "audio/mpeg"),
+    "mp4": ("m4a", "audio/mp4"),
+    "wav": ("wav", "audio/wav"),
+    "flac": ("flac", "audio/flac"),
+}
+
+STT_TRANSCODE_POLICY = os.getenv("STT_TRANSCODE_POLICY", "auto").lower()
+# 변환 시 Opus 비트레이트 (음성 인식에는 24k면 충분)
+STT_TRANSCODE_BITRATE = os.getenv("STT_TRANSCODE_BITRATE", "24k")
+STT_TRANSCODE_SAMPLE_RATE = 16000
+
+
+def detect_audio_format(data: bytes) -> Optional[str]:
+    """
+    오디오 컨테이너 판별 (매직 바이트)
+
+    Returns:
+        WHISPER_FORMATS 키 (판별 불가 시 None)
+    """
+    if data.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"
+    if data.startswith(b"OggS"):
+        return "ogg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "wav"
+    if data.startswith(b"fLaC"):
+        return "flac"
+    if data[4:8] == b"ftyp":
+        return "mp4"
+    if data.startswith(b"ID3") or (len(data) > 1 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0):
+        return "mp3"
+    return None
+
+
+def transcode_to_opus(data: bytes, source_format: Optional[str] = None) -> bytes:
+    """
+    오디오 → Opus(ogg, 16kHz 모노) 변환 (CPU 작업, pydub/ffmpeg 필요)
+
+    Args:
+        data: 원본 오디오
+        source_format: 원본 형식 (None이면 ffmpeg가 판별)
+    """
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(io.BytesIO(data), format=source_format)
+    audio = audio.set_channels(1).set_frame_rate(STT_TRANSCODE_SAMPLE_RATE)
+    output = io.BytesIO()
+    audio.export(output, format="ogg", codec="libopus", bitrate=STT_TRANSCODE_BITRATE)
+    return output.getvalue()
+
+
+class TranscodingStats:
+    """변환 정책 통계 (원본 전송/변환/실패 건수, 입출력 바이트)"""
+
+    def __init__(self):
+        self.passthrough = 0
+        self.transcoded = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, kind: str, bytes_in: int, bytes_out: int):
+        setattr(self, kind, getattr(self, kind) + 1)
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+
+    def to_dict(self) -> Dict:
+        return {
+            "policy": STT_TRANSCODE_POLICY,
+            "passthrough": self.passthrough,
+            "transcoded": self.transcoded,
+            "failed": self.failed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+
+_stats = TranscodingStats()
+
+
+def get_transcoding_stats() -> Dict:
+    """변환 정책 통계"""
+    return _stats.to_dict()
+
+
+async def prepare_for_transcription(
+    data: bytes,
+    filename: Optional[str] = None,
+    policy: Optional[str] = None
+) -> Tuple[str, bytes, str]:
+    """
+    Whisper 업로드용 오디오 준비
+
+    Args:
+        data: 원본 오디오
+        filename: 원본 파일명 (판별 불가 시 확장자 참고)
+        policy: auto/always/never (None이면 STT_TRANSCODE_POLICY)
+
+    Returns:
+        (파일명, 오디오, Content-Type) - openai 파일 튜플로 바로 사용
+    """
+    policy = policy or STT_TRANSCODE_POLICY
+    source_format = detect_audio_format(data)
+
+    if policy == "never" or (policy == "auto" and source_format is not None):
+        _stats.record("passthrough", len(data), len(data))
+        return _file_tuple(data, source_format, filename)
+
+    try:
+        converted = await run_cpu_bound(transcode_to_opus, data, source_format)
+    except Exception as e:
+        print(f"[Transcoding] 변환 실패, 원본 전송: {e}")
+        _stats.record("failed", len(data), len(data))
+        return _file_tuple(data, source_format, filename)
+
+    _stats.record("transcoded", len(data), len(converted))
+    return ("audio.ogg", converted, "audio/ogg")
+
+
+def _file_tuple(data: bytes, source_format: Optional[str], filename: Optional[str]) -> Tuple[str, bytes, str]:
+    """원본 전송용 파일 튜플 (판별 불가면 원본 파일명, 그것도 없으면 webm으로 간주)"""
+    if source_format is None:
+        return (filename or "audio.webm", data, "application/octet-stream")
+    extension, content_type = WHISPER_FORMATS[source_format]
+    return (f"audio.{extension}", data, content_type)
@@ -0,0 +1,229 @@
+"""
+임베딩 캐시 서비스
+조합된 프로필/공고 텍스트의 해시(+모델명)를 키로 임베딩을 재사용
+
+- 1차: 프로세스 내 LRU 캐시
+- 2차: SQLite 디스크 캐시 (float32 BLOB, 재시작 후에도 유지)
+- 메모리 히트도 일정 간격으로 디스크 last_access에 반영 (자주 쓰는 키가 디스크에서 먼저 밀려나지 않도록)
+"""
+
+from typing import Dict, Iterable, Optional, Set
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from app.utils.cache import LRUCache
+
+
+def make_embedding_key(text: str, model_name: str) -> str:
+    """텍스트 + 모델명 기반 콘텐츠 주소 키 (SHA-256)"""
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    2계층 임베딩 캐시
+
+    Args:
+        db_path: SQLite 파일 경로 (None이면 메모리 계층만 사용)
+        memory_entries: 메모리 LRU 최대 항목 수
+        disk_entries: 디스크 최대 항목 수 (초과 시 오래 사용되지 않은 항목부터 제거)
+        touch_interval: 메모리 히트를 디스크 last_access에 모아서 반영하는 간격(초)
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        memory_entries: int = 10000,
+        disk_entries: int = 200000,
+        touch_interval: float = 60
+    ):
+        self.memory = LRUCache(max_entries=memory_entries)
+        self.disk_entries = disk_entries
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.touch_interval = touch_interval
+        self._lock = threading.Lock()
+        self._conn = None
+        # 디스크 last_access 갱신을 기다리는 메모리 히트 키
+        self._touched: Set[str] = set()
+        self._last_touch = time.time()
+
+        if db_path:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, "
+                "vector BLOB NOT NULL, "
+                "last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access "
+                "ON embeddings (last_access)"
+            )
+            self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        여러 키를 한 번에 조회
+
+        Returns:
+            {key: float32 벡터} (캐시에 있는 키만 포함)
+        """
+        found = {}
+        disk_lookup = []
+
+        for key in keys:
+            vector = self.memory.get(key)
+            if vector is not None:
+                found[key] = vector
+            else:
+                disk_lookup.append(key)
+
+        if self._conn is None:
+            return found
+
+        now = time.time()
+        with self._lock:
+            self._touched.update(key for key in found)
+            if now - self._last_touch >= self.touch_interval:
+                self._flush_touched(now)
+
+        if disk_lookup:
+            with self._lock:
+                # SQLite 변수 개수 제한을 피하기 위해 나눠서 조회
+                for start in range(0, len(disk_lookup), 500):
+                    chunk = disk_lookup[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        chunk
+                    ).fetchall()
+
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self.memory.set(key, vector)
+
+                    if rows:
+                        self._conn.executemany(
+                            "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                            [(now, key) for key, _ in rows]
+                        )
+                self._conn.commit()
+
+                hit_count = sum(1 for key in disk_lookup if key in found)
+                self.disk_hits += hit_count
+                self.disk_misses += len(disk_lookup) - hit_count
+
+        return found
+
+    def _flush_touched(self, now: float):
+        """모아 둔 메모리 히트 키의 디스크 last_access 갱신 (self._lock 안에서 호출)"""
+        touched, self._touched = self._touched, set()
+        self._last_touch = now
+        if touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                [(now, key) for key in touched]
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """단일 키 조회"""
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        """여러 임베딩 저장 (메모리 + 디스크)"""
+        if not items:
+            return
+
+        for key, vector in items.items():
+            self.memory.set(key, np.asarray(vector, dtype=np.float32))
+
+        if self._conn is None:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                [
+                    (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for key, vector in items.items()
+                ]
+            )
+
+            # 용량 초과 시 오래 사용되지 않은 항목 제거 (메모리 히트를 먼저 반영)
+            count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if count > self.disk_entries:
+                self._flush_touched(now)
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    "SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.disk_entries,)
+                )
+            self._conn.commit()
+
+    def put(self, key: str, vector: np.ndarray):
+        """단일 임베딩 저장"""
+        self.put_many({key: vector})
+
+    def stats(self) -> Dict:
+        """메모리/디스크 계층 통계"""
+        disk_count = 0
+        with self._lock:
+            if self._conn is not None:
+                disk_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            disk_hits, disk_misses = self.disk_hits, self.disk_misses
+
+        disk_total = disk_hits + disk_misses
+        return {
+            "memory": self.memory.stats(),
+            "disk": {
+                "enabled": self._conn is not None,
+                "entries": disk_count,
+                "max_entries": self.disk_entries,
+                "hits": disk_hits,
+                "misses": disk_misses,
+                "hit_rate": round(disk_hits / disk_total, 4) if disk_total else 0.0,
+            },
+        }
+
+
+# 전역 캐시 (한 번만 생성)
+_cache = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """임베딩 캐시 싱글톤 (EMBEDDING_CACHE_ENABLED=false면 None)"""
+    global _cache
+    if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() != "true":
+        return None
+
+    if _cache is None:
+        _cache = EmbeddingCache(
+            db_path=os.getenv("EMBEDDING_CACHE_PATH", "./data/embedding_cache.sqlite3") or None,
+            memory_entries=int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "10000")),
+            disk_entries=int(os.getenv("EMBEDDING_CACHE_DISK_ENTRIES", "200000"))
+        )
+        print("[Embedding Cache] 임베딩 캐시 초기화 완료")
+    return _cache
+
+
+def get_embedding_cache_stats() -> Dict:
+    """임베딩 캐시 통계 (비활성화 시 enabled=False, 아직 생성 전이면 initialized=False)"""
+    if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() != "true":
+        return {"enabled": False}
+    if _cache is None:
+        return {"enabled": True, "initialized": False}
+    return {"enabled": True, "initialized": True, **_cache.stats()}
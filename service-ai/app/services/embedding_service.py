@@ -6,19 +6,35 @@ Sentence-Transformers를 사용한 텍스트 임베딩
 from typing import List
 from sentence_transformers import SentenceTransformer
 import numpy as np
+import os
+import threading
+
+from app.services.embedding_cache import get_embedding_cache, make_embedding_key
+
+# 임베딩 모델명 (캐시 키에도 포함)
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "jhgan/ko-sbert-nli")
+
+# 임베딩 차원 (jhgan/ko-sbert-nli 출력 크기)
+EMBEDDING_DIM = 768
+
+# 배치 인코딩 시 한 번의 forward pass에 넣을 텍스트 수
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
 
 # 한국어 특화 모델 로드 (전역 변수로 한 번만 로드)
 # jhgan/ko-sbert-nli: 한국어 NLI 데이터로 학습된 SBERT 모델
 _model = None
+_model_lock = threading.Lock()
 
 
 def get_embedding_model():
-    """임베딩 모델 싱글톤 패턴으로 로드"""
+    """임베딩 모델 싱글톤 패턴으로 로드 (작업 스레드에서 동시에 호출되어도 한 번만 로드)"""
     global _model
     if _model is None:
-        print("[Embedding Service] 임베딩 모델 로딩 중...")
-        _model = SentenceTransformer('jhgan/ko-sbert-nli')
-        print("[Embedding Service] 임베딩 모델 로딩 완료")
+        with _model_lock:
+            if _model is None:
+                print("[Embedding Service] 임베딩 모델 로딩 중...")
+                _model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+                print("[Embedding Service] 임베딩 모델 로딩 완료")
     return _model
 
 
@@ -34,34 +50,110 @@ def generate_embedding(text: str) -> List[float]:
     """
     if not text or not text.strip():
         # 빈 텍스트는 영벡터 반환
-        return [0.0] * 768
+        return [0.0] * EMBEDDING_DIM
+    
+    # 캐시 조회 (텍스트 + 모델명 해시)
+    cache = get_embedding_cache()
+    cache_key = make_embedding_key(text, EMBEDDING_MODEL_NAME)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached.tolist()
     
     model = get_embedding_model()
     embedding = model.encode(text, convert_to_numpy=True)
     
+    if cache is not None:
+        cache.put(cache_key, embedding)
+    
     # NumPy 배열을 Python 리스트로 변환
     return embedding.tolist()
 
 
-def generate_candidate_embedding(
+def generate_embeddings_batch(
+    texts: List[str],
+    batch_size: int = None
+) -> np.ndarray:
+    """
+    여러 텍스트를 한 번에 벡터로 변환 (배치 인코딩)
+    
+    텍스트 길이순으로 정렬한 뒤 batch_size 단위 버킷으로 나눠 인코딩하여
+    한 배치 안의 패딩을 최소화한다. 동일한 텍스트는 한 번만 인코딩하고,
+    임베딩 캐시에 있는 텍스트는 인코딩하지 않는다.
+    
+    Args:
+        texts: 임베딩할 텍스트 리스트
+        batch_size: 배치 크기 (기본: EMBEDDING_BATCH_SIZE)
+    
+    Returns:
+        (N, 768) float32 행렬 (입력 순서 유지, 빈 텍스트는 영벡터)
+    """
+    embeddings = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    
+    # 빈 텍스트 제외 + 중복 제거 (텍스트 → 결과 행 인덱스 목록)
+    positions = {}
+    for i, text in enumerate(texts):
+        if text and text.strip():
+            positions.setdefault(text, []).append(i)
+    
+    if not positions:
+        return embeddings
+    
+    # 캐시에 있는 텍스트는 인코딩 생략
+    cache = get_embedding_cache()
+    missing = list(positions.keys())
+    if cache is not None:
+        keys = {text: make_embedding_key(text, EMBEDDING_MODEL_NAME) for text in missing}
+        cached = cache.get_many(keys.values())
+        missing = []
+        for text, key in keys.items():
+            if key in cached:
+                embeddings[positions[text]] = cached[key]
+            else:
+                missing.append(text)
+    
+    if not missing:
+        return embeddings
+    
+    # 길이순 정렬 (비슷한 길이끼리 같은 배치에 들어가도록)
+    unique_texts = sorted(missing, key=len, reverse=True)
+    batch_size = batch_size or EMBEDDING_BATCH_SIZE
+    
+    model = get_embedding_model()
+    
+    for start in range(0, len(unique_texts), batch_size):
+        bucket = unique_texts[start:start + batch_size]
+        encoded = model.encode(
+            bucket,
+            batch_size=len(bucket),
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        
+        for text, vector in zip(bucket, encoded):
+            embeddings[positions[text]] = vector
+        
+        if cache is not None:
+            cache.put_many({
+                keys[text]: vector
+                for text, vector in zip(bucket, encoded)
+            })
+    
+    return embeddings
+
+
+def build_candidate_text(
     resume_text: str = None,
     skills: List[str] = None,
     experience: int = None,
     desired_position: str = None
-) -> List[float]:
+) -> str:
     """
-    구직자 프로필을 임베딩으로 변환
-    
-    Args:
-        resume_text: 이력서 텍스트
-        skills: 기술 스택 리스트
-        experience: 경력 (년)
-        desired_position: 희망 직무
+    구직자 프로필을 임베딩용 텍스트로 조합
     
     Returns:
-        768차원 벡터
+        조합된 텍스트
     """
-    # 텍스트 조합
     text_parts = []
     
     if resume_text:
@@ -76,32 +168,22 @@ def generate_candidate_embedding(
     if desired_position:
         text_parts.append(f"희망 직무: {desired_position}")
     
-    combined_text = " ".join(text_parts)
-    
-    return generate_embedding(combined_text)
+    return " ".join(text_parts)
 
 
-def generate_job_posting_embedding(
+def build_job_posting_text(
     title: str = None,
     description: str = None,
     position: str = None,
     requirements: List[str] = None,
     preferred_skills: List[str] = None
-) -> List[float]:
+) -> str:
     """
-    채용 공고를 임베딩으로 변환
-    
-    Args:
-        title: 공고 제목
-        description: 공고 설명
-        position: 직무
-        requirements: 필수 요건
-        preferred_skills: 우대 사항
+    채용 공고를 임베딩용 텍스트로 조합
     
     Returns:
-        768차원 벡터
+        조합된 텍스트
     """
-    # 텍스트 조합
     text_parts = []
     
     if title:
@@ -119,7 +201,64 @@ def generate_job_posting_embedding(
     if preferred_skills:
         text_parts.append(f"우대 사항: {', '.join(preferred_skills)}")
     
-    combined_text = " ".join(text_parts)
+    return " ".join(text_parts)
+
+
+def generate_candidate_embedding(
+    resume_text: str = None,
+    skills: List[str] = None,
+    experience: int = None,
+    desired_position: str = None
+) -> List[float]:
+    """
+    구직자 프로필을 임베딩으로 변환
+    
+    Args:
+        resume_text: 이력서 텍스트
+        skills: 기술 스택 리스트
+        experience: 경력 (년)
+        desired_position: 희망 직무
+    
+    Returns:
+        768차원 벡터
+    """
+    combined_text = build_candidate_text(
+        resume_text=resume_text,
+        skills=skills,
+        experience=experience,
+        desired_position=desired_position
+    )
+    
+    return generate_embedding(combined_text)
+
+
+def generate_job_posting_embedding(
+    title: str = None,
+    description: str = None,
+    position: str = None,
+    requirements: List[str] = None,
+    preferred_skills: List[str] = None
+) -> List[float]:
+    """
+    채용 공고를 임베딩으로 변환
+    
+    Args:
+        title: 공고 제목
+        description: 공고 설명
+        position: 직무
+        requirements: 필수 요건
+        preferred_skills: 우대 사항
+    
+    Returns:
+        768차원 벡터
+    """
+    combined_text = build_job_posting_text(
+        title=title,
+        description=description,
+        position=position,
+        requirements=requirements,
+        preferred_skills=preferred_skills
+    )
     
     return generate_embedding(combined_text)
 
@@ -135,8 +274,8 @@ def calculate_cosine_similarity(embedding1: List[float], embedding2: List[float]
     Returns:
         코사인 유사도 (-1 ~ 1, 높을수록 유사)
     """
-    vec1 = np.array(embedding1)
-    vec2 = np.array(embedding2)
+    vec1 = np.asarray(embedding1, dtype=np.float64)
+    vec2 = np.asarray(embedding2, dtype=np.float64)
     
     # 코사인 유사도 = (A · B) / (||A|| * ||B||)
     dot_product = np.dot(vec1, vec2)
@@ -247,6 +386,24 @@ POSITION_WEIGHTS = {
     },
 }
 
+# 직무 가중치가 정의되지 않은 경우의 균등 가중치
+DEFAULT_POSITION_WEIGHTS = {
+    "informationAnalysis": 0.20,
+    "problemSolving": 0.20,
+    "flexibleThinking": 0.20,
+    "negotiation": 0.20,
+    "itSkills": 0.20
+}
+
+# 역량 점수 키 (가중 합계 계산 순서)
+COMPETENCY_KEYS = [
+    "informationAnalysis",
+    "problemSolving",
+    "flexibleThinking",
+    "negotiation",
+    "itSkills"
+]
+
 
 def calculate_competency_score(
     candidate_evaluation: dict,
@@ -263,13 +420,7 @@ def calculate_competency_score(
         가중 역량 점수 (0-100)
     """
     # 직무별 가중치 가져오기 (없으면 균등 가중치)
-    weights = POSITION_WEIGHTS.get(job_position, {
-        "informationAnalysis": 0.20,
-        "problemSolving": 0.20,
-        "flexibleThinking": 0.20,
-        "negotiation": 0.20,
-        "itSkills": 0.20
-    })
+    weights = POSITION_WEIGHTS.get(job_position, DEFAULT_POSITION_WEIGHTS)
     
     # 5가지 역량 점수 추출 (없으면 0)
     info_analysis = candidate_evaluation.get("informationAnalysis", 0)
@@ -332,10 +483,10 @@ def calculate_matching_score(
     bonus = 0
     
     if candidate_profile and job_posting:
-        # 경력 매칭 보정
-        candidate_exp = candidate_profile.get("experience", 0)
-        min_exp = job_posting.get("experienceMin", 0)
-        max_exp = job_posting.get("experienceMax", 100)
+        # 경력 매칭 보정 (None 값은 NaN으로 두어 비교에서 제외 - 일괄 계산과 동일)
+        candidate_exp = _as_float(candidate_profile.get("experience", 0))
+        min_exp = _as_float(job_posting.get("experienceMin", 0))
+        max_exp = _as_float(job_posting.get("experienceMax", 100))
         
         if min_exp <= candidate_exp <= max_exp:
             bonus += 5  # 경력 범위 내면 +5점
@@ -369,3 +520,167 @@ def calculate_matching_score(
     
     return round(final_score, 2)
 
+
+
+def calculate_matching_scores_batch(
+    query_embedding: List[float],
+    embedding_matrix: np.ndarray,
+    candidate_profiles,
+    job_postings,
+    row_norms: np.ndarray = None
+) -> np.ndarray:
+    """
+    매칭 점수 일괄 계산 (calculate_matching_score의 벡터화 버전)
+    
+    질의 벡터 1개와 (N, 768) 행렬의 코사인 유사도를 한 번의 행렬곱으로 구하고,
+    역량 가중치와 경력/기술 보정도 배열 연산으로 적용한다.
+    쌍마다 calculate_matching_score를 호출한 것과 같은 점수를 반환한다.
+    
+    Args:
+        query_embedding: 질의 벡터 (구직자 또는 공고)
+        embedding_matrix: 비교 대상 임베딩 행렬 (N, 768)
+        candidate_profiles: 구직자 프로필 (dict 1개 또는 N개 리스트)
+        job_postings: 공고 정보 (dict 1개 또는 N개 리스트)
+        row_norms: 미리 계산한 행별 L2 노름 (선택, 인덱스에서 재사용)
+    
+    Returns:
+        매칭 점수 배열 (N,), 0-100
+    """
+    matrix = np.asarray(embedding_matrix, dtype=np.float64)
+    n = matrix.shape[0]
+    
+    if n == 0:
+        return np.zeros(0, dtype=np.float64)
+    
+    # 한쪽이 단일 dict면 N개로 브로드캐스트
+    if candidate_profiles is None or isinstance(candidate_profiles, dict):
+        candidate_profiles = [candidate_profiles] * n
+    if job_postings is None or isinstance(job_postings, dict):
+        job_postings = [job_postings] * n
+    
+    # 1. 벡터 유사도 (행렬곱 한 번)
+    query = np.asarray(query_embedding, dtype=np.float64)
+    query_norm = np.linalg.norm(query)
+    
+    if row_norms is None:
+        row_norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+    
+    denominator = row_norms * query_norm
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine_sim = np.where(denominator > 0, (matrix @ query) / denominator, 0.0)
+    
+    # 2. 0-100 스케일 변환
+    base_score = ((cosine_sim + 1) / 2) * 100
+    
+    # 3. 역량 점수 / 경력·기술 보정용 배열 구성
+    competency_values = np.zeros((n, len(COMPETENCY_KEYS)), dtype=np.float64)
+    competency_weights = np.zeros((n, len(COMPETENCY_KEYS)), dtype=np.float64)
+    has_competency = np.zeros(n, dtype=bool)
+    has_rules = np.zeros(n, dtype=bool)
+    candidate_exp = np.full(n, np.nan)
+    min_exp = np.full(n, np.nan)
+    max_exp = np.full(n, np.nan)
+    required_ratio = np.zeros(n, dtype=np.float64)
+    preferred_ratio = np.zeros(n, dtype=np.float64)
+    
+    for i, (candidate, job) in enumerate(zip(candidate_profiles, job_postings)):
+        if not (candidate and job):
+            continue
+        
+        has_rules[i] = True
+        
+        candidate_evaluation = candidate.get("evaluation")
+        job_position = job.get("position")
+        if candidate_evaluation and job_position:
+            has_competency[i] = True
+            weights = POSITION_WEIGHTS.get(job_position, DEFAULT_POSITION_WEIGHTS)
+            for j, key in enumerate(COMPETENCY_KEYS):
+                competency_values[i, j] = candidate_evaluation.get(key, 0)
+                competency_weights[i, j] = weights[key]
+        
+        # None 값은 NaN으로 두어 경력 범위 비교에서 제외
+        candidate_exp[i] = _as_float(candidate.get("experience", 0))
+        min_exp[i] = _as_float(job.get("experienceMin", 0))
+        max_exp[i] = _as_float(job.get("experienceMax", 100))
+        
+        candidate_skills = set(candidate.get("skills", []))
+        required_skills = set(job.get("requirements", []))
+        preferred_skills = set(job.get("preferredSkills", []))
+        
+        if required_skills:
+            required_ratio[i] = len(candidate_skills & required_skills) / len(required_skills)
+        if preferred_skills:
+            preferred_ratio[i] = len(candidate_skills & preferred_skills) / len(preferred_skills)
+    
+    # 4. 역량 가중 합계 (calculate_competency_score와 같은 순서로 합산 후 반올림)
+    weighted = competency_values[:, 0] * competency_weights[:, 0]
+    for j in range(1, len(COMPETENCY_KEYS)):
+        weighted = weighted + competency_values[:, j] * competency_weights[:, j]
+    competency_score = _round_array(weighted, 2)
+    
+    # 5. 규칙 기반 보정
+    with np.errstate(invalid="ignore"):
+        in_range = (min_exp <= candidate_exp) & (candidate_exp <= max_exp)
+    bonus = np.where(has_rules & in_range, 5.0, 0.0)
+    bonus = bonus + required_ratio * 10
+    bonus = bonus + preferred_ratio * 5
+    
+    # 6. 최종 점수 (역량 점수가 있으면 벡터 60% + 역량 40%)
+    competency_weight = 0.4
+    final_score = np.where(
+        has_competency,
+        (base_score * (1 - competency_weight)) + (competency_score * competency_weight) + bonus,
+        base_score + bonus
+    )
+    
+    # 7. 0-100 범위로 클램핑
+    final_score = np.clip(final_score, 0, 100)
+    
+    return _round_array(final_score, 2)
+
+
+def select_top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    점수 상위 K개 인덱스 선택 (argpartition, 점수 내림차순)
+    
+    동점일 때는 입력 순서를 유지하여 list.sort(reverse=True)와 같은 결과를 낸다.
+    
+    Args:
+        scores: 점수 배열 (N,)
+        top_k: 선택할 개수
+    
+    Returns:
+        선택된 인덱스 배열 (점수 높은 순)
+    """
+    scores = np.asarray(scores)
+    n = len(scores)
+    
+    if top_k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    if top_k < n:
+        # K번째 점수를 기준으로 후보를 좁힌 뒤 동점은 앞선 인덱스부터 채움
+        partitioned = np.argpartition(-scores, top_k - 1)[:top_k]
+        threshold = scores[partitioned].min()
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:top_k - len(above)]
+        selected = np.concatenate([above, ties])
+    else:
+        selected = np.arange(n)
+    
+    order = np.argsort(-scores[selected], kind="stable")
+    return selected[order]
+
+
+def _as_float(value) -> float:
+    """숫자는 float로, None 등은 NaN으로 변환"""
+    return float(value) if isinstance(value, (int, float)) else np.nan
+
+
+def _round_array(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    배열 반올림 (Python round와 같은 결과)
+    
+    np.round는 x * 10^digits 후 반올림하므로 경계값에서 round()와 다를 수 있다.
+    """
+    return np.array([round(float(v), digits) for v in values], dtype=np.float64)
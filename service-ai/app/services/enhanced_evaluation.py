@@ -3,13 +3,23 @@
 5가지 직무역량 + 의사소통능력 평가
 """
 
-from typing import Dict, List
-from openai import OpenAI
+from typing import Dict, List, Optional, Tuple
+from openai import AsyncOpenAI
+import asyncio
 import os
 import json
 import numpy as np
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from app.services.answer_analyzer import (
+    ANSWER_ANALYSIS_RETRIES,
+    ANSWER_ANALYSIS_TIMEOUT,
+    ANSWER_BATCH_TOKEN_BUDGET,
+    _analysis_semaphore,
+    resolve_scoring_mode
+)
+from app.utils.token_budget import chunk_by_token_budget, estimate_tokens
+
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 # 직무별 평가 항목 우선순위
 POSITION_PRIORITIES = {
@@ -61,7 +71,7 @@ POSITION_PRIORITIES = {
 }
 
 
-def analyze_answer_with_criteria(
+async def analyze_answer_with_criteria(
     question: str,
     answer: str,
     question_criteria: str  # 질문이 평가하는 항목 (예: "정보분석능력")
@@ -124,14 +134,16 @@ JSON 형식:
 """
 
     try:
-        response = client.chat.completions.create(
-            model=os.getenv("OPENAI_MODEL", "gpt-5"),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
+        # 답변 분석 동시 호출 수 제한 (answer_analyzer와 공유)
+        async with _analysis_semaphore:
+            response = await client.chat.completions.create(
+                model=os.getenv("OPENAI_MODEL", "gpt-5"),
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format={"type": "json_object"}
+            )
         
         result = json.loads(response.choices[0].message.content)
         return result
@@ -153,6 +165,144 @@ JSON 형식:
         }
 
 
+# 8가지 기준 평가 항목 (일괄 채점 응답 검증용)
+CRITERIA_KEYS = [
+    "information_analysis", "problem_solving", "flexible_thinking", "negotiation",
+    "it_skills", "delivery", "vocabulary", "comprehension"
+]
+# 답변 1건당 응답 JSON 토큰 추정치
+CRITERIA_BATCH_OUTPUT_TOKENS = 160
+
+
+async def _analyze_criteria_chunk(chunk: List[Tuple[int, Tuple[str, str, str]]]) -> Dict[int, Dict]:
+    """
+    Q&A 묶음을 8가지 기준으로 GPT 1회 호출 채점
+
+    Args:
+        chunk: (전체 순번, (질문, 답변, 주요 평가 항목)) 리스트
+
+    Returns:
+        전체 순번 → 분석 결과 (응답에서 빠진 답변은 포함되지 않음)
+    """
+    
+    system_prompt = """당신은 HR 평가 전문가입니다.
+번호가 매겨진 여러 답변을 각각 독립적으로 다음 8가지 기준으로 평가하세요:
+
+**직무 특별 평가 (5가지):**
+1. 정보분석능력: 데이터 해석, 인사이트 도출, 분석 능력
+2. 문제해결능력: 실무 상황 대처, 자원 배분, 의사결정
+3. 유연한사고능력: 창의적 사고, 다양한 관점, 균형점 찾기
+4. 협상및설득능력: 설득력, 논리성, 커뮤니케이션
+5. IT능력: 기술 이해도, 알고리즘, 시스템 설계
+
+**의사소통능력 (3가지):**
+6. 전달력: 논리적 구조, 명확성, 설득력
+7. 어휘사용: 적절한 용어, 전문성, 표현력
+8. 문제이해력: 질문 의도 파악, 관련성, 핵심 이해
+
+각 항목을 0-10점으로 평가하고, 답변별 주요 평가 항목에 가중치를 두세요.
+모든 답변의 결과를 번호와 함께 JSON 형식으로 응답하세요.
+
+JSON 형식:
+{
+  "answers": [
+    {
+      "index": 1,
+      "information_analysis": 8,
+      "problem_solving": 7,
+      "flexible_thinking": 6,
+      "negotiation": 5,
+      "it_skills": 4,
+      "delivery": 8,
+      "vocabulary": 7,
+      "comprehension": 9,
+      "keywords": ["키워드1", "키워드2"],
+      "feedback": "간단한 피드백"
+    }
+  ]
+}"""
+
+    blocks = [
+        f"[{number}]\n질문: {question}\n답변: {answer}\n주요 평가 항목: {criteria}"
+        for number, (_, (question, answer, criteria)) in enumerate(chunk, start=1)
+    ]
+    user_prompt = "\n\n".join(blocks) + f"\n\n위 {len(chunk)}개 답변을 각각 8가지 기준으로 평가해주세요."
+    
+    for attempt in range(ANSWER_ANALYSIS_RETRIES + 1):
+        try:
+            async with _analysis_semaphore:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=os.getenv("OPENAI_MODEL", "gpt-5"),
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        response_format={"type": "json_object"}
+                    ),
+                    timeout=ANSWER_ANALYSIS_TIMEOUT
+                )
+            
+            entries = json.loads(response.choices[0].message.content).get("answers", [])
+            
+            results = {}
+            for entry in entries:
+                number = entry.pop("index", None)
+                # 평가 항목이 빠진 응답은 답변별 분석으로 다시 채점
+                if isinstance(number, int) and 1 <= number <= len(chunk) \
+                        and all(key in entry for key in CRITERIA_KEYS):
+                    results[chunk[number - 1][0]] = entry
+            return results
+            
+        except Exception as e:
+            print(f"[Enhanced Evaluation] 일괄 분석 오류 (시도 {attempt + 1}/{ANSWER_ANALYSIS_RETRIES + 1}): {e!r}")
+            if attempt < ANSWER_ANALYSIS_RETRIES:
+                await asyncio.sleep(0.5 * 2 ** attempt)
+    
+    return {}
+
+
+async def analyze_answers_with_criteria_batch(items: List[Tuple[str, str, str]]) -> List[Dict]:
+    """
+    여러 답변을 묶어서 8가지 기준으로 채점 (batch 모드)
+    
+    토큰 예산(ANSWER_BATCH_TOKEN_BUDGET) 단위 묶음마다 GPT를 1회 호출하고,
+    응답에서 빠지거나 실패한 답변만 analyze_answer_with_criteria로 다시 채점한다.
+    
+    Args:
+        items: (질문, 답변, 주요 평가 항목) 리스트
+    
+    Returns:
+        입력 순서와 같은 분석 결과 리스트
+    """
+    
+    chunks = chunk_by_token_budget(
+        list(enumerate(items)),
+        ANSWER_BATCH_TOKEN_BUDGET,
+        lambda item: estimate_tokens(item[1][0]) + estimate_tokens(item[1][1]) + CRITERIA_BATCH_OUTPUT_TOKENS
+    )
+    print(f"[Enhanced Evaluation] 일괄 채점: 답변 {len(items)}개 → 요청 {len(chunks)}건")
+    
+    results: Dict[int, Dict] = {}
+    for chunk_results in await asyncio.gather(*(_analyze_criteria_chunk(chunk) for chunk in chunks)):
+        results.update(chunk_results)
+    
+    missing = [i for i in range(len(items)) if i not in results]
+    if missing:
+        print(f"[Enhanced Evaluation] 일괄 채점 누락 {len(missing)}개 → 답변별 분석")
+        retried = await asyncio.gather(*(
+            analyze_answer_with_criteria(
+                question=items[i][0],
+                answer=items[i][1],
+                question_criteria=items[i][2]
+            )
+            for i in missing
+        ))
+        results.update(zip(missing, retried))
+    
+    return [results[i] for i in range(len(items))]
+
+
 def calculate_aggregate_scores(analyzed_answers: List[Dict]) -> Dict:
     """
     모든 답변의 집계 점수 계산
@@ -283,7 +433,7 @@ def recommend_positions(aggregate_scores: Dict) -> List[Dict]:
     return position_scores
 
 
-def generate_comprehensive_feedback_enhanced(
+async def generate_comprehensive_feedback_enhanced(
     analyzed_answers: List[Dict],
     aggregate_scores: Dict,
     recommended_positions: List[Dict],
@@ -329,7 +479,7 @@ JSON 형식으로 응답:
 """
 
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=os.getenv("OPENAI_MODEL", "gpt-5"),
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -353,13 +503,19 @@ JSON 형식으로 응답:
         }
 
 
-def generate_complete_evaluation_enhanced(
+async def generate_complete_evaluation_enhanced(
     conversation_history: List[Dict],
-    candidate_profile: Dict = None
+    candidate_profile: Dict = None,
+    scoring_mode: Optional[str] = None
 ) -> Dict:
     """
     완전한 평가 생성 (향상된 버전)
     
+    Args:
+        conversation_history: 전체 대화 기록
+        candidate_profile: 구직자 프로필
+        scoring_mode: 답변 채점 방식 (per_answer|batch, 기본: EVALUATION_SCORING_MODE)
+    
     Returns:
         {
             "scores": {
@@ -379,7 +535,7 @@ def generate_complete_evaluation_enhanced(
     
     # TODO: 실제로는 conversation_history에서 질문의 평가 항목을 추출해야 함
     # 현재는 간단히 모든 답변을 분석
-    analyzed_answers = []
+    items = []
     
     for i, msg in enumerate(conversation_history):
         if msg["role"] == "CANDIDATE":
@@ -388,11 +544,18 @@ def generate_complete_evaluation_enhanced(
             if i > 0 and conversation_history[i-1]["role"] == "AI":
                 question = conversation_history[i-1]["content"]
             
-            # 답변 분석
-            analysis = analyze_answer_with_criteria(
+            items.append((question, msg["content"], "정보분석능력"))  # TODO: 실제 질문의 항목 사용
+    
+    if resolve_scoring_mode(scoring_mode) == "batch":
+        analyzed_answers = await analyze_answers_with_criteria_batch(items)
+    else:
+        # 답변 분석
+        analyzed_answers = []
+        for question, answer, criteria in items:
+            analysis = await analyze_answer_with_criteria(
                 question=question,
-                answer=msg["content"],
-                question_criteria="정보분석능력"  # TODO: 실제 질문의 항목 사용
+                answer=answer,
+                question_criteria=criteria
             )
             analyzed_answers.append(analysis)
     
@@ -403,7 +566,7 @@ def generate_complete_evaluation_enhanced(
     recommended_positions = recommend_positions(aggregate_scores)
     
     # 종합 피드백
-    feedback = generate_comprehensive_feedback_enhanced(
+    feedback = await generate_comprehensive_feedback_enhanced(
         analyzed_answers,
         aggregate_scores,
         recommended_positions,
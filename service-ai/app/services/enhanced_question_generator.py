@@ -4,13 +4,13 @@
 """
 
 from typing import Dict, List, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI
 import os
 import json
 import csv
 import random
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 # 질문 예시 데이터 로드 (메모리에 캐싱)
 QUESTION_EXAMPLES = []
@@ -226,7 +226,7 @@ def generate_interview_plan(
     return plan
 
 
-def generate_question_from_plan(
+async def generate_question_from_plan(
     plan_item: Dict,
     candidate_profile: Dict,
     conversation_history: List[Dict]
@@ -270,7 +270,7 @@ def generate_question_from_plan(
 질문만 출력하고, 다른 설명은 필요 없습니다."""
 
         try:
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=os.getenv("OPENAI_MODEL", "gpt-5"),
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -289,7 +289,7 @@ def generate_question_from_plan(
     return "이전 답변에 대해 조금 더 자세히 설명해주시겠어요?"
 
 
-def generate_follow_up_question(
+async def generate_follow_up_question(
     last_question: str,
     last_answer: str,
     criteria: str,
@@ -324,7 +324,7 @@ JSON 형식으로 응답:
 """
 
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=os.getenv("OPENAI_MODEL", "gpt-5"),
             messages=[
                 {"role": "system", "content": system_prompt},
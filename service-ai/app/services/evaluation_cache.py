@@ -0,0 +1,145 @@
+"""
+평가 결과 메모이제이션
+(인터뷰 ID, 대화 기록 해시) 단위로 완성된 평가를 보관해 재시도/중복 요청 시 재사용
+
+- 같은 키로 동시에 들어온 요청은 진행 중인 평가 Task 하나를 공유 (single-flight)
+- 완료된 평가는 TTL + LRU 캐시에 보관
+- 평가 생성이 실패하면 보관하지 않고, 기다리던 요청 모두에 같은 예외를 전달
+- 기본값으로 대체된 분석/피드백이 섞인 평가(degraded)는 보관하지 않아 다음 요청에서 다시 생성
+- 대화 기록, 프로필, 공고, 채점 방식 중 하나라도 바뀌면 다른 키가 되어 새로 평가
+"""
+
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import copy
+import hashlib
+import json
+import os
+
+from app.utils.cache import LRUCache
+
+
+def evaluation_key(
+    interview_id: str,
+    conversation_history: List[Dict],
+    candidate_profile: Optional[Dict] = None,
+    job_posting: Optional[Dict] = None,
+    scoring_mode: Optional[str] = None
+) -> str:
+    """평가 입력 → 메모이제이션 키 (역할 대소문자/내용 앞뒤 공백 무시)"""
+    transcript = [
+        [str(msg.get("role", "")).upper(), str(msg.get("content", "")).strip()]
+        for msg in conversation_history
+    ]
+    payload = json.dumps(
+        [transcript, candidate_profile, job_posting, scoring_mode],
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+    return f"{interview_id}:{digest}"
+
+
+class EvaluationCache:
+    """
+    평가 키 → 평가 결과 캐시 (single-flight)
+
+    Args:
+        max_entries: 보관할 최대 평가 수
+        ttl_seconds: 평가 보관 시간
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 86400):
+        self.results = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.shared = 0
+
+    async def get_or_create(self, key: str, generate: Callable[[], Awaitable[Dict]]) -> Dict:
+        """
+        캐시된 평가 반환, 없으면 생성 (같은 키로 생성 중이면 그 결과를 기다림)
+
+        Args:
+            key: evaluation_key로 만든 키
+            generate: 평가를 생성하는 코루틴 함수
+
+        Returns:
+            평가 결과 (호출 측 수정이 캐시에 영향을 주지 않도록 복사본)
+        """
+        result = self.results.get(key)
+        if result is not None:
+            return copy.deepcopy(result)
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(generate())
+            self._pending[key] = task
+            task.add_done_callback(lambda finished: self._on_done(key, finished))
+        else:
+            self.shared += 1
+            print(f"[Evaluation Cache] 진행 중인 평가 공유: {key}")
+
+        # 먼저 요청한 클라이언트가 연결을 끊어도 다른 요청을 위해 평가는 계속 진행
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    async def lookup(self, key: str) -> Optional[Dict]:
+        """캐시된 평가 반환 (같은 키로 생성 중이면 완료를 기다림, 없으면 None)"""
+        result = self.results.get(key)
+        if result is None and key in self._pending:
+            self.shared += 1
+            try:
+                result = await asyncio.shield(self._pending[key])
+            except Exception:
+                return None
+        return copy.deepcopy(result) if result is not None else None
+
+    def store(self, key: str, result: Dict):
+        """생성한 평가 보관 (스트리밍 평가처럼 get_or_create 밖에서 만든 결과)"""
+        self.results.set(key, copy.deepcopy(result))
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        return {
+            **self.results.stats(),
+            "pending": len(self._pending),
+            "shared": self.shared,
+        }
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        """생성 완료 처리 (성공한 평가만 보관)"""
+        self._pending.pop(key, None)
+
+        if task.cancelled() or task.exception() is not None:
+            return
+        if task.result().get("degraded"):
+            print(f"[Evaluation Cache] 기본값으로 대체된 평가는 보관하지 않음: {key}")
+            return
+        self.results.set(key, task.result())
+
+
+# 전역 캐시 (한 번만 생성)
+_cache = None
+
+
+def get_evaluation_cache() -> Optional[EvaluationCache]:
+    """평가 결과 캐시 싱글톤 (EVALUATION_CACHE_ENABLED=false면 None)"""
+    global _cache
+    if os.getenv("EVALUATION_CACHE_ENABLED", "true").lower() != "true":
+        return None
+
+    if _cache is None:
+        _cache = EvaluationCache(
+            max_entries=int(os.getenv("EVALUATION_CACHE_ENTRIES", "1000")),
+            ttl_seconds=float(os.getenv("EVALUATION_CACHE_TTL", "86400"))
+        )
+    return _cache
+
+
+def get_evaluation_cache_stats() -> Dict:
+    """평가 결과 캐시 통계 (비활성화 시 enabled=False, 아직 생성 전이면 initialized=False)"""
+    if os.getenv("EVALUATION_CACHE_ENABLED", "true").lower() != "true":
+        return {"enabled": False}
+    if _cache is None:
+        return {"enabled": True, "initialized": False}
+    return {"enabled": True, "initialized": True, **_cache.stats()}
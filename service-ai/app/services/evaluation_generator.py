@@ -3,33 +3,22 @@
 통계 분석 결과를 바탕으로 종합 평가 생성
 """
 
-from typing import Dict, List
-from openai import OpenAI
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from openai import AsyncOpenAI
 import os
 import json
 
 # OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
-def generate_comprehensive_feedback(
+def _build_feedback_messages(
     analyzed_answers: List[Dict],
     aggregate_scores: Dict,
     candidate_profile: Dict = None,
     job_posting: Dict = None
-) -> Dict:
-    """
-    종합 평가 및 피드백 생성
-    
-    Args:
-        analyzed_answers: 분석된 답변 리스트
-        aggregate_scores: 집계 점수
-        candidate_profile: 구직자 프로필
-        job_posting: 채용 공고
-    
-    Returns:
-        평가 결과 딕셔너리 (strengths, weaknesses, recommendations, summary)
-    """
+) -> List[Dict]:
+    """종합 피드백 GPT 요청 메시지 구성"""
     
     system_prompt = """당신은 HR 평가 전문가이자 커리어 코치입니다.
 인터뷰 답변 분석 결과를 바탕으로 종합적이고 건설적인 피드백을 제공하세요.
@@ -101,38 +90,178 @@ JSON 형식으로 응답하세요:
     
     user_prompt = "\n".join(context_parts)
     
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _validate_feedback(result: Dict) -> Dict:
+    """필수 필드 검증"""
+    required_fields = ["strengths", "weaknesses", "recommendations", "summary"]
+    for field in required_fields:
+        if field not in result:
+            result[field] = []
+    return result
+
+
+def _fallback_feedback() -> Dict:
+    """피드백 생성 실패 시 기본 피드백 (degraded 표시 - 평가 캐시에 보관하지 않도록)"""
+    return {
+        "strengths": ["성실하게 인터뷰에 참여하셨습니다."],
+        "weaknesses": ["평가 중 오류가 발생했습니다."],
+        "recommendations": ["다시 시도해주세요."],
+        "summary": "평가 생성 중 오류가 발생했습니다.",
+        "technical_feedback": "분석 오류",
+        "communication_feedback": "분석 오류",
+        "problem_solving_feedback": "분석 오류",
+        "degraded": True
+    }
+
+
+async def generate_comprehensive_feedback(
+    analyzed_answers: List[Dict],
+    aggregate_scores: Dict,
+    candidate_profile: Dict = None,
+    job_posting: Dict = None
+) -> Dict:
+    """
+    종합 평가 및 피드백 생성
+    
+    Args:
+        analyzed_answers: 분석된 답변 리스트
+        aggregate_scores: 집계 점수
+        candidate_profile: 구직자 프로필
+        job_posting: 채용 공고
+    
+    Returns:
+        평가 결과 딕셔너리 (strengths, weaknesses, recommendations, summary)
+    """
+    
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+            messages=_build_feedback_messages(
+                analyzed_answers, aggregate_scores, candidate_profile, job_posting
+            ),
             response_format={"type": "json_object"}
         )
         
         result = json.loads(response.choices[0].message.content)
         
         # 필수 필드 검증
-        required_fields = ["strengths", "weaknesses", "recommendations", "summary"]
-        for field in required_fields:
-            if field not in result:
-                result[field] = []
-        
-        return result
+        return _validate_feedback(result)
         
     except Exception as e:
         print(f"[Evaluation Generator] 피드백 생성 오류: {e}")
         # 기본 피드백 반환
-        return {
-            "strengths": ["성실하게 인터뷰에 참여하셨습니다."],
-            "weaknesses": ["평가 중 오류가 발생했습니다."],
-            "recommendations": ["다시 시도해주세요."],
-            "summary": "평가 생성 중 오류가 발생했습니다.",
-            "technical_feedback": "분석 오류",
-            "communication_feedback": "분석 오류",
-            "problem_solving_feedback": "분석 오류"
-        }
+        return _fallback_feedback()
+
+
+class _JsonFieldStream:
+    """
+    스트리밍 중인 JSON 객체에서 값이 완성된 최상위 필드를 순서대로 꺼냄
+
+    숫자는 뒤에 , 또는 }가 올 때까지 완성으로 보지 않는다. (끝이 잘린 8, 85., 1e 등)
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._started = False
+        self._decoder = json.JSONDecoder()
+
+    def _skip(self, pos: int, chars: str = " \t\r\n") -> int:
+        while pos < len(self.buffer) and self.buffer[pos] in chars:
+            pos += 1
+        return pos
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """텍스트 조각 추가 후 새로 완성된 (필드, 값) 반환"""
+        self.buffer += text
+        fields = []
+
+        if not self._started:
+            pos = self._skip(self._pos)
+            if pos >= len(self.buffer) or self.buffer[pos] != "{":
+                return fields
+            self._started = True
+            self._pos = pos + 1
+
+        while True:
+            pos = self._skip(self._pos, " \t\r\n,")
+            if pos >= len(self.buffer) or self.buffer[pos] == "}":
+                break
+            try:
+                key, pos = self._decoder.raw_decode(self.buffer, pos)
+                pos = self._skip(pos)
+                if pos >= len(self.buffer) or self.buffer[pos] != ":":
+                    break
+                value, end = self._decoder.raw_decode(self.buffer, self._skip(pos + 1))
+            except json.JSONDecodeError:
+                break
+            if isinstance(value, (int, float)):
+                after = self._skip(end)
+                if after >= len(self.buffer) or self.buffer[after] not in ",}":
+                    break
+
+            fields.append((key, value))
+            self._pos = end
+
+        return fields
+
+
+async def generate_comprehensive_feedback_stream(
+    analyzed_answers: List[Dict],
+    aggregate_scores: Dict,
+    candidate_profile: Dict = None,
+    job_posting: Dict = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    종합 피드백을 필드 단위로 스트리밍 생성
+    
+    GPT 스트리밍 응답에서 값이 완성된 필드(summary, strengths 등)부터 바로 반환한다.
+    
+    Yields:
+        (필드 이름, 값) - 마지막은 ("done", 검증된 전체 피드백 딕셔너리)
+    """
+    
+    parser = _JsonFieldStream()
+    emitted = {}
+    
+    try:
+        stream = await client.chat.completions.create(
+            model=os.getenv("OPENAI_MODEL", "gpt-4o"),
+            messages=_build_feedback_messages(
+                analyzed_answers, aggregate_scores, candidate_profile, job_posting
+            ),
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if not content:
+                continue
+            for field, value in parser.feed(content):
+                emitted[field] = value
+                yield field, value
+        
+        result = _validate_feedback(json.loads(parser.buffer))
+        
+    except Exception as e:
+        print(f"[Evaluation Generator] 피드백 스트리밍 오류: {e}")
+        # 이미 보낸 필드는 유지하고 나머지만 기본 피드백으로 채움
+        result = _validate_feedback({**_fallback_feedback(), **emitted})
+    
+    # 스트림 중 보내지 못한 필드(기본값 보정 포함, degraded 표시는 제외)
+    for field, value in result.items():
+        if field not in emitted and field != "degraded":
+            yield field, value
+    
+    yield "done", result
 
 
 def calculate_final_scores(aggregate_scores: Dict) -> Dict:
@@ -154,27 +283,8 @@ def calculate_final_scores(aggregate_scores: Dict) -> Dict:
     }
 
 
-def generate_complete_evaluation(
-    conversation_history: List[Dict],
-    candidate_profile: Dict = None,
-    job_posting: Dict = None
-) -> Dict:
-    """
-    완전한 평가 생성 (전체 프로세스)
-    
-    Args:
-        conversation_history: 전체 대화 기록
-        candidate_profile: 구직자 프로필
-        job_posting: 채용 공고
-    
-    Returns:
-        완전한 평가 결과
-    """
-    
-    from app.services.answer_analyzer import (
-        analyze_all_answers,
-        calculate_aggregate_scores
-    )
+def _short_transcript_evaluation(conversation_history: List[Dict]) -> Optional[Dict]:
+    """답변이 1개 이하인 대화의 기본 평가 (답변이 2개 이상이면 None)"""
     
     # 구직자 답변 개수 확인 (최소 요구 완화: 1개 이상)
     candidate_answers = [
@@ -244,8 +354,84 @@ def generate_complete_evaluation(
             "analyzed_answers": []
         }
     
+    return None
+
+
+async def generate_complete_evaluation(
+    conversation_history: List[Dict],
+    candidate_profile: Dict = None,
+    job_posting: Dict = None,
+    scoring_mode: str = None,
+    interview_id: str = None
+) -> Dict:
+    """
+    완전한 평가 생성 (전체 프로세스)
+    
+    interview_id가 있으면 (인터뷰 ID, 대화 기록 해시) 단위로 결과를 메모이제이션하고,
+    같은 평가를 동시에 요청하면 진행 중인 평가 하나를 공유한다.
+    
+    Args:
+        conversation_history: 전체 대화 기록
+        candidate_profile: 구직자 프로필
+        job_posting: 채용 공고
+        scoring_mode: 답변 채점 방식 (per_answer|batch, 기본: EVALUATION_SCORING_MODE)
+        interview_id: 인터뷰 ID (인터뷰 중 미리 분석한 답변 재사용, 결과 메모이제이션)
+    
+    Returns:
+        완전한 평가 결과
+    """
+    
+    from app.services.answer_analyzer import resolve_scoring_mode
+    from app.services.evaluation_cache import evaluation_key, get_evaluation_cache
+    
+    async def generate() -> Dict:
+        return await _generate_complete_evaluation(
+            conversation_history,
+            candidate_profile,
+            job_posting,
+            scoring_mode,
+            interview_id
+        )
+    
+    cache = get_evaluation_cache()
+    if not interview_id or cache is None:
+        return await generate()
+    
+    key = evaluation_key(
+        interview_id,
+        conversation_history,
+        candidate_profile,
+        job_posting,
+        resolve_scoring_mode(scoring_mode)
+    )
+    return await cache.get_or_create(key, generate)
+
+
+async def _generate_complete_evaluation(
+    conversation_history: List[Dict],
+    candidate_profile: Dict = None,
+    job_posting: Dict = None,
+    scoring_mode: str = None,
+    interview_id: str = None
+) -> Dict:
+    """완전한 평가 생성 (메모이제이션 없이 항상 새로 생성)"""
+    
+    from app.services.answer_analyzer import (
+        analyze_all_answers,
+        calculate_aggregate_scores
+    )
+    
+    # 답변이 1개 이하면 분석 없이 간단한 평가 반환
+    short_evaluation = _short_transcript_evaluation(conversation_history)
+    if short_evaluation is not None:
+        return short_evaluation
+    
     # 1. 모든 답변 분석 (답변이 2개 이상인 경우)
-    analyzed_answers = analyze_all_answers(conversation_history)
+    analyzed_answers = await analyze_all_answers(
+        conversation_history,
+        scoring_mode=scoring_mode,
+        interview_id=interview_id
+    )
     
     # 2. 집계 점수 계산
     aggregate_scores = calculate_aggregate_scores(analyzed_answers)
@@ -254,18 +440,141 @@ def generate_complete_evaluation(
     final_scores = calculate_final_scores(aggregate_scores)
     
     # 4. 종합 피드백 생성
-    feedback = generate_comprehensive_feedback(
+    feedback = await generate_comprehensive_feedback(
         analyzed_answers,
         aggregate_scores,
         candidate_profile,
         job_posting
     )
     
-    # 5. 결과 통합
+    # 5. 결과 통합 (기본값으로 대체된 분석/피드백이 있으면 degraded - 캐시에 보관하지 않음)
+    degraded = feedback.pop("degraded", False)
+    for analysis in analyzed_answers:
+        degraded = analysis.pop("degraded", False) or degraded
+    
     return {
         "scores": final_scores,
         "statistics": aggregate_scores,
         "feedback": feedback,
-        "analyzed_answers": analyzed_answers
+        "analyzed_answers": analyzed_answers,
+        "degraded": degraded
     }
 
+
+def _evaluation_events(evaluation: Dict) -> List[Dict]:
+    """완성된 평가 → 스트리밍 이벤트 (캐시된 평가나 짧은 대화 평가 재생용)"""
+    analyzed_answers = evaluation.get("analyzed_answers", [])
+    events = [
+        {"type": "answer", "index": index, "total": len(analyzed_answers), "analysis": analysis}
+        for index, analysis in enumerate(analyzed_answers)
+    ]
+    events.append({
+        "type": "statistics",
+        "scores": evaluation["scores"],
+        "statistics": evaluation["statistics"]
+    })
+    events.extend(
+        {"type": "feedback", "field": field, "value": value}
+        for field, value in evaluation["feedback"].items()
+    )
+    return events
+
+
+async def generate_complete_evaluation_stream(
+    conversation_history: List[Dict],
+    candidate_profile: Dict = None,
+    job_posting: Dict = None,
+    scoring_mode: str = None,
+    interview_id: str = None
+) -> AsyncIterator[Dict]:
+    """
+    완전한 평가 생성 (단계별 스트리밍)
+    
+    결과 화면을 점진적으로 그릴 수 있도록 단계가 끝날 때마다 이벤트를 보낸다.
+    interview_id가 있으면 generate_complete_evaluation과 같은 메모이제이션 캐시를 사용한다.
+    
+    Yields:
+        {"type": "answer", "index", "total", "analysis"}: 답변 분석 완료 (완료 순서)
+        {"type": "statistics", "scores", "statistics"}: 집계 점수
+        {"type": "feedback", "field", "value"}: 종합 피드백 필드 (GPT가 생성하는 순서)
+        {"type": "done", "evaluation"}: 최종 평가 (scores, statistics, feedback)
+    """
+    
+    from app.services.answer_analyzer import (
+        calculate_aggregate_scores,
+        extract_qa_pairs,
+        iter_answer_analyses,
+        resolve_scoring_mode
+    )
+    from app.services.evaluation_cache import evaluation_key, get_evaluation_cache
+    
+    cache = get_evaluation_cache() if interview_id else None
+    key = None
+    evaluation = None
+    
+    if cache is not None:
+        key = evaluation_key(
+            interview_id,
+            conversation_history,
+            candidate_profile,
+            job_posting,
+            resolve_scoring_mode(scoring_mode)
+        )
+        evaluation = await cache.lookup(key)
+    
+    if evaluation is None:
+        evaluation = _short_transcript_evaluation(conversation_history)
+    
+    if evaluation is not None:
+        # 캐시된 평가 / 짧은 대화 평가는 한 번에 재생
+        for event in _evaluation_events(evaluation):
+            yield event
+    else:
+        # 1. 답변 분석 (완료되는 대로 전송)
+        qa_pairs = extract_qa_pairs(conversation_history)
+        analyzed_answers: List[Optional[Dict]] = [None] * len(qa_pairs)
+        degraded = False
+        async for index, analysis in iter_answer_analyses(qa_pairs, scoring_mode, interview_id):
+            degraded = analysis.pop("degraded", False) or degraded
+            analyzed_answers[index] = analysis
+            yield {"type": "answer", "index": index, "total": len(qa_pairs), "analysis": analysis}
+        
+        # 2. 집계 점수 / 최종 점수
+        aggregate_scores = calculate_aggregate_scores(analyzed_answers)
+        final_scores = calculate_final_scores(aggregate_scores)
+        yield {"type": "statistics", "scores": final_scores, "statistics": aggregate_scores}
+        
+        # 3. 종합 피드백 (필드가 완성되는 대로 전송)
+        feedback = None
+        async for field, value in generate_comprehensive_feedback_stream(
+            analyzed_answers,
+            aggregate_scores,
+            candidate_profile,
+            job_posting
+        ):
+            if field == "done":
+                feedback = value
+            else:
+                yield {"type": "feedback", "field": field, "value": value}
+        
+        degraded = feedback.pop("degraded", False) or degraded
+        
+        evaluation = {
+            "scores": final_scores,
+            "statistics": aggregate_scores,
+            "feedback": feedback,
+            "analyzed_answers": analyzed_answers,
+            "degraded": degraded
+        }
+        # 기본값으로 대체된 분석/피드백이 섞인 평가는 보관하지 않음
+        if cache is not None and not degraded:
+            cache.store(key, evaluation)
+    
+    yield {
+        "type": "done",
+        "evaluation": {
+            "scores": evaluation["scores"],
+            "statistics": evaluation["statistics"],
+            "feedback": evaluation["feedback"]
+        }
+    }
@@ -0,0 +1,160 @@
+"""
+점진적 평가 세션
+인터뷰 진행 중 제출된 답변을 백그라운드에서 미리 분석해 두고, 최종 평가 때 재사용
+
+- 답변이 제출되면(즉시 피드백 시점) 인터뷰별 세션에 답변 분석 Task를 예약
+- 같은 (질문, 답변)은 한 번만 분석 (공백 차이는 무시)
+- 최종 평가는 세션에 완료된 분석을 모으고, 분석 중인 답변은 완료를 기다림
+- 분석에 실패했거나 세션에 없는 답변만 최종 평가 때 새로 분석
+- 세션은 마지막 답변 제출 후 EVALUATION_SESSION_TTL초 동안 보관
+"""
+
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import os
+
+from app.services.answer_analyzer import request_answer_analysis
+from app.utils.cache import LRUCache
+
+
+def answer_key(question: str, answer: str) -> str:
+    """(질문, 답변) → 세션 내 답변 키 (공백 정규화)"""
+    normalized = "\0".join(" ".join(text.split()) for text in (question, answer))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:24]
+
+
+class EvaluationSession:
+    """인터뷰 1건의 답변 분석 결과와 진행 중인 분석 Task"""
+
+    def __init__(self):
+        self.analyses: Dict[str, Dict] = {}
+        self.pending: Dict[str, asyncio.Task] = {}
+
+
+class EvaluationSessionStore:
+    """
+    인터뷰 ID → 평가 세션 저장소
+
+    Args:
+        max_sessions: 보관할 최대 세션 수 (초과 시 오래된 세션부터 제거)
+        ttl_seconds: 마지막 답변 제출 후 세션 보관 시간
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: float = 10800):
+        self.sessions = LRUCache(max_entries=max_sessions, ttl_seconds=ttl_seconds)
+        self.submitted = 0
+        self.reused = 0
+        self.failed = 0
+
+    def submit(self, interview_id: str, question: str, answer: str) -> Optional[asyncio.Task]:
+        """
+        답변 분석 예약 (이미 분석했거나 분석 중이면 새로 만들지 않음)
+
+        Args:
+            interview_id: 인터뷰 ID
+            question: 질문
+            answer: 답변
+
+        Returns:
+            분석 중인 Task (이미 완료된 답변이면 None)
+        """
+        session = self.sessions.get(interview_id)
+        if session is None:
+            session = EvaluationSession()
+        # 답변이 들어올 때마다 보관 시간 갱신
+        self.sessions.set(interview_id, session)
+
+        key = answer_key(question, answer)
+        if key in session.analyses:
+            return None
+
+        task = session.pending.get(key)
+        if task is None:
+            self.submitted += 1
+            task = asyncio.create_task(request_answer_analysis(question, answer))
+            session.pending[key] = task
+            task.add_done_callback(lambda finished: self._on_done(session, key, finished))
+        return task
+
+    async def collect(
+        self,
+        interview_id: str,
+        qa_pairs: List[Tuple[str, str]]
+    ) -> List[Optional[Dict]]:
+        """
+        세션에 있는 답변 분석 결과 수집 (분석 중이면 완료까지 대기)
+
+        Args:
+            interview_id: 인터뷰 ID
+            qa_pairs: (질문, 답변) 리스트
+
+        Returns:
+            qa_pairs 순서의 분석 결과 (세션에 없거나 실패한 답변은 None)
+        """
+        session = self.sessions.get(interview_id)
+        if session is None:
+            return [None] * len(qa_pairs)
+
+        keys = [answer_key(question, answer) for question, answer in qa_pairs]
+
+        # 분석 중인 Task는 자체 제한 시간(ANSWER_ANALYSIS_TIMEOUT x 재시도)이 있으므로 그대로 대기
+        tasks = [session.pending[key] for key in keys if key in session.pending]
+        if tasks:
+            await asyncio.wait(tasks)
+
+        results = []
+        for key in keys:
+            analysis = session.analyses.get(key)
+            # 호출 측에서 question/answer 필드를 추가하므로 복사본 반환
+            results.append(dict(analysis) if analysis is not None else None)
+
+        self.reused += sum(1 for analysis in results if analysis is not None)
+        return results
+
+    def discard(self, interview_id: str):
+        """세션 삭제"""
+        self.sessions.delete(interview_id)
+
+    def stats(self) -> Dict:
+        """세션 통계"""
+        return {
+            "sessions": len(self.sessions),
+            "submitted": self.submitted,
+            "reused": self.reused,
+            "failed": self.failed,
+        }
+
+    def _on_done(self, session: EvaluationSession, key: str, task: asyncio.Task):
+        """분석 완료 처리 (실패한 답변은 최종 평가 때 다시 분석)"""
+        session.pending.pop(key, None)
+
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.failed += 1
+            print(f"[Evaluation Session] 답변 분석 실패, 최종 평가 때 재분석: {task.exception()!r}")
+            return
+        session.analyses[key] = task.result()
+
+
+# 전역 저장소 (한 번만 생성)
+_store = None
+
+
+def get_evaluation_session_store() -> EvaluationSessionStore:
+    """평가 세션 저장소 싱글톤"""
+    global _store
+    if _store is None:
+        _store = EvaluationSessionStore(
+            max_sessions=int(os.getenv("EVALUATION_SESSION_MAX", "1000")),
+            ttl_seconds=float(os.getenv("EVALUATION_SESSION_TTL", "10800"))
+        )
+    return _store
+
+
+def get_evaluation_session_stats() -> Dict:
+    """평가 세션 저장소 통계 (싱글톤을 새로 만들지 않음, 생성 전이면 initialized=False)"""
+    if _store is None:
+        return {"initialized": False}
+    return {"initialized": True, **_store.stats()}
@@ -0,0 +1,255 @@
+"""
+긴 오디오 분할 병렬 변환 서비스
+면접 전체 녹음처럼 Whisper 업로드 한도(25MB)를 넘거나 한 번에 변환하기 긴 오디오를
+침묵 구간에서 나눠 동시에 변환하고, 타임스탬프 기준으로 이어 붙임
+
+- 목표 길이(STT_LONG_SEGMENT_SEC)마다 앞뒤 탐색 구간에서 가장 조용한 지점을 분할 지점으로 선택
+- 각 구간은 앞뒤로 STT_LONG_OVERLAP_SEC씩 겹쳐 잘라 경계 단어가 잘리지 않게 함
+- 구간별 Whisper 세그먼트는 중심 시각이 그 구간 몫(분할 지점 사이)에 드는 것만 남겨 겹침 중복 제거
+- 구간 변환은 STT_LONG_CONCURRENCY개까지 동시 실행 (전체 요청 공유), 실패한 구간은 재시도 후 건너뜀
+"""
+
+from typing import Dict, List, Optional, Tuple
+from openai import AsyncOpenAI
+import asyncio
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+
+from app.services.audio_transcoding import STT_TRANSCODE_BITRATE
+from app.services.voice_activity import VAD_FRAME_MS, VAD_SAMPLE_RATE, ms_to_samples, pcm_to_wav
+from app.utils.executor import run_cpu_bound
+
+# OpenAI 클라이언트 초기화
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# 변환할 수 있는 최대 길이(초) - 디코딩한 PCM(16kHz 모노, 초당 32KB)이 이 길이를 넘지 않음
+STT_LONG_MAX_SEC = float(os.getenv("STT_LONG_MAX_SEC", "5400"))
+# 구간 목표 길이 / 분할 지점 탐색 범위(목표 지점 앞뒤) / 구간 겹침 (초)
+STT_LONG_SEGMENT_SEC = float(os.getenv("STT_LONG_SEGMENT_SEC", "120"))
+STT_LONG_SEARCH_SEC = float(os.getenv("STT_LONG_SEARCH_SEC", "15"))
+STT_LONG_OVERLAP_SEC = float(os.getenv("STT_LONG_OVERLAP_SEC", "1.0"))
+# 구간 변환 동시 호출 수 (전체 요청 공유) / 구간별 재시도 횟수
+STT_LONG_CONCURRENCY = int(os.getenv("STT_LONG_CONCURRENCY", "4"))
+STT_LONG_RETRIES = int(os.getenv("STT_LONG_RETRIES", "1"))
+# 구간 업로드 형식 (opus: 작은 업로드, wav: 인코딩 CPU 없음)
+STT_LONG_SEGMENT_FORMAT = os.getenv("STT_LONG_SEGMENT_FORMAT", "opus").lower()
+_segment_semaphore = asyncio.Semaphore(STT_LONG_CONCURRENCY)
+
+
+def decode_audio_pcm(source, audio_format: Optional[str] = None, max_sec: float = STT_LONG_MAX_SEC) -> np.ndarray:
+    """
+    오디오 파일 → 16kHz 모노 int16 PCM (CPU 작업, ffmpeg 필요)
+
+    ffmpeg가 바로 16kHz 모노로 출력하므로 원본 샘플레이트/채널 그대로의 중간 버퍼를 만들지 않고,
+    max_sec보다 1초 더 디코딩한 뒤 멈춘다. (MediaRecorder WebM은 헤더에 길이가 없어 미리 알 수 없음)
+    반환 길이가 max_sec을 넘으면 호출 측에서 너무 긴 오디오로 처리한다.
+
+    Args:
+        source: 파일 객체 또는 bytes
+        audio_format: 형식 힌트 (None이면 ffmpeg가 판별)
+        max_sec: 최대 길이 (초)
+    """
+    from pydub import AudioSegment
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    source.seek(0)
+
+    # mp4/m4a처럼 끝부분 메타데이터를 읽어야 하는 형식도 있으므로 파이프 대신 임시 파일로 전달
+    with tempfile.NamedTemporaryFile(suffix=f".{audio_format}" if audio_format else "") as input_file:
+        shutil.copyfileobj(source, input_file)
+        input_file.flush()
+
+        command = [
+            AudioSegment.converter, "-nostdin", "-v", "error",
+            "-i", input_file.name,
+            "-t", str(max_sec + 1),
+            "-ac", "1", "-ar", str(VAD_SAMPLE_RATE), "-f", "s16le", "pipe:1",
+        ]
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip() or f"ffmpeg 종료 코드 {result.returncode}")
+    return np.frombuffer(result.stdout, dtype=np.int16)
+
+
+def frame_levels_db(pcm: np.ndarray) -> np.ndarray:
+    """VAD 프레임 단위 음량(dBFS)"""
+    frame_samples = ms_to_samples(VAD_FRAME_MS)
+    frames = len(pcm) // frame_samples
+    if frames == 0:
+        return np.zeros(0)
+    blocks = pcm[:frames * frame_samples].astype(np.float32).reshape(frames, frame_samples)
+    rms = np.sqrt(np.mean(blocks * blocks, axis=1))
+    return 20 * np.log10(rms / 32768.0 + 1e-10)
+
+
+def plan_split_points(
+    pcm: np.ndarray,
+    segment_sec: float = STT_LONG_SEGMENT_SEC,
+    search_sec: float = STT_LONG_SEARCH_SEC
+) -> List[int]:
+    """
+    분할 지점(ms) 계산 - 시작 0, 끝은 전체 길이
+
+    목표 지점 앞뒤 search_sec 안에서 가장 조용한 0.3초 구간의 가운데를 고른다.
+    """
+    duration_ms = len(pcm) * 1000 // VAD_SAMPLE_RATE
+    segment_ms = int(segment_sec * 1000)
+    if duration_ms <= segment_ms:
+        return [0, duration_ms]
+
+    levels = frame_levels_db(pcm)
+    # 짧은 잡음에 흔들리지 않도록 0.3초 이동 평균
+    window = max(1, 300 // VAD_FRAME_MS)
+    smoothed = np.convolve(levels, np.ones(window) / window, mode="same")
+
+    points = [0]
+    search_frames = int(search_sec * 1000) // VAD_FRAME_MS
+    while duration_ms - points[-1] > segment_ms:
+        target = (points[-1] + segment_ms) // VAD_FRAME_MS
+        low = max(points[-1] // VAD_FRAME_MS + 1, target - search_frames)
+        high = min(len(smoothed), target + search_frames + 1)
+        quietest = low + int(np.argmin(smoothed[low:high])) if high > low else target
+        points.append(quietest * VAD_FRAME_MS)
+    points.append(duration_ms)
+    return points
+
+
+def encode_segment(pcm: np.ndarray, segment_format: Optional[str] = None) -> Tuple[str, bytes, str]:
+    """
+    PCM 구간 → Whisper 파일 튜플 (CPU 작업)
+
+    Args:
+        pcm: 16kHz 모노 int16 PCM
+        segment_format: opus 또는 wav (None이면 STT_LONG_SEGMENT_FORMAT)
+    """
+    if (segment_format or STT_LONG_SEGMENT_FORMAT) == "wav":
+        return ("segment.wav", pcm_to_wav(pcm).getvalue(), "audio/wav")
+
+    from pydub import AudioSegment
+
+    audio = AudioSegment(pcm.astype(np.int16).tobytes(), frame_rate=VAD_SAMPLE_RATE, sample_width=2, channels=1)
+    output = io.BytesIO()
+    audio.export(output, format="ogg", codec="libopus", bitrate=STT_TRANSCODE_BITRATE)
+    return ("segment.ogg", output.getvalue(), "audio/ogg")
+
+
+async def transcribe_segment(pcm: np.ndarray, offset_ms: int, language: str) -> List[Dict]:
+    """
+    구간 1개 변환 → 절대 시각 세그먼트 목록 (재시도 후에도 실패하면 예외 전달)
+
+    Args:
+        pcm: 구간 PCM (겹침 포함)
+        offset_ms: 원본 기준 구간 시작 시각
+        language: 언어 코드
+    """
+    file = await run_cpu_bound(encode_segment, pcm)
+
+    for attempt in range(STT_LONG_RETRIES + 1):
+        try:
+            async with _segment_semaphore:
+                response = await client.audio.transcriptions.create(
+                    model="whisper-1",
+                    file=file,
+                    language=language,
+                    response_format="verbose_json"
+                )
+            break
+        except Exception as e:
+            print(f"[Long STT] 구간 변환 실패 ({offset_ms}ms, 시도 {attempt + 1}): {e}")
+            if attempt == STT_LONG_RETRIES:
+                raise
+
+    offset = offset_ms / 1000
+    segments = getattr(response, "segments", None) or []
+    if not segments and response.text.strip():
+        # 세그먼트가 없으면 구간 전체를 하나로
+        segments = [{"start": 0.0, "end": len(pcm) / VAD_SAMPLE_RATE, "text": response.text}]
+
+    return [
+        {
+            "start": round(offset + _field(segment, "start"), 2),
+            "end": round(offset + _field(segment, "end"), 2),
+            "text": str(_field(segment, "text")).strip(),
+        }
+        for segment in segments
+    ]
+
+
+def stitch_segments(chunks: List[Optional[List[Dict]]], split_points: List[int]) -> List[Dict]:
+    """
+    구간별 세그먼트 이어 붙이기 (겹침 중복 제거)
+
+    구간 i의 세그먼트는 중심 시각이 [split_points[i], split_points[i+1]) 안에 있을 때만 남기고,
+    경계에서 같은 문장이 양쪽 구간에 남으면 한 번만 남긴다.
+    """
+    stitched: List[Dict] = []
+    for index, segments in enumerate(chunks):
+        if not segments:
+            continue
+        own_start = split_points[index] / 1000
+        own_end = split_points[index + 1] / 1000
+        last_chunk = index == len(chunks) - 1
+        for segment in segments:
+            center = (segment["start"] + segment["end"]) / 2
+            if center < own_start or (center >= own_end and not last_chunk):
+                continue
+            if not segment["text"]:
+                continue
+            if stitched and stitched[-1]["text"] == segment["text"] and segment["start"] - stitched[-1]["end"] < STT_LONG_OVERLAP_SEC * 2:
+                continue
+            stitched.append(segment)
+    return stitched
+
+
+async def transcribe_long_audio(pcm: np.ndarray, language: str = "ko") -> Dict:
+    """
+    긴 오디오 변환
+
+    Args:
+        pcm: 16kHz 모노 int16 PCM
+        language: 언어 코드
+
+    Returns:
+        {"text", "language", "duration", "segments", "chunks", "failedChunks"}
+    """
+    split_points = plan_split_points(pcm)
+    overlap_ms = int(STT_LONG_OVERLAP_SEC * 1000)
+    duration_ms = split_points[-1]
+    print(f"[Long STT] {duration_ms / 1000:.1f}초 → {len(split_points) - 1}개 구간 변환")
+
+    tasks = []
+    for start_ms, end_ms in zip(split_points, split_points[1:]):
+        chunk_start = max(0, start_ms - overlap_ms)
+        chunk_end = min(duration_ms, end_ms + overlap_ms)
+        tasks.append(transcribe_segment(pcm[ms_to_samples(chunk_start):ms_to_samples(chunk_end)], chunk_start, language))
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    failed = [index for index, result in enumerate(results) if isinstance(result, BaseException)]
+    if failed and len(failed) == len(results):
+        raise results[0]
+
+    chunks = [None if isinstance(result, BaseException) else result for result in results]
+    segments = stitch_segments(chunks, split_points)
+    return {
+        "text": " ".join(segment["text"] for segment in segments),
+        "language": language,
+        "duration": round(duration_ms / 1000, 2),
+        "segments": segments,
+        "chunks": len(tasks),
+        "failedChunks": [
+            {"index": index, "start": split_points[index] / 1000, "end": split_points[index + 1] / 1000}
+            for index in failed
+        ],
+    }
+
+
+def _field(segment, name: str):
+    """Whisper 세그먼트 필드 (dict/객체 모두 지원)"""
+    return segment[name] if isinstance(segment, dict) else getattr(segment, name)
@@ -0,0 +1,385 @@
+"""
+매칭 근거 저장소
+(구직자, 공고, 점수 구간, 프롬프트 필드) 단위의 근거 핸들로 GPT 매칭 근거를 비동기 생성/보관
+
+- 생성 중인 근거는 핸들별 asyncio.Task 하나로 공유 (같은 근거를 중복 호출하지 않음)
+- 완료된 근거는 TTL + LRU 캐시에 보관해 반복 조회 시 재생성하지 않음
+- 생성 실패 근거는 기본 근거를 짧게 보관하고, 다음 요청 때 다시 생성
+- 프롬프트 지문 캐시: GPT에 보내는 필드가 같으면 핸들과 무관하게 근거 재사용
+- 구직자/공고가 갱신·삭제되면 해당 userId/공고 id의 근거를 무효화
+"""
+
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import hashlib
+import json
+import os
+
+from app.utils.cache import LRUCache
+
+# 근거 핸들의 점수 구간 크기 (같은 구간이면 같은 근거 재사용)
+MATCHING_REASON_SCORE_BUCKET = float(os.getenv("MATCHING_REASON_SCORE_BUCKET", "5"))
+# 매칭 근거 프롬프트에 들어가는 필드 (바뀌면 다른 핸들이 되어 근거를 새로 생성)
+CANDIDATE_PROMPT_FIELDS = ("skills", "experience", "desiredPosition")
+JOB_PROMPT_FIELDS = ("title", "position", "requirements", "experienceMin", "experienceMax")
+
+
+def candidate_owner(user_id) -> str:
+    """구직자 무효화 키"""
+    return f"user:{user_id}"
+
+
+def job_owner(job_id) -> str:
+    """공고 무효화 키"""
+    return f"job:{job_id}"
+
+
+def matching_reason_owners(candidate_profile: Dict, job_posting: Dict) -> Tuple[str, str]:
+    """근거가 의존하는 (구직자, 공고) 무효화 키"""
+    return candidate_owner(candidate_profile.get("userId")), job_owner(job_posting.get("id"))
+
+
+class _OwnerIndex:
+    """
+    무효화 키(userId/공고 id) → 캐시 키 집합
+
+    캐시에서 밀려난 키는 남아 있을 수 있으므로, 크기가 커지면 살아 있는 키만 남긴다.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._keys: Dict[str, Set[str]] = {}
+        self._size = 0
+
+    def add(self, key: str, owners: Iterable[str], alive: Callable[[str], bool]):
+        for owner in owners:
+            keys = self._keys.setdefault(owner, set())
+            if key not in keys:
+                keys.add(key)
+                self._size += 1
+
+        if self._size > self.max_keys * 2:
+            self._keys = {
+                owner: live
+                for owner, keys in self._keys.items()
+                if (live := {k for k in keys if alive(k)})
+            }
+            self._size = sum(len(keys) for keys in self._keys.values())
+
+    def pop(self, owner: str) -> Set[str]:
+        keys = self._keys.pop(owner, set())
+        self._size -= len(keys)
+        return keys
+
+
+def matching_reason_handle(candidate_profile: Dict, job_posting: Dict, matching_score: float) -> str:
+    """
+    (구직자 userId, 공고 id, 점수 구간, 프롬프트 필드 내용) → 근거 핸들
+
+    인라인으로 전달된 프로필/공고가 수정되면 id가 같아도 다른 핸들이 되어
+    이전 내용으로 만든 근거를 돌려주지 않는다.
+    """
+    bucket = int(matching_score // MATCHING_REASON_SCORE_BUCKET)
+    fields = json.dumps(
+        [
+            [candidate_profile.get(field) for field in CANDIDATE_PROMPT_FIELDS],
+            [job_posting.get(field) for field in JOB_PROMPT_FIELDS],
+        ],
+        ensure_ascii=False,
+        default=str
+    )
+    identity = f"{candidate_profile.get('userId')}\0{job_posting.get('id')}\0{bucket}\0{fields}"
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:24]
+
+
+class MatchingReasonStore:
+    """
+    근거 핸들 → 매칭 근거 저장소
+
+    Args:
+        max_entries: 보관할 최대 근거 수
+        ttl_seconds: 완료된 근거 보관 시간
+        failure_ttl_seconds: 생성 실패 시 기본 근거 보관 시간
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 3600,
+        failure_ttl_seconds: float = 60
+    ):
+        self.reasons = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.fallbacks = LRUCache(max_entries=max_entries, ttl_seconds=failure_ttl_seconds)
+        self._pending: Dict[str, asyncio.Task] = {}
+        # 무효화된 생성 작업 (결과는 버리지만 끝날 때까지 참조를 유지해 GC로 사라지지 않게 함)
+        self._detached: Set[asyncio.Task] = set()
+        self._owners = _OwnerIndex(max_entries)
+
+    def get(self, handle: str) -> Optional[str]:
+        """완료된 근거 (생성 실패 시 기본 근거, 없으면 None)"""
+        reason = self.reasons.get(handle)
+        if reason is None:
+            reason = self.fallbacks.get(handle)
+        return reason
+
+    def status(self, handle: str) -> str:
+        """근거 상태: done | pending | unknown"""
+        if handle in self.reasons or handle in self.fallbacks:
+            return "done"
+        if handle in self._pending:
+            return "pending"
+        return "unknown"
+
+    def schedule(
+        self,
+        handle: str,
+        generate: Callable[[], Awaitable[str]],
+        fallback: str,
+        owners: Iterable[str] = ()
+    ) -> Optional[asyncio.Task]:
+        """
+        근거 생성 예약 (이미 완료되었거나 생성 중이면 새로 만들지 않음)
+
+        Args:
+            handle: 근거 핸들
+            generate: 근거를 생성하는 코루틴 함수 (실패 시 예외)
+            fallback: 생성 실패 시 사용할 기본 근거
+            owners: 무효화 키 (invalidate_owner로 함께 삭제)
+
+        Returns:
+            생성 중인 Task (이미 완료된 근거면 None)
+        """
+        if handle in self.reasons:
+            return None
+
+        task = self._pending.get(handle)
+        if task is None:
+            self._owners.add(handle, owners, lambda key: self.status(key) != "unknown")
+            task = asyncio.create_task(generate())
+            self._pending[handle] = task
+            task.add_done_callback(
+                lambda finished: self._on_done(handle, finished, fallback)
+            )
+        return task
+
+    def invalidate(self, handle: str):
+        """근거 삭제 (생성 중인 작업은 결과만 버림)"""
+        self.reasons.delete(handle)
+        self.fallbacks.delete(handle)
+        task = self._pending.pop(handle, None)
+        if task is not None and not task.done():
+            self._detached.add(task)
+            task.add_done_callback(self._detached.discard)
+
+    def invalidate_owner(self, owner: str) -> int:
+        """무효화 키(userId/공고 id)에 속한 근거 모두 삭제 (삭제 수 반환)"""
+        handles = self._owners.pop(owner)
+        for handle in handles:
+            self.invalidate(handle)
+        return len(handles)
+
+    async def wait(self, handle: str, timeout: Optional[float] = None) -> Optional[str]:
+        """근거가 완료될 때까지 최대 timeout초 대기 후 반환 (미완료면 None)"""
+        task = self._pending.get(handle)
+        if task is not None:
+            await asyncio.wait([task], timeout=timeout)
+        return self.get(handle)
+
+    async def stream(
+        self,
+        handles: List[str],
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, str, Optional[str]]]:
+        """
+        여러 근거를 완료되는 순서대로 반환
+
+        Yields:
+            (핸들, 상태, 근거) - 상태는 done | unknown | timeout
+        """
+        pending = {}
+        for handle in dict.fromkeys(handles):
+            status = self.status(handle)
+            if status == "pending":
+                pending[self._pending[handle]] = handle
+            else:
+                yield handle, status, self.get(handle)
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        while pending:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                break
+
+            done, _ = await asyncio.wait(
+                pending.keys(),
+                timeout=remaining,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+
+            for task in done:
+                handle = pending.pop(task)
+                yield handle, "done", self.get(handle)
+
+        for handle in pending.values():
+            yield handle, "timeout", None
+
+    def stats(self) -> Dict:
+        """저장소 통계"""
+        return {
+            "reasons": self.reasons.stats(),
+            "fallbacks": len(self.fallbacks),
+            "pending": len(self._pending),
+            "detached": len(self._detached),
+        }
+
+    def _on_done(self, handle: str, task: asyncio.Task, fallback: str):
+        """생성 완료 처리 (무효화된 작업의 결과는 버림)"""
+        if self._pending.get(handle) is not task:
+            # 무효화된 작업 - 예외도 소비만 하고 버림
+            if not task.cancelled():
+                task.exception()
+            return
+        del self._pending[handle]
+
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            print(f"[Matching Reason Store] 매칭 근거 생성 오류: {task.exception()}")
+            self.fallbacks.set(handle, fallback)
+            return
+        self.reasons.set(handle, task.result())
+
+
+class MatchingReasonCache:
+    """
+    프롬프트 지문 → 매칭 근거 캐시 (TTL + LRU)
+
+    GPT에 보내는 필드(모델, 프롬프트 전체)의 해시를 키로 쓰므로 어느 쪽이든 내용이
+    바뀌면 자연히 미스가 나고, 삭제된 구직자/공고의 근거는 invalidate_owner로 제거한다.
+    적중 시 원래 생성에 쓴 토큰 수를 절감 토큰으로 집계한다.
+
+    Args:
+        max_entries: 최대 항목 수
+        ttl_seconds: 항목 유지 시간
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 86400):
+        self.entries = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._owners = _OwnerIndex(max_entries)
+        self.tokens_spent = 0
+        self.tokens_saved = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def fingerprint(model: str, messages: List[Dict]) -> str:
+        """모델 + 메시지 기반 지문 (SHA-256)"""
+        payload = json.dumps([model, messages], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """근거 조회 (적중 시 절감 토큰 집계)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        reason, tokens = entry
+        self.tokens_saved += tokens
+        return reason
+
+    def set(self, key: str, reason: str, tokens: int = 0, owners: Iterable[str] = ()):
+        """근거 저장 (tokens: 생성에 사용한 토큰 수)"""
+        self.entries.set(key, (reason, tokens))
+        self.tokens_spent += tokens
+        self._owners.add(key, owners, lambda k: k in self.entries)
+
+    def invalidate_owner(self, owner: str) -> int:
+        """무효화 키(userId/공고 id)에 속한 근거 모두 삭제 (삭제 수 반환)"""
+        keys = self._owners.pop(owner)
+        deleted = sum(1 for key in keys if self.entries.delete(key))
+        self.invalidations += deleted
+        return deleted
+
+    def stats(self) -> Dict:
+        """적중률 및 토큰 절감 통계"""
+        return {
+            **self.entries.stats(),
+            "tokens_spent": self.tokens_spent,
+            "tokens_saved": self.tokens_saved,
+            "invalidations": self.invalidations,
+        }
+
+
+# 전역 저장소 / 캐시 (한 번만 생성)
+_store = None
+_cache = None
+
+
+def get_matching_reason_store() -> MatchingReasonStore:
+    """매칭 근거 저장소 싱글톤"""
+    global _store
+    if _store is None:
+        _store = MatchingReasonStore(
+            max_entries=int(os.getenv("MATCHING_REASON_STORE_ENTRIES", "10000")),
+            ttl_seconds=float(os.getenv("MATCHING_REASON_STORE_TTL", "3600"))
+        )
+    return _store
+
+
+def get_matching_reason_cache() -> Optional[MatchingReasonCache]:
+    """매칭 근거 캐시 싱글톤 (MATCHING_REASON_CACHE_ENABLED=false면 None)"""
+    global _cache
+    if os.getenv("MATCHING_REASON_CACHE_ENABLED", "true").lower() != "true":
+        return None
+
+    if _cache is None:
+        _cache = MatchingReasonCache(
+            max_entries=int(os.getenv("MATCHING_REASON_CACHE_ENTRIES", "10000")),
+            ttl_seconds=float(os.getenv("MATCHING_REASON_CACHE_TTL", "86400"))
+        )
+    return _cache
+
+
+def get_matching_reason_cache_stats() -> Dict:
+    """매칭 근거 캐시/저장소 통계 (싱글톤을 새로 만들지 않음, 생성 전이면 initialized=False)"""
+    enabled = os.getenv("MATCHING_REASON_CACHE_ENABLED", "true").lower() == "true"
+    stats = {"enabled": enabled}
+    if enabled:
+        stats["initialized"] = _cache is not None
+        if _cache is not None:
+            stats.update(_cache.stats())
+    stats["store"] = _store.stats() if _store is not None else {"initialized": False}
+    return stats
+
+
+def invalidate_matching_reasons(
+    user_ids: Iterable[str] = (),
+    job_ids: Iterable[str] = (),
+    include_cache: bool = True
+) -> int:
+    """
+    구직자/공고가 바뀌었을 때 관련 근거 무효화
+
+    Args:
+        user_ids: 갱신/삭제된 구직자 userId
+        job_ids: 갱신/삭제된 공고 id
+        include_cache: False면 근거 핸들만 무효화 (내용이 같으면 지문 캐시는 그대로 유효)
+
+    Returns:
+        무효화된 근거 수
+    """
+    owners = [candidate_owner(user_id) for user_id in user_ids]
+    owners += [job_owner(job_id) for job_id in job_ids]
+
+    store = get_matching_reason_store()
+    cache = get_matching_reason_cache() if include_cache else None
+
+    invalidated = 0
+    for owner in owners:
+        invalidated += store.invalidate_owner(owner)
+        if cache is not None:
+            invalidated += cache.invalidate_owner(owner)
+    return invalidated
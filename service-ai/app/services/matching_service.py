@@ -3,22 +3,72 @@
 구직자와 채용 공고 매칭 및 근거 생성
 """
 
-from typing import Dict, List
-from openai import OpenAI
+from typing import Dict, List, Optional, Tuple
+from openai import AsyncOpenAI
+import numpy as np
+import asyncio
 import os
 import json
 
 from app.services.embedding_service import (
     calculate_matching_score,
+    calculate_matching_scores_batch,
+    select_top_k,
     generate_candidate_embedding,
-    generate_job_posting_embedding
+    generate_job_posting_embedding,
+    generate_embeddings_batch,
+    build_candidate_text,
+    build_job_posting_text,
+    EMBEDDING_DIM
 )
+from app.services.vector_index import get_job_index, get_candidate_index
+from app.utils.executor import run_cpu_bound
+from app.services.matching_reason_store import (
+    MatchingReasonCache,
+    get_matching_reason_store,
+    get_matching_reason_cache,
+    invalidate_matching_reasons,
+    matching_reason_handle,
+    matching_reason_owners
+)
+
+# OpenAI 클라이언트 초기화 (매칭 근거를 동시에 생성하므로 비동기 클라이언트 사용)
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# 매칭 근거 동시 생성 수 (전체 요청 공유) / 요청당 근거 생성 제한 시간(초)
+MATCHING_REASON_CONCURRENCY = int(os.getenv("MATCHING_REASON_CONCURRENCY", "5"))
+MATCHING_REASON_DEADLINE = float(os.getenv("MATCHING_REASON_DEADLINE", "15"))
+# 근거 1건 GPT 호출 제한 시간(초) - 지연 생성(deferReasons)도 이 시간 안에 끝남
+MATCHING_REASON_TIMEOUT = float(os.getenv("MATCHING_REASON_TIMEOUT", "60"))
+_reason_semaphore = asyncio.Semaphore(MATCHING_REASON_CONCURRENCY)
 
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 인덱스 검색 시 재정렬할 후보 수 (top_k * factor, 최소 min)
+INDEX_RERANK_FACTOR = int(os.getenv("INDEX_RERANK_FACTOR", "20"))
+INDEX_RERANK_MIN = int(os.getenv("INDEX_RERANK_MIN", "200"))
 
 
-def match_candidate_with_job(
+def candidate_profile_text(candidate_profile: Dict) -> str:
+    """매칭용 구직자 프로필 딕셔너리 → 임베딩 텍스트"""
+    return build_candidate_text(
+        resume_text=candidate_profile.get("resumeText"),
+        skills=candidate_profile.get("skills", []),
+        experience=candidate_profile.get("experience"),
+        desired_position=candidate_profile.get("desiredPosition")
+    )
+
+
+def job_posting_text(job_posting: Dict) -> str:
+    """매칭용 채용 공고 딕셔너리 → 임베딩 텍스트"""
+    return build_job_posting_text(
+        title=job_posting.get("title"),
+        description=job_posting.get("description"),
+        position=job_posting.get("position"),
+        requirements=job_posting.get("requirements", []),
+        preferred_skills=job_posting.get("preferredSkills", [])
+    )
+
+
+async def match_candidate_with_job(
     candidate_profile: Dict,
     job_posting: Dict
 ) -> Dict:
@@ -32,6 +82,24 @@ def match_candidate_with_job(
     Returns:
         매칭 결과 (score, reason)
     """
+    # 1-2. 임베딩 생성 + 매칭 점수 계산 (CPU 작업 스레드 풀)
+    matching_score = await run_cpu_bound(_score_candidate_with_job, candidate_profile, job_posting)
+    
+    # 3. 매칭 근거 생성 (GPT-5)
+    matching_reason = await generate_matching_reason(
+        candidate_profile,
+        job_posting,
+        matching_score
+    )
+    
+    return {
+        "matchingScore": matching_score,
+        "matchingReason": matching_reason
+    }
+
+
+def _score_candidate_with_job(candidate_profile: Dict, job_posting: Dict) -> float:
+    """구직자-공고 임베딩 생성 후 매칭 점수 계산"""
     # 1. 임베딩 생성
     candidate_embedding = generate_candidate_embedding(
         resume_text=candidate_profile.get("resumeText"),
@@ -49,27 +117,15 @@ def match_candidate_with_job(
     )
     
     # 2. 매칭 점수 계산
-    matching_score = calculate_matching_score(
+    return calculate_matching_score(
         candidate_embedding,
         job_embedding,
         candidate_profile,
         job_posting
     )
-    
-    # 3. 매칭 근거 생성 (GPT-5)
-    matching_reason = generate_matching_reason(
-        candidate_profile,
-        job_posting,
-        matching_score
-    )
-    
-    return {
-        "matchingScore": matching_score,
-        "matchingReason": matching_reason
-    }
 
 
-def generate_matching_reason(
+async def generate_matching_reason(
     candidate_profile: Dict,
     job_posting: Dict,
     matching_score: float
@@ -83,8 +139,22 @@ def generate_matching_reason(
         matching_score: 매칭 점수
     
     Returns:
-        매칭 근거 텍스트
+        매칭 근거 텍스트 (실패 시 점수 구간별 기본 근거)
     """
+    try:
+        return await _request_matching_reason(candidate_profile, job_posting, matching_score)
+    
+    except Exception as e:
+        print(f"[Matching Service] 매칭 근거 생성 오류: {e}")
+        return _fallback_matching_reason(matching_score)
+
+
+async def _request_matching_reason(
+    candidate_profile: Dict,
+    job_posting: Dict,
+    matching_score: float
+) -> str:
+    """매칭 근거 GPT 호출 (실패 시 예외 발생)"""
     
     system_prompt = """당신은 HR 매칭 전문가입니다.
 구직자 프로필과 채용 공고를 분석하여 왜 이들이 매칭되는지 또는 매칭되지 않는지를 명확하고 객관적으로 설명하세요.
@@ -126,45 +196,293 @@ def generate_matching_reason(
 
 위 정보를 바탕으로 이 구직자가 이 공고에 적합한 이유 또는 고려사항을 설명해주세요."""
 
-    try:
-        response = client.chat.completions.create(
-            model=os.getenv("OPENAI_MODEL", "gpt-5"),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
+    model = os.getenv("OPENAI_MODEL", "gpt-5")
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+    
+    # 같은 프롬프트로 생성한 근거가 있으면 재사용
+    cache = get_matching_reason_cache()
+    cache_key = MatchingReasonCache.fingerprint(model, messages) if cache is not None else None
+    if cache is not None:
+        cached_reason = cache.get(cache_key)
+        if cached_reason is not None:
+            return cached_reason
+    
+    async with _reason_semaphore:
+        response = await asyncio.wait_for(
+            client.chat.completions.create(
+                model=model,
+                messages=messages
+            ),
+            timeout=MATCHING_REASON_TIMEOUT
         )
-        
-        reason = response.choices[0].message.content.strip()
-        return reason
-        
-    except Exception as e:
-        print(f"[Matching Service] 매칭 근거 생성 오류: {e}")
-        # 기본 근거 반환
-        if matching_score >= 80:
-            return "높은 매칭도를 보이며, 주요 요구사항을 충족합니다."
-        elif matching_score >= 60:
-            return "양호한 매칭도를 보이나, 일부 요구사항 검토가 필요합니다."
-        else:
-            return "매칭도가 낮으며, 다른 공고를 고려해보시기 바랍니다."
+    
+    reason = response.choices[0].message.content.strip()
+    
+    if cache is not None:
+        cache.set(
+            cache_key,
+            reason,
+            tokens=response.usage.total_tokens if response.usage else 0,
+            owners=matching_reason_owners(candidate_profile, job_posting)
+        )
+    return reason
+
+
+def _fallback_matching_reason(matching_score: float) -> str:
+    """점수 구간별 기본 매칭 근거 (GPT 호출 실패/시간 초과 시)"""
+    if matching_score >= 80:
+        return "높은 매칭도를 보이며, 주요 요구사항을 충족합니다."
+    elif matching_score >= 60:
+        return "양호한 매칭도를 보이나, 일부 요구사항 검토가 필요합니다."
+    else:
+        return "매칭도가 낮으며, 다른 공고를 고려해보시기 바랍니다."
+
+
+async def generate_matching_reasons(
+    pairs: List[Tuple[Dict, Dict, float]],
+    deadline: Optional[float] = None,
+    defer: bool = False
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    여러 매칭 근거 동시 생성 (근거 저장소 공유)
+    
+    (구직자, 공고, 점수 구간, 프롬프트 필드)별 근거 핸들로 저장소를 먼저 조회하고, 없는 근거만
+    생성한다. 동시 호출 수는 MATCHING_REASON_CONCURRENCY로 제한하고,
+    deadline(초) 안에 끝나지 않은 근거는 점수 구간별 기본 근거로 대체한다.
+    (시간 초과된 생성은 계속 진행되어 다음 조회 때 재사용)
+    
+    Args:
+        pairs: [(구직자 프로필, 채용 공고, 매칭 점수), ...]
+        deadline: 전체 제한 시간 (기본: MATCHING_REASON_DEADLINE)
+        defer: True면 기다리지 않고 예약만 함 (완료된 근거만 반환)
+    
+    Returns:
+        pairs와 같은 순서의 [(근거 핸들, 매칭 근거), ...]
+        (defer=True면 아직 생성 중인 근거는 None)
+    """
+    if not pairs:
+        return []
+    
+    store = get_matching_reason_store()
+    handles = []
+    tasks = []
+    for candidate, job, score in pairs:
+        handle = matching_reason_handle(candidate, job, score)
+        task = store.schedule(
+            handle,
+            lambda candidate=candidate, job=job, score=score: _request_matching_reason(candidate, job, score),
+            _fallback_matching_reason(score),
+            owners=matching_reason_owners(candidate, job)
+        )
+        handles.append(handle)
+        if task is not None:
+            tasks.append(task)
+    
+    if tasks and not defer:
+        _, pending = await asyncio.wait(
+            tasks,
+            timeout=MATCHING_REASON_DEADLINE if deadline is None else deadline
+        )
+        if pending:
+            print(f"[Matching Service] 매칭 근거 생성 시간 초과: {len(pending)}/{len(pairs)}건 기본 근거로 대체")
+    
+    results = []
+    for handle, (_, _, score) in zip(handles, pairs):
+        reason = store.get(handle)
+        if reason is None and not defer:
+            reason = _fallback_matching_reason(score)
+        results.append((handle, reason))
+    return results
+
+
+async def index_job_postings(job_postings: List[Dict]) -> int:
+    """
+    채용 공고를 공고 인덱스에 추가/갱신
+    
+    Args:
+        job_postings: 공고 리스트 (id 필수)
+    
+    Returns:
+        인덱스에 반영된 공고 수
+    """
+    if not job_postings:
+        return 0
+    
+    job_ids = [job["id"] for job in job_postings]
+    await run_cpu_bound(_upsert_job_postings, job_ids, job_postings)
+    
+    # 갱신된 공고의 근거 핸들 무효화 (내용이 같으면 프롬프트 지문 캐시는 그대로 재사용)
+    invalidate_matching_reasons(job_ids=job_ids, include_cache=False)
+    
+    return len(job_postings)
+
+
+def _upsert_job_postings(job_ids: List[str], job_postings: List[Dict]):
+    """공고 임베딩 일괄 생성 후 공고 인덱스에 반영"""
+    job_embeddings = generate_embeddings_batch(
+        [job_posting_text(job) for job in job_postings]
+    )
+    get_job_index().upsert_many(job_ids, job_embeddings, job_postings)
+
+
+async def remove_job_posting(job_id: str) -> bool:
+    """공고 인덱스에서 공고 삭제 (삭제 여부 반환, 관련 매칭 근거도 무효화)"""
+    invalidate_matching_reasons(job_ids=[job_id])
+    return await run_cpu_bound(get_job_index().delete, job_id)
+
+
+async def index_candidate_profiles(candidate_profiles: List[Dict]) -> int:
+    """
+    구직자 프로필을 구직자 인덱스에 추가/갱신
+    
+    Args:
+        candidate_profiles: 구직자 프로필 리스트 (userId 필수)
+    
+    Returns:
+        인덱스에 반영된 프로필 수
+    """
+    if not candidate_profiles:
+        return 0
+    
+    user_ids = [candidate["userId"] for candidate in candidate_profiles]
+    await run_cpu_bound(_upsert_candidate_profiles, user_ids, candidate_profiles)
+    
+    # 갱신된 구직자의 근거 핸들 무효화 (내용이 같으면 프롬프트 지문 캐시는 그대로 재사용)
+    invalidate_matching_reasons(user_ids=user_ids, include_cache=False)
+    
+    return len(candidate_profiles)
+
 
+def _upsert_candidate_profiles(user_ids: List[str], candidate_profiles: List[Dict]):
+    """구직자 임베딩 일괄 생성 후 구직자 인덱스에 반영"""
+    candidate_embeddings = generate_embeddings_batch(
+        [candidate_profile_text(candidate) for candidate in candidate_profiles]
+    )
+    get_candidate_index().upsert_many(user_ids, candidate_embeddings, candidate_profiles)
+
+
+async def remove_candidate_profile(user_id: str) -> bool:
+    """구직자 인덱스에서 프로필 삭제 (삭제 여부 반환, 관련 매칭 근거도 무효화)"""
+    invalidate_matching_reasons(user_ids=[user_id])
+    return await run_cpu_bound(get_candidate_index().delete, user_id)
 
-def find_best_matches_for_candidate(
+
+def build_candidate_filter(filters: Optional[Dict]) -> Optional[Dict]:
+    """
+    recommend-candidates 필터 → 구직자 인덱스 검색 필터 (인메모리/pgvector 공통)
+    
+    Args:
+        filters: {
+            "experienceMin": 최소 경력, "experienceMax": 최대 경력,
+            "desiredPositions": 희망 직무 목록 (하나라도 일치),
+            "skills": 기술 목록, "skillsMatch": "any" | "all"
+        }
+    
+    Returns:
+        {"ranges": {필드: (최소, 최대)}, "tags": {필드: (값 목록, match_all)}}
+        (필터가 없으면 None)
+    """
+    if not filters:
+        return None
+    
+    where = {"ranges": {}, "tags": {}}
+    
+    if filters.get("experienceMin") is not None or filters.get("experienceMax") is not None:
+        where["ranges"]["experience"] = (
+            filters.get("experienceMin"),
+            filters.get("experienceMax")
+        )
+    
+    if filters.get("desiredPositions"):
+        where["tags"]["desiredPosition"] = (filters["desiredPositions"], False)
+    
+    if filters.get("skills"):
+        where["tags"]["skills"] = (
+            filters["skills"],
+            filters.get("skillsMatch") == "all"
+        )
+    
+    if not where["ranges"] and not where["tags"]:
+        return None
+    return where
+
+
+def _search_rerank_pool(
+    index,
+    query_embedding: List[float],
+    top_k: int,
+    where: Optional[Dict] = None
+):
+    """
+    인덱스에서 유사도 상위 후보를 가져옴 (최종 점수 재정렬용)
+    
+    경력/기술 보정이 있어 유사도 순위와 최종 순위가 다를 수 있으므로
+    top_k보다 넉넉하게 max(top_k * INDEX_RERANK_FACTOR, INDEX_RERANK_MIN)개를 가져온다.
+    
+    Returns:
+        (메타데이터 리스트, (N, 768) 임베딩 행렬)
+    """
+    pool_size = max(top_k * INDEX_RERANK_FACTOR, INDEX_RERANK_MIN)
+    hits = index.search(query_embedding, pool_size, where=where)
+    
+    metadatas = [metadata for _, _, _, metadata in hits]
+    embeddings = (
+        np.stack([vector for _, _, vector, _ in hits])
+        if hits else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+    )
+    return metadatas, embeddings
+
+
+async def find_best_matches_for_candidate(
     candidate_profile: Dict,
-    job_postings: List[Dict],
-    top_k: int = 5
+    job_postings: Optional[List[Dict]],
+    top_k: int = 5,
+    defer_reasons: bool = False
 ) -> List[Dict]:
     """
     구직자에게 가장 적합한 공고 찾기
     
     Args:
         candidate_profile: 구직자 프로필
-        job_postings: 공고 리스트
+        job_postings: 공고 리스트 (None이면 공고 인덱스에서 검색)
         top_k: 상위 몇 개 반환
+        defer_reasons: True면 근거를 기다리지 않음 (reasonId로 나중에 조회)
     
     Returns:
         매칭 결과 리스트 (점수 높은 순)
     """
+    # 임베딩/검색/점수 계산은 CPU 작업 스레드 풀에서 실행
+    top_matches = await run_cpu_bound(
+        _rank_jobs_for_candidate,
+        candidate_profile,
+        job_postings,
+        top_k
+    )
+    
+    # 근거 동시 생성 (제한 시간 초과 시 기본 근거, defer_reasons면 핸들만 반환)
+    reasons = await generate_matching_reasons(
+        [
+            (candidate_profile, match["jobPosting"], match["matchingScore"])
+            for match in top_matches
+        ],
+        defer=defer_reasons
+    )
+    for match, (reason_id, reason) in zip(top_matches, reasons):
+        match["reasonId"] = reason_id
+        match["matchingReason"] = reason
+    
+    return top_matches
+
+
+def _rank_jobs_for_candidate(
+    candidate_profile: Dict,
+    job_postings: Optional[List[Dict]],
+    top_k: int
+) -> List[Dict]:
+    """구직자 기준 공고 상위 K개 (jobPosting, matchingScore)"""
     # 구직자 임베딩 생성 (한 번만)
     candidate_embedding = generate_candidate_embedding(
         resume_text=candidate_profile.get("resumeText"),
@@ -173,61 +491,89 @@ def find_best_matches_for_candidate(
         desired_position=candidate_profile.get("desiredPosition")
     )
     
-    # 각 공고와 매칭 점수 계산
-    matches = []
-    for job in job_postings:
-        job_embedding = generate_job_posting_embedding(
-            title=job.get("title"),
-            description=job.get("description"),
-            position=job.get("position"),
-            requirements=job.get("requirements", []),
-            preferred_skills=job.get("preferredSkills", [])
-        )
-        
-        score = calculate_matching_score(
+    if job_postings is None:
+        job_postings, job_embeddings = _search_rerank_pool(
+            get_job_index(),
             candidate_embedding,
-            job_embedding,
-            candidate_profile,
-            job
+            top_k
         )
-        
-        matches.append({
-            "jobPosting": job,
-            "matchingScore": score
-        })
-    
-    # 점수 순으로 정렬
-    matches.sort(key=lambda x: x["matchingScore"], reverse=True)
-    
-    # 상위 K개만 반환하고 근거 생성
-    top_matches = matches[:top_k]
-    
-    for match in top_matches:
-        match["matchingReason"] = generate_matching_reason(
-            candidate_profile,
-            match["jobPosting"],
-            match["matchingScore"]
+    else:
+        # 공고 임베딩 일괄 생성 (배치 인코딩)
+        job_embeddings = generate_embeddings_batch(
+            [job_posting_text(job) for job in job_postings]
         )
     
+    # 전체 공고 매칭 점수 일괄 계산
+    scores = calculate_matching_scores_batch(
+        candidate_embedding,
+        job_embeddings,
+        candidate_profile,
+        job_postings
+    )
+    
+    # 상위 K개만 선택 (점수 높은 순)
+    top_matches = [
+        {
+            "jobPosting": job_postings[i],
+            "matchingScore": float(scores[i])
+        }
+        for i in select_top_k(scores, top_k)
+    ]
+    
     return top_matches
 
 
-def find_best_candidates_for_job(
+async def find_best_candidates_for_job(
     job_posting: Dict,
-    candidate_profiles: List[Dict],
-    top_k: int = 5
+    candidate_profiles: Optional[List[Dict]],
+    top_k: int = 5,
+    filters: Optional[Dict] = None,
+    defer_reasons: bool = False
 ) -> List[Dict]:
     """
     채용 공고에 가장 적합한 후보자 찾기
     
     Args:
         job_posting: 채용 공고
-        candidate_profiles: 후보자 리스트
+        candidate_profiles: 후보자 리스트 (None이면 구직자 인덱스에서 검색)
         top_k: 상위 몇 명 반환
+        filters: 구직자 인덱스 검색 필터 (경력 범위, 희망 직무, 기술)
+        defer_reasons: True면 근거를 기다리지 않음 (reasonId로 나중에 조회)
     
     Returns:
         매칭 결과 리스트 (점수 높은 순)
     """
+    # 임베딩/검색/점수 계산은 CPU 작업 스레드 풀에서 실행
+    top_matches = await run_cpu_bound(
+        _rank_candidates_for_job,
+        job_posting,
+        candidate_profiles,
+        top_k,
+        filters
+    )
+    
+    # 근거 동시 생성 (제한 시간 초과 시 기본 근거, defer_reasons면 핸들만 반환)
+    reasons = await generate_matching_reasons(
+        [
+            (match["candidate"], job_posting, match["matchingScore"])
+            for match in top_matches
+        ],
+        defer=defer_reasons
+    )
+    for match, (reason_id, reason) in zip(top_matches, reasons):
+        match["reasonId"] = reason_id
+        match["matchingReason"] = reason
+    
+    return top_matches
+
+
+def _rank_candidates_for_job(
+    job_posting: Dict,
+    candidate_profiles: Optional[List[Dict]],
+    top_k: int,
+    filters: Optional[Dict]
+) -> List[Dict]:
+    """공고 기준 후보자 상위 K명 (candidate, matchingScore)"""
     # 공고 임베딩 생성 (한 번만)
     job_embedding = generate_job_posting_embedding(
         title=job_posting.get("title"),
@@ -237,40 +583,35 @@ def find_best_candidates_for_job(
         preferred_skills=job_posting.get("preferredSkills", [])
     )
     
-    # 각 후보자와 매칭 점수 계산
-    matches = []
-    for candidate in candidate_profiles:
-        candidate_embedding = generate_candidate_embedding(
-            resume_text=candidate.get("resumeText"),
-            skills=candidate.get("skills", []),
-            experience=candidate.get("experience"),
-            desired_position=candidate.get("desiredPosition")
-        )
-        
-        score = calculate_matching_score(
-            candidate_embedding,
+    if candidate_profiles is None:
+        candidate_profiles, candidate_embeddings = _search_rerank_pool(
+            get_candidate_index(),
             job_embedding,
-            candidate,
-            job_posting
+            top_k,
+            build_candidate_filter(filters)
         )
-        
-        matches.append({
-            "candidate": candidate,
-            "matchingScore": score
-        })
-    
-    # 점수 순으로 정렬
-    matches.sort(key=lambda x: x["matchingScore"], reverse=True)
-    
-    # 상위 K명만 반환하고 근거 생성
-    top_matches = matches[:top_k]
-    
-    for match in top_matches:
-        match["matchingReason"] = generate_matching_reason(
-            match["candidate"],
-            job_posting,
-            match["matchingScore"]
+    else:
+        # 후보자 임베딩 일괄 생성 (배치 인코딩)
+        candidate_embeddings = generate_embeddings_batch(
+            [candidate_profile_text(candidate) for candidate in candidate_profiles]
         )
     
+    # 전체 후보자 매칭 점수 일괄 계산
+    scores = calculate_matching_scores_batch(
+        job_embedding,
+        candidate_embeddings,
+        candidate_profiles,
+        job_posting
+    )
+    
+    # 상위 K명만 선택 (점수 높은 순)
+    top_matches = [
+        {
+            "candidate": candidate_profiles[i],
+            "matchingScore": float(scores[i])
+        }
+        for i in select_top_k(scores, top_k)
+    ]
+    
     return top_matches
 
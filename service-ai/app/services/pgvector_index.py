@@ -0,0 +1,471 @@
+"""
+pgvector 인덱스 서비스
+PostgreSQL(pgvector) 테이블에 임베딩을 저장하고 유사도 상위 K 검색을 DB에서 수행
+
+- VectorIndex와 같은 인터페이스 (upsert_many / delete / get / search / stats)
+- 코사인 거리(<=>) + HNSW 또는 IVFFlat 인덱스
+- 숫자 필터 필드는 double precision 컬럼, 태그 필터 필드는 text[] 컬럼(GIN 인덱스)
+- 필터 검색은 pgvector 0.8+ iterative scan으로 k개를 채우고, 이전 버전은 검색 폭을 넓혀 재조회
+  (그래도 모자라면 벡터 인덱스 없이 정확 검색)
+- psycopg2 / pgvector는 VECTOR_BACKEND=pgvector일 때만 임포트
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import os
+import threading
+
+import numpy as np
+
+# HNSW ef_search 상한 (pgvector 제한)
+HNSW_MAX_EF_SEARCH = 1000
+# 필터 검색 결과가 k개 미만일 때 검색 폭을 늘리는 배수 (iterative scan 미지원 버전)
+FILTERED_SEARCH_GROWTH = 4
+# iterative scan을 지원하는 pgvector 최소 버전
+ITERATIVE_SCAN_VERSION = (0, 8, 0)
+
+
+def _connection_kwargs(database_url: str) -> Dict:
+    """
+    DATABASE_URL → psycopg2 접속 인자
+
+    service-core(Prisma)와 같은 URL을 쓰므로 libpq가 모르는 schema 파라미터는
+    search_path 옵션으로 변환한다.
+    """
+    parts = urlsplit(database_url)
+    query = dict(parse_qsl(parts.query))
+    schema = query.pop("schema", None)
+
+    kwargs = {"dsn": urlunsplit(parts._replace(query=urlencode(query)))}
+    if schema:
+        kwargs["options"] = f"-c search_path={schema}"
+    return kwargs
+
+
+class PgVectorIndex:
+    """
+    pgvector 테이블 기반 벡터 인덱스
+
+    Args:
+        pool: psycopg2 커넥션 풀 (여러 인덱스가 공유)
+        table: 테이블 이름
+        dim: 벡터 차원
+        index_type: "hnsw" 또는 "ivfflat"
+        search_breadth: 검색 폭 (hnsw.ef_search / ivfflat.probes)
+        numeric_fields: 범위 필터용 숫자 메타데이터 필드
+        tag_fields: 일치 필터용 메타데이터 필드 (문자열 또는 문자열 리스트)
+    """
+
+    def __init__(
+        self,
+        pool,
+        table: str,
+        dim: int = 768,
+        index_type: str = "hnsw",
+        search_breadth: int = 100,
+        numeric_fields: Iterable[str] = (),
+        tag_fields: Iterable[str] = ()
+    ):
+        if index_type not in ("hnsw", "ivfflat"):
+            raise ValueError(f"지원하지 않는 pgvector 인덱스 유형입니다: {index_type}")
+
+        self.pool = pool
+        self.table = table
+        self.dim = dim
+        self.index_type = index_type
+        self.search_breadth = search_breadth
+        self.numeric_fields = tuple(numeric_fields)
+        self.tag_fields = tuple(tag_fields)
+        self.ivfflat_lists = int(os.getenv("PGVECTOR_IVFFLAT_LISTS", "100"))
+
+        # 변경 횟수 (VectorIndex와 인터페이스 통일, 영속화는 DB가 담당)
+        self.version = 0
+        # pgvector 0.8+ iterative scan 지원 여부 (_create_table에서 확인)
+        self.iterative_scan = False
+
+        self._create_table()
+
+    def __len__(self) -> int:
+        with self._cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {self.table}")
+            return cursor.fetchone()[0]
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._cursor() as cursor:
+            cursor.execute(f"SELECT 1 FROM {self.table} WHERE key = %s", (str(key),))
+            return cursor.fetchone() is not None
+
+    # ===== 변경 =====
+
+    def upsert_many(self, keys: List[Hashable], vectors: np.ndarray, metadatas: List[Dict] = None):
+        """
+        여러 항목 추가/갱신 (key 충돌 시 덮어씀)
+
+        Args:
+            keys: 항목 키 리스트
+            vectors: (N, dim) 벡터 행렬
+            metadatas: 항목별 메타데이터 (선택)
+        """
+        from psycopg2.extras import Json, execute_values
+
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+        metadatas = metadatas or [{} for _ in keys]
+
+        # 같은 배치 안에서 키가 중복되면 마지막 값만 사용 (ON CONFLICT 제약)
+        latest = {}
+        for key, vector, metadata in zip(keys, vectors, metadatas):
+            latest[str(key)] = (vector, metadata)
+        if not latest:
+            return
+
+        rows = [
+            (
+                key,
+                vector,
+                Json(metadata),
+                *[self._numeric_value(metadata.get(field)) for field in self.numeric_fields],
+                *[_tag_values(metadata.get(field)) for field in self.tag_fields]
+            )
+            for key, (vector, metadata) in latest.items()
+        ]
+
+        columns = self._columns()
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns[1:])
+        with self._cursor(commit=True) as cursor:
+            execute_values(
+                cursor,
+                f"INSERT INTO {self.table} ({', '.join(columns)}) VALUES %s "
+                f"ON CONFLICT (key) DO UPDATE SET {updates}",
+                rows,
+                page_size=500
+            )
+
+        self.version += 1
+
+    def upsert(self, key: Hashable, vector: np.ndarray, metadata: Dict = None):
+        """단일 항목 추가/갱신"""
+        self.upsert_many([key], np.asarray(vector)[None, :], [metadata or {}])
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        항목 삭제
+
+        Returns:
+            삭제 여부
+        """
+        with self._cursor(commit=True) as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE key = %s", (str(key),))
+            deleted = cursor.rowcount > 0
+
+        if deleted:
+            self.version += 1
+        return deleted
+
+    # ===== 조회 =====
+
+    def get(self, key: Hashable) -> Optional[Tuple[np.ndarray, Dict]]:
+        """키로 (정규화 벡터, 메타데이터) 조회"""
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"SELECT embedding, metadata FROM {self.table} WHERE key = %s",
+                (str(key),)
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+        return np.asarray(row[0], dtype=np.float32), row[1]
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        where: Dict = None
+    ) -> List[Tuple[Hashable, float, np.ndarray, Dict]]:
+        """
+        코사인 유사도 상위 k개 검색 (정렬/필터 모두 DB에서 수행)
+
+        근사 인덱스는 검색 폭만큼의 후보에 필터를 적용하므로, 필터가 있으면 결과가 k개 미만이 될 수 있다.
+        pgvector 0.8+는 iterative scan으로 후보를 이어서 탐색하고, 이전 버전은 검색 폭을 늘려 재조회한다.
+        그래도 k개 미만이면 벡터 인덱스 없이 정확 검색해 필터를 통과한 행이 k개보다 적을 때만 k개 미만을 반환한다.
+
+        Args:
+            query: 질의 벡터
+            k: 반환할 개수
+            where: 검색 필터 {"ranges": {필드: (최소, 최대)}, "tags": {필드: (값 목록, match_all)}}
+
+        Returns:
+            [(키, 유사도, 정규화 벡터, 메타데이터), ...] (유사도 높은 순)
+        """
+        if k <= 0:
+            return []
+
+        query = _normalize(np.asarray(query, dtype=np.float32).reshape(1, self.dim))[0]
+        conditions, params = self._where_clause(where)
+        where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        sql = (
+            f"SELECT key, 1 - (embedding <=> %s) AS similarity, embedding, metadata "
+            f"FROM {self.table} {where_sql} "
+            f"ORDER BY embedding <=> %s LIMIT %s"
+        )
+        sql_params = [query, *params, query, k]
+
+        with self._cursor() as cursor:
+            # 검색 폭이 k보다 작으면 결과가 k개 미만이 될 수 있으므로 함께 늘림
+            if self.index_type == "hnsw":
+                breadth = min(max(self.search_breadth, k), HNSW_MAX_EF_SEARCH)
+            else:
+                breadth = self.search_breadth
+            self._set_breadth(cursor, breadth)
+
+            if conditions and self.iterative_scan:
+                # ivfflat은 relaxed_order만 지원 (아래에서 유사도 순으로 다시 정렬)
+                cursor.execute(
+                    "SELECT set_config(%s, %s, true)",
+                    (
+                        f"{self.index_type}.iterative_scan",
+                        "strict_order" if self.index_type == "hnsw" else "relaxed_order"
+                    )
+                )
+
+            cursor.execute(sql, sql_params)
+            rows = cursor.fetchall()
+
+            if conditions and len(rows) < k:
+                # iterative scan 미지원: 검색 폭을 늘려 재조회
+                while not self.iterative_scan and breadth < self._max_breadth():
+                    breadth = min(breadth * FILTERED_SEARCH_GROWTH, self._max_breadth())
+                    self._set_breadth(cursor, breadth)
+                    cursor.execute(sql, sql_params)
+                    rows = cursor.fetchall()
+                    if len(rows) >= k:
+                        break
+
+            if conditions and len(rows) < k:
+                # 후보 탐색 한도 도달: 벡터 인덱스 없이 필터 통과 행 전체에서 정확 검색
+                cursor.execute("SELECT set_config('enable_indexscan', 'off', true)")
+                cursor.execute(sql, sql_params)
+                rows = cursor.fetchall()
+
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return [
+            (key, float(similarity), np.asarray(embedding, dtype=np.float32), metadata)
+            for key, similarity, embedding, metadata in rows
+        ]
+
+    def stats(self) -> Dict:
+        """인덱스 상태"""
+        return {
+            "backend": "pgvector",
+            "table": self.table,
+            "size": len(self),
+            "dim": self.dim,
+            "mode": self.index_type,
+            "search_breadth": self.search_breadth,
+            "iterative_scan": self.iterative_scan,
+            "version": self.version,
+        }
+
+    # ===== 내부 구현 =====
+
+    @contextmanager
+    def _cursor(self, commit: bool = False):
+        """풀에서 커넥션을 빌려 커서 제공 (SET LOCAL 설정은 트랜잭션 종료 시 해제)"""
+        connection = self.pool.getconn()
+        try:
+            with connection.cursor() as cursor:
+                yield cursor
+            if commit:
+                connection.commit()
+            else:
+                connection.rollback()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            self.pool.putconn(connection)
+
+    def _max_breadth(self) -> int:
+        """검색 폭 상한 (hnsw.ef_search 제한 / ivfflat 리스트 수)"""
+        return HNSW_MAX_EF_SEARCH if self.index_type == "hnsw" else self.ivfflat_lists
+
+    def _set_breadth(self, cursor, breadth: int):
+        """현재 트랜잭션의 검색 폭 설정 (hnsw.ef_search / ivfflat.probes)"""
+        setting = "hnsw.ef_search" if self.index_type == "hnsw" else "ivfflat.probes"
+        cursor.execute("SELECT set_config(%s, %s, true)", (setting, str(breadth)))
+
+    def _columns(self) -> List[str]:
+        """INSERT 컬럼 순서 (key, embedding, metadata, 숫자 필드..., 태그 필드...)"""
+        return [
+            "key",
+            "embedding",
+            "metadata",
+            *[_column(field) for field in self.numeric_fields],
+            *[_column(field) for field in self.tag_fields],
+        ]
+
+    def _create_table(self):
+        """테이블 및 인덱스 생성 (없을 때만)"""
+        numeric_columns = "".join(
+            f", {_column(field)} DOUBLE PRECISION" for field in self.numeric_fields
+        )
+        tag_columns = "".join(
+            f", {_column(field)} TEXT[] NOT NULL DEFAULT '{{}}'" for field in self.tag_fields
+        )
+
+        if self.index_type == "hnsw":
+            vector_index = (
+                f"CREATE INDEX IF NOT EXISTS {self.table}_embedding_idx ON {self.table} "
+                f"USING hnsw (embedding vector_cosine_ops)"
+            )
+        else:
+            vector_index = (
+                f"CREATE INDEX IF NOT EXISTS {self.table}_embedding_idx ON {self.table} "
+                f"USING ivfflat (embedding vector_cosine_ops) WITH (lists = {self.ivfflat_lists})"
+            )
+
+        with self._cursor(commit=True) as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                f"key TEXT PRIMARY KEY, "
+                f"embedding vector({self.dim}) NOT NULL, "
+                f"metadata JSONB NOT NULL DEFAULT '{{}}'"
+                f"{numeric_columns}{tag_columns}, "
+                f"updated_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+            cursor.execute(vector_index)
+
+            for field in self.numeric_fields:
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self.table}_{field.lower()}_idx "
+                    f"ON {self.table} ({_column(field)})"
+                )
+            for field in self.tag_fields:
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self.table}_{field.lower()}_idx "
+                    f"ON {self.table} USING gin ({_column(field)})"
+                )
+
+            cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            row = cursor.fetchone()
+            self.iterative_scan = row is not None and _version_tuple(row[0]) >= ITERATIVE_SCAN_VERSION
+
+    def _where_clause(self, where: Optional[Dict]) -> Tuple[List[str], List]:
+        """검색 필터 → (SQL 조건 리스트, 파라미터 리스트)"""
+        conditions, params = [], []
+        if not where:
+            return conditions, params
+
+        for field, (minimum, maximum) in where.get("ranges", {}).items():
+            column = _column(field)
+            conditions.append(f"{column} IS NOT NULL")
+            if minimum is not None:
+                conditions.append(f"{column} >= %s")
+                params.append(minimum)
+            if maximum is not None:
+                conditions.append(f"{column} <= %s")
+                params.append(maximum)
+
+        for field, (values, match_all) in where.get("tags", {}).items():
+            values = list(values)
+            if not values:
+                continue
+            # @>: 모든 값 포함, &&: 하나라도 포함 (GIN 인덱스 사용)
+            conditions.append(f"{_column(field)} {'@>' if match_all else '&&'} %s::text[]")
+            params.append(values)
+
+        return conditions, params
+
+    @staticmethod
+    def _numeric_value(value) -> Optional[float]:
+        return float(value) if isinstance(value, (int, float)) else None
+
+
+def _column(field: str) -> str:
+    """메타데이터 필드 → 컬럼 식별자 (camelCase 유지를 위해 따옴표 처리)"""
+    return '"' + field.replace('"', '""') + '"'
+
+
+def _version_tuple(version: str) -> Tuple[int, ...]:
+    """확장 버전 문자열 → 비교용 튜플 ("0.8.0" → (0, 8, 0))"""
+    parts = []
+    for part in version.split("."):
+        digits = "".join(ch for ch in part if ch.isdigit())
+        parts.append(int(digits) if digits else 0)
+    return tuple(parts)
+
+
+def _tag_values(value) -> List[str]:
+    """태그 필드 값을 문자열 리스트로 정규화"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [str(v) for v in value if v is not None]
+    return [str(value)]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """행별 L2 정규화 (영벡터는 그대로)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+# 전역 커넥션 풀 (한 번만 생성)
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pgvector_pool():
+    """
+    pgvector 커넥션 풀 싱글톤 (DATABASE_URL)
+
+    풀에서 만든 커넥션마다 pgvector 타입을 등록해 numpy 배열을 바로 주고받는다.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            return _pool
+
+        from psycopg2.pool import ThreadedConnectionPool
+        from pgvector.psycopg2 import register_vector
+
+        database_url = os.getenv("DATABASE_URL")
+        if not database_url:
+            raise RuntimeError("VECTOR_BACKEND=pgvector 사용 시 DATABASE_URL이 필요합니다")
+        kwargs = _connection_kwargs(database_url.strip('"'))
+
+        # 타입 등록 전에 확장 생성 (vector 타입이 있어야 register_vector 가능)
+        import psycopg2
+        connection = psycopg2.connect(**kwargs)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            connection.commit()
+        finally:
+            connection.close()
+
+        class _VectorConnectionPool(ThreadedConnectionPool):
+            def _connect(self, key=None):
+                connection = super()._connect(key)
+                register_vector(connection)
+                connection.rollback()
+                return connection
+
+        _pool = _VectorConnectionPool(
+            int(os.getenv("PGVECTOR_POOL_MIN", "1")),
+            int(os.getenv("PGVECTOR_POOL_MAX", "10")),
+            **kwargs
+        )
+        print("[pgvector] 커넥션 풀 초기화 완료")
+        return _pool
+
+
+def close_pgvector_pool():
+    """커넥션 풀 종료 (서버 종료 시)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
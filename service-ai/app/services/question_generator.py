@@ -4,14 +4,14 @@ OpenAI GPT-4를 사용하여 맞춤형 인터뷰 질문 생성
 """
 
 from typing import List, Dict, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI
 import os
 
 # OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
-def generate_first_question(
+async def generate_first_question(
     candidate_profile: Optional[Dict] = None,
     job_posting: Optional[Dict] = None
 ) -> str:
@@ -78,7 +78,7 @@ def generate_first_question(
     
     # OpenAI API 호출
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=os.getenv("OPENAI_MODEL", "gpt-4o"),
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -95,7 +95,7 @@ def generate_first_question(
         return "안녕하세요! 오늘 인터뷰에 참여해주셔서 감사합니다. 먼저 간단하게 자기소개를 부탁드립니다."
 
 
-def generate_next_question(
+async def generate_next_question(
     conversation_history: List[Dict[str, str]],
     last_answer: str,
     candidate_profile: Optional[Dict] = None,
@@ -161,7 +161,7 @@ def generate_next_question(
     
     # OpenAI API 호출
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=os.getenv("OPENAI_MODEL", "gpt-4o"),
             messages=messages
         )
@@ -175,7 +175,7 @@ def generate_next_question(
         return "말씀해주신 내용에 대해 더 자세히 설명해주시겠어요?"
 
 
-def generate_next_question_stream(
+async def generate_next_question_stream(
     conversation_history: List[Dict[str, str]],
     last_answer: str,
     candidate_profile: Optional[Dict] = None,
@@ -241,13 +241,13 @@ def generate_next_question_stream(
     
     # OpenAI Streaming API 호출
     try:
-        stream = client.chat.completions.create(
+        stream = await client.chat.completions.create(
             model=os.getenv("OPENAI_MODEL", "gpt-4o"),
             messages=messages,
             stream=True
         )
         
-        for chunk in stream:
+        async for chunk in stream:
             if chunk.choices[0].delta.content:
                 yield chunk.choices[0].delta.content
                 
@@ -0,0 +1,285 @@
+"""
+TTS 오디오 캐시
+(텍스트, 음성, 모델, 속도, 형식)의 해시를 키로 합성된 오디오를 재사용
+
+- 1차: 프로세스 내 LRU 캐시
+- 2차: 디스크 캐시 (키.bin 파일, 재시작 후에도 유지, 용량 초과 시 오래 사용되지 않은 파일부터 삭제)
+- 같은 키로 동시에 들어온 합성 요청은 하나의 API 호출을 공유 (single-flight)
+- 인사말/고정 질문처럼 매번 같은 문장은 시작 시 미리 합성 (prewarm)
+"""
+
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import hashlib
+import os
+import threading
+import time
+
+from app.utils.cache import LRUCache
+
+
+def tts_cache_key(text: str, voice: str, model: str, speed: float = 1.0, audio_format: str = "mp3") -> str:
+    """TTS 입력 → 콘텐츠 주소 키 (SHA-256, 텍스트 앞뒤 공백 무시)"""
+    payload = "\0".join([text.strip(), voice, model, f"{float(speed):.3f}", audio_format])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    2계층 TTS 오디오 캐시
+
+    Args:
+        directory: 디스크 캐시 디렉터리 (None이면 메모리 계층만 사용)
+        memory_entries: 메모리 LRU 최대 항목 수
+        disk_bytes: 디스크 캐시 최대 용량
+    """
+
+    def __init__(self, directory: Optional[str] = None, memory_entries: int = 200, disk_bytes: int = 256 * 1024 * 1024):
+        self.memory = LRUCache(max_entries=memory_entries)
+        self.directory = directory
+        self.disk_bytes = disk_bytes
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.synthesized = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+        # 키 → 파일 크기 (오래 사용되지 않은 순서)
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_total = 0
+        self._pending: Dict[str, asyncio.Task] = {}
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load_disk_index()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """캐시 조회 (메모리 → 디스크, 디스크 히트는 메모리로 올림)"""
+        audio = self.memory.get(key)
+        if audio is not None or not self.directory:
+            return audio
+
+        with self._lock:
+            if key not in self._disk_index:
+                self.disk_misses += 1
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    audio = f.read()
+                # 파일 수정 시각을 마지막 사용 시각으로 사용 (재시작 후에도 LRU 순서 유지)
+                os.utime(path)
+            except OSError:
+                self._forget(key)
+                self.disk_misses += 1
+                return None
+            self._disk_index.move_to_end(key)
+            self.disk_hits += 1
+
+        self.memory.set(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        """오디오 저장 (메모리 + 디스크)"""
+        if not audio:
+            return
+        self.memory.set(key, audio)
+        if not self.directory:
+            return
+
+        with self._lock:
+            path = self._path(key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, "wb") as f:
+                    f.write(audio)
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"[TTS Cache] 디스크 저장 실패: {e}")
+                return
+
+            self._forget(key)
+            self._disk_index[key] = len(audio)
+            self._disk_total += len(audio)
+
+            # 용량 초과 시 오래 사용되지 않은 파일 삭제
+            while self._disk_total > self.disk_bytes and len(self._disk_index) > 1:
+                oldest = next(iter(self._disk_index))
+                self._forget(oldest)
+                try:
+                    os.remove(self._path(oldest))
+                except OSError:
+                    pass
+
+    async def get_or_synthesize(self, key: str, synthesize: Callable[[], Awaitable[bytes]]) -> Tuple[bytes, bool]:
+        """
+        캐시된 오디오 반환, 없으면 합성 후 저장 (같은 키로 합성 중이면 그 결과를 기다림)
+
+        Args:
+            key: tts_cache_key로 만든 키
+            synthesize: 전체 오디오를 반환하는 코루틴 함수
+
+        Returns:
+            (오디오, 캐시 히트 여부)
+        """
+        audio = self.get(key)
+        if audio is not None:
+            return audio, True
+
+        task, _ = self.start(key, synthesize)
+        # 먼저 요청한 클라이언트가 연결을 끊어도 다른 요청을 위해 합성은 계속 진행
+        return await asyncio.shield(task), False
+
+    def start(self, key: str, synthesize: Callable[[], Awaitable[bytes]]) -> Tuple[asyncio.Task, bool]:
+        """
+        같은 키로 합성 중인 Task 반환, 없으면 새로 시작 (성공하면 캐시에 저장)
+
+        스트리밍 합성처럼 전체 오디오를 기다리지 않는 호출 측도 같은 Task로 등록해
+        동시에 들어온 요청이 API를 중복 호출하지 않게 한다.
+
+        Returns:
+            (전체 오디오를 반환하는 Task, 이미 합성 중이던 Task 공유 여부)
+        """
+        task = self._pending.get(key)
+        # 실패한 Task는 완료 콜백 전이라도 공유하지 않음 (재시도가 새로 합성하도록)
+        if task is not None and not task.done():
+            self.shared += 1
+            return task, True
+
+        self.synthesized += 1
+        task = asyncio.create_task(synthesize())
+        self._pending[key] = task
+        task.add_done_callback(lambda finished: self._on_done(key, finished))
+        return task, False
+
+    def stats(self) -> Dict:
+        """메모리/디스크 계층 통계"""
+        disk_total = self.disk_hits + self.disk_misses
+        return {
+            "memory": self.memory.stats(),
+            "disk": {
+                "enabled": bool(self.directory),
+                "entries": len(self._disk_index),
+                "bytes": self._disk_total,
+                "max_bytes": self.disk_bytes,
+                "hits": self.disk_hits,
+                "misses": self.disk_misses,
+                "hit_rate": round(self.disk_hits / disk_total, 4) if disk_total else 0.0,
+            },
+            "synthesized": self.synthesized,
+            "shared": self.shared,
+            "pending": len(self._pending),
+        }
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        """합성 완료 처리 (성공한 오디오만 보관)"""
+        if self._pending.get(key) is task:
+            del self._pending[key]
+
+        if task.cancelled() or task.exception() is not None:
+            return
+        self.put(key, task.result())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def _forget(self, key: str):
+        size = self._disk_index.pop(key, None)
+        if size is not None:
+            self._disk_total -= size
+
+    def _load_disk_index(self):
+        """디스크 캐시 파일 목록을 마지막 사용 시각 순으로 적재"""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".tmp"):
+                # 저장 중 종료된 파일
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            if not name.endswith(".bin"):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-len(".bin")], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._disk_index[key] = size
+            self._disk_total += size
+
+
+# 전역 캐시 (한 번만 생성)
+_cache = None
+
+
+def get_tts_cache() -> Optional[TTSCache]:
+    """TTS 오디오 캐시 싱글톤 (TTS_CACHE_ENABLED=false면 None)"""
+    global _cache
+    if os.getenv("TTS_CACHE_ENABLED", "true").lower() != "true":
+        return None
+
+    if _cache is None:
+        _cache = TTSCache(
+            directory=os.getenv("TTS_CACHE_DIR", "./data/tts_cache") or None,
+            memory_entries=int(os.getenv("TTS_CACHE_MEMORY_ENTRIES", "200")),
+            disk_bytes=int(os.getenv("TTS_CACHE_DISK_MB", "256")) * 1024 * 1024
+        )
+        print("[TTS Cache] TTS 오디오 캐시 초기화 완료")
+    return _cache
+
+
+def get_tts_cache_stats() -> Dict:
+    """TTS 오디오 캐시 통계 (비활성화 시 enabled=False, 아직 생성 전이면 initialized=False)"""
+    if os.getenv("TTS_CACHE_ENABLED", "true").lower() != "true":
+        return {"enabled": False}
+    if _cache is None:
+        return {"enabled": True, "initialized": False}
+    return {"enabled": True, "initialized": True, **_cache.stats()}
+
+
+async def prewarm_tts_cache(
+    phrases: Iterable[str],
+    make_key: Callable[[str], str],
+    synthesize: Callable[[str], Awaitable[bytes]],
+    concurrency: int = 2
+) -> int:
+    """
+    고정 문장 미리 합성 (이미 캐시에 있으면 API 호출 없음)
+
+    Args:
+        phrases: 미리 합성할 문장
+        make_key: 문장 → 캐시 키
+        synthesize: 문장 → 전체 오디오
+        concurrency: 동시 합성 수
+
+    Returns:
+        새로 합성한 문장 수
+    """
+    cache = get_tts_cache()
+    if cache is None:
+        return 0
+
+    semaphore = asyncio.Semaphore(concurrency)
+    created: List[bool] = []
+
+    async def warm(phrase: str):
+        async with semaphore:
+            try:
+                _, hit = await cache.get_or_synthesize(make_key(phrase), lambda: synthesize(phrase))
+                created.append(not hit)
+            except Exception as e:
+                print(f"[TTS Cache] 미리 합성 실패: {phrase[:20]}... ({e})")
+
+    started = time.perf_counter()
+    unique = list(dict.fromkeys(phrase for phrase in phrases if phrase.strip()))
+    await asyncio.gather(*(warm(phrase) for phrase in unique))
+    print(
+        f"[TTS Cache] 고정 문장 {len(unique)}개 준비 완료 "
+        f"(새로 합성 {sum(created)}개, {time.perf_counter() - started:.1f}초)"
+    )
+    return sum(created)
@@ -0,0 +1,601 @@
+"""
+벡터 인덱스 서비스
+IVF(Inverted File) 기반 근사 최근접 이웃 검색 (NumPy 구현, 코사인 유사도)
+
+- 벡터는 L2 정규화하여 float32 행렬에 연속 저장 (내적 = 코사인 유사도)
+- 항목 수가 exact_threshold 이하이면 전수 검색, 초과하면 k-means로
+  클러스터를 학습하고 질의와 가까운 nprobe개 클러스터만 검색
+- 메타데이터의 숫자/태그 필드로 검색 전 필터링 (mask / where)
+- VECTOR_BACKEND=pgvector이면 같은 인터페이스의 PgVectorIndex 사용
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+import asyncio
+import json
+import os
+import threading
+
+import numpy as np
+
+
+class VectorIndex:
+    """
+    키 기반 upsert/delete를 지원하는 IVF 벡터 인덱스
+
+    Args:
+        dim: 벡터 차원
+        nprobe: 검색 시 탐색할 클러스터 수
+        exact_threshold: 이 개수 이하(필터 통과 항목 기준)에서는 전수 검색
+        kmeans_iterations: 클러스터 학습 반복 횟수
+        numeric_fields: 범위 필터용 숫자 메타데이터 필드
+        tag_fields: 일치 필터용 메타데이터 필드 (문자열 또는 문자열 리스트)
+    """
+
+    def __init__(
+        self,
+        dim: int = 768,
+        nprobe: int = 8,
+        exact_threshold: int = 4096,
+        kmeans_iterations: int = 10,
+        numeric_fields: Iterable[str] = (),
+        tag_fields: Iterable[str] = ()
+    ):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.exact_threshold = exact_threshold
+        self.kmeans_iterations = kmeans_iterations
+        self.numeric_fields = tuple(numeric_fields)
+        self.tag_fields = tuple(tag_fields)
+
+        # 변경 횟수 (저장 필요 여부 판단용)
+        self.version = 0
+
+        # 용량을 두 배씩 늘리는 버퍼 (앞쪽 len(self._keys)개 행만 유효)
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._keys: List[Hashable] = []
+        self._metadata: List[Dict] = []
+        self._rows: Dict[Hashable, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_size = 0
+        self._lock = threading.RLock()
+
+        # 필터용 속성: 숫자 필드는 행 정렬 배열, 태그 필드는 값 → 행 번호 집합
+        self._numeric = {field: np.zeros(0, dtype=np.float64) for field in self.numeric_fields}
+        self._tags: Dict[str, Dict[str, Set[int]]] = {field: {} for field in self.tag_fields}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    # ===== 변경 =====
+
+    def upsert_many(self, keys: List[Hashable], vectors: np.ndarray, metadatas: List[Dict] = None):
+        """
+        여러 항목 추가/갱신
+
+        Args:
+            keys: 항목 키 리스트
+            vectors: (N, dim) 벡터 행렬
+            metadatas: 항목별 메타데이터 (선택)
+        """
+        vectors = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+        metadatas = metadatas or [{} for _ in keys]
+
+        with self._lock:
+            self._reserve(len(self._keys) + len(keys))
+
+            changed_rows = []
+            for key, vector, metadata in zip(keys, vectors, metadatas):
+                row = self._rows.get(key)
+                if row is None:
+                    row = len(self._keys)
+                    self._rows[key] = row
+                    self._keys.append(key)
+                    self._metadata.append(metadata)
+                else:
+                    self._remove_tags(row, self._metadata[row])
+                    self._metadata[row] = metadata
+
+                self._vectors[row] = vector
+                self._set_attributes(row, metadata)
+                changed_rows.append(row)
+
+            if changed_rows and self._centroids is not None:
+                changed_rows = np.array(changed_rows)
+                self._assignments[changed_rows] = self._assign(self._vectors[changed_rows])
+
+            self.version += 1
+            self._maybe_train()
+
+    def upsert(self, key: Hashable, vector: np.ndarray, metadata: Dict = None):
+        """단일 항목 추가/갱신"""
+        self.upsert_many([key], np.asarray(vector)[None, :], [metadata or {}])
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        항목 삭제 (마지막 행을 빈 자리로 옮겨 연속 저장 유지)
+
+        Returns:
+            삭제 여부
+        """
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return False
+
+            self._remove_tags(row, self._metadata[row])
+
+            last = len(self._keys) - 1
+            if row != last:
+                last_key = self._keys[last]
+                self._remove_tags(last, self._metadata[last])
+                self._vectors[row] = self._vectors[last]
+                self._assignments[row] = self._assignments[last]
+                self._keys[row] = last_key
+                self._metadata[row] = self._metadata[last]
+                self._rows[last_key] = row
+                self._set_attributes(row, self._metadata[row])
+
+            self._keys.pop()
+            self._metadata.pop()
+            self.version += 1
+
+            if len(self._keys) <= self.exact_threshold:
+                self._centroids = None
+                self._trained_size = 0
+
+            return True
+
+    # ===== 조회 =====
+
+    def get(self, key: Hashable) -> Optional[Tuple[np.ndarray, Dict]]:
+        """키로 (정규화 벡터, 메타데이터) 조회"""
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                return None
+            return self._vectors[row].copy(), self._metadata[row]
+
+    def range_mask(self, field: str, minimum: float = None, maximum: float = None) -> np.ndarray:
+        """
+        숫자 필드 범위 필터 (값이 없는 항목은 제외)
+
+        Returns:
+            행별 통과 여부 (len(self),)
+        """
+        with self._lock:
+            values = self._numeric[field][:len(self._keys)]
+            with np.errstate(invalid="ignore"):
+                mask = ~np.isnan(values)
+                if minimum is not None:
+                    mask &= values >= minimum
+                if maximum is not None:
+                    mask &= values <= maximum
+            return mask
+
+    def tag_mask(self, field: str, values: Iterable[str], match_all: bool = False) -> np.ndarray:
+        """
+        태그 필드 일치 필터
+
+        Args:
+            field: 태그 필드
+            values: 찾을 값 리스트
+            match_all: True면 모든 값을 가진 항목, False면 하나라도 가진 항목
+
+        Returns:
+            행별 통과 여부 (len(self),)
+        """
+        with self._lock:
+            values = list(values)
+            size = len(self._keys)
+            if not values:
+                return np.ones(size, dtype=bool)
+
+            mask = np.ones(size, dtype=bool) if match_all else np.zeros(size, dtype=bool)
+            for value in values:
+                rows = self._tags[field].get(value, ())
+                value_mask = np.zeros(size, dtype=bool)
+                value_mask[np.fromiter(rows, dtype=np.int64, count=len(rows))] = True
+                if match_all:
+                    mask &= value_mask
+                else:
+                    mask |= value_mask
+            return mask
+
+    def where_mask(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        """
+        검색 필터 → 행 마스크
+
+        Args:
+            where: {"ranges": {필드: (최소, 최대)}, "tags": {필드: (값 목록, match_all)}}
+
+        Returns:
+            행별 통과 여부 (필터가 없으면 None)
+        """
+        if not where:
+            return None
+
+        with self._lock:
+            mask = None
+            for field, (minimum, maximum) in where.get("ranges", {}).items():
+                field_mask = self.range_mask(field, minimum, maximum)
+                mask = field_mask if mask is None else mask & field_mask
+            for field, (values, match_all) in where.get("tags", {}).items():
+                field_mask = self.tag_mask(field, values, match_all)
+                mask = field_mask if mask is None else mask & field_mask
+            return mask
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        nprobe: int = None,
+        mask: np.ndarray = None,
+        where: Dict = None
+    ) -> List[Tuple[Hashable, float, np.ndarray, Dict]]:
+        """
+        코사인 유사도 상위 k개 검색
+
+        Args:
+            query: 질의 벡터
+            k: 반환할 개수
+            nprobe: 탐색할 클러스터 수 (기본: self.nprobe)
+            mask: 행별 필터 (range_mask/tag_mask 조합, 선택)
+            where: 검색 필터 (where_mask 참고, mask와 함께 쓰면 둘 다 적용)
+
+        Returns:
+            [(키, 유사도, 정규화 벡터, 메타데이터), ...] (유사도 높은 순)
+        """
+        query = self._normalize(np.asarray(query, dtype=np.float32).reshape(1, self.dim))[0]
+
+        with self._lock:
+            if not self._keys or k <= 0:
+                return []
+
+            where_mask = self.where_mask(where)
+            if where_mask is not None:
+                mask = where_mask if mask is None else mask & where_mask
+
+            if mask is not None and mask.sum() <= self.exact_threshold:
+                # 필터 통과 항목이 적으면 해당 행만 전수 검색
+                rows = np.flatnonzero(mask)
+            else:
+                rows = self._candidate_rows(query, k, nprobe or self.nprobe, mask)
+
+            if rows is not None and len(rows) == 0:
+                return []
+
+            if rows is None:
+                # 전수 검색 (행 복사 없이 슬라이스로 계산)
+                rows = np.arange(len(self._keys))
+                similarities = self._vectors[:len(self._keys)] @ query
+            else:
+                similarities = self._vectors[rows] @ query
+            if len(rows) > k:
+                top = np.argpartition(-similarities, k - 1)[:k]
+            else:
+                top = np.arange(len(rows))
+            top = top[np.argsort(-similarities[top], kind="stable")]
+
+            return [
+                (
+                    self._keys[rows[i]],
+                    float(similarities[i]),
+                    self._vectors[rows[i]].copy(),
+                    self._metadata[rows[i]]
+                )
+                for i in top
+            ]
+
+    def stats(self) -> Dict:
+        """인덱스 상태"""
+        return {
+            "backend": "memory",
+            "size": len(self._keys),
+            "dim": self.dim,
+            "mode": "ivf" if self._centroids is not None else "exact",
+            "nlist": 0 if self._centroids is None else len(self._centroids),
+            "nprobe": self.nprobe,
+            "trained_size": self._trained_size,
+            "version": self.version,
+        }
+
+    # ===== 영속화 =====
+
+    def save(self, path: str):
+        """인덱스를 path.npz / path.json으로 저장"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            size = len(self._keys)
+            arrays = {
+                "vectors": self._vectors[:size],
+                "assignments": self._assignments[:size],
+            }
+            if self._centroids is not None:
+                arrays["centroids"] = self._centroids
+
+            # 임시 파일에 쓴 뒤 교체 (중간에 실패해도 기존 파일 유지)
+            np.savez(f"{path}.tmp.npz", **arrays)
+            with open(f"{path}.tmp.json", "w", encoding="utf-8") as f:
+                json.dump({
+                    "keys": self._keys,
+                    "metadata": self._metadata,
+                    "trained_size": self._trained_size,
+                }, f, ensure_ascii=False)
+
+        os.replace(f"{path}.tmp.npz", f"{path}.npz")
+        os.replace(f"{path}.tmp.json", f"{path}.json")
+
+    def load(self, path: str) -> bool:
+        """
+        저장된 인덱스 로드
+
+        Returns:
+            로드 여부 (파일이 없으면 False)
+        """
+        if not (os.path.exists(f"{path}.npz") and os.path.exists(f"{path}.json")):
+            return False
+
+        arrays = np.load(f"{path}.npz")
+        with open(f"{path}.json", "r", encoding="utf-8") as f:
+            state = json.load(f)
+
+        with self._lock:
+            self._vectors = arrays["vectors"].astype(np.float32)
+            self._assignments = arrays["assignments"].astype(np.int32)
+            self._centroids = arrays["centroids"] if "centroids" in arrays.files else None
+            self._keys = state["keys"]
+            self._metadata = state["metadata"]
+            self._trained_size = state.get("trained_size", 0)
+            self._rows = {key: row for row, key in enumerate(self._keys)}
+
+            # 필터 속성은 메타데이터에서 재구성
+            size = len(self._keys)
+            self._numeric = {field: np.full(size, np.nan) for field in self.numeric_fields}
+            self._tags = {field: {} for field in self.tag_fields}
+            for row, metadata in enumerate(self._metadata):
+                self._set_attributes(row, metadata)
+
+        return True
+
+    # ===== 내부 구현 =====
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """행별 L2 정규화 (영벡터는 그대로)"""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def _reserve(self, size: int):
+        """버퍼 용량 확보 (부족하면 두 배로 확장)"""
+        capacity = len(self._vectors)
+        if size <= capacity:
+            return
+
+        new_capacity = max(size, capacity * 2, 1024)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[:capacity] = self._vectors
+        assignments = np.zeros(new_capacity, dtype=np.int32)
+        assignments[:capacity] = self._assignments
+        self._vectors = vectors
+        self._assignments = assignments
+
+        for field, values in self._numeric.items():
+            expanded = np.full(new_capacity, np.nan)
+            expanded[:len(values)] = values
+            self._numeric[field] = expanded
+
+    def _set_attributes(self, row: int, metadata: Dict):
+        """메타데이터에서 필터 속성 기록"""
+        for field, values in self._numeric.items():
+            value = metadata.get(field)
+            values[row] = float(value) if isinstance(value, (int, float)) else np.nan
+
+        for field, index in self._tags.items():
+            for tag in self._tag_values(metadata.get(field)):
+                index.setdefault(tag, set()).add(row)
+
+    def _remove_tags(self, row: int, metadata: Dict):
+        """행의 태그 제거"""
+        for field, index in self._tags.items():
+            for tag in self._tag_values(metadata.get(field)):
+                rows = index.get(tag)
+                if rows is not None:
+                    rows.discard(row)
+                    if not rows:
+                        del index[tag]
+
+    @staticmethod
+    def _tag_values(value) -> List[str]:
+        """태그 필드 값을 리스트로 정규화"""
+        if value is None:
+            return []
+        if isinstance(value, (list, tuple, set)):
+            return [v for v in value if v is not None]
+        return [value]
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """가장 가까운 클러스터 번호"""
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def _maybe_train(self):
+        """항목 수가 학습 시점의 2배가 되면 클러스터 재학습"""
+        size = len(self._keys)
+        if size <= self.exact_threshold:
+            return
+        if self._centroids is not None and size < self._trained_size * 2:
+            return
+        self._train()
+
+    def _train(self):
+        """구면 k-means로 클러스터 학습 후 전체 재할당"""
+        size = len(self._keys)
+        nlist = max(1, int(np.sqrt(size)))
+
+        # 클러스터당 최대 32개 샘플로 학습
+        rng = np.random.default_rng(0)
+        sample_size = min(size, nlist * 32)
+        sample = self._vectors[:size][rng.choice(size, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+
+            # 클러스터별 합계 (라벨 정렬 후 구간 합)
+            order = np.argsort(labels, kind="stable")
+            counts = np.bincount(labels, minlength=nlist)
+            occupied = np.flatnonzero(counts)
+            starts = np.concatenate([[0], np.cumsum(counts[occupied])[:-1]])
+
+            # 빈 클러스터는 이전 중심 유지
+            sums = centroids.copy()
+            sums[occupied] = np.add.reduceat(sample[order], starts, axis=0)
+            centroids = self._normalize(sums)
+
+        self._centroids = centroids.astype(np.float32)
+        self._assignments[:size] = self._assign(self._vectors[:size])
+        self._trained_size = size
+        print(f"[Vector Index] 클러스터 학습 완료: size={size}, nlist={nlist}")
+
+    def _candidate_rows(
+        self,
+        query: np.ndarray,
+        k: int,
+        nprobe: int,
+        mask: np.ndarray = None
+    ) -> Optional[np.ndarray]:
+        """검색 대상 행 (가까운 클러스터의 행, 전수 검색이면 None)"""
+        size = len(self._keys)
+        if self._centroids is None:
+            return None if mask is None else np.flatnonzero(mask)
+
+        centroid_scores = self._centroids @ query
+        nlist = len(centroid_scores)
+        assignments = self._assignments[:size]
+
+        # 결과가 k개 미만이면 탐색 클러스터를 늘려 재시도
+        while True:
+            nprobe = min(nprobe, nlist)
+            probe = np.zeros(nlist, dtype=bool)
+            probe[np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]] = True
+            selected = probe[assignments]
+            if mask is not None:
+                selected &= mask
+            rows = np.flatnonzero(selected)
+            if len(rows) >= k or nprobe >= nlist:
+                return rows
+            nprobe *= 2
+
+
+# 전역 인덱스 (한 번만 생성)
+_job_index = None
+_candidate_index = None
+
+# 마지막으로 저장한 인덱스 버전 (경로 → version)
+_saved_versions: Dict[str, int] = {}
+# 주기적 저장(작업 스레드)과 종료 시 저장이 같은 파일을 동시에 쓰지 않도록
+_save_lock = threading.Lock()
+
+
+def _vector_backend() -> str:
+    """VECTOR_BACKEND 환경 변수 (memory | pgvector)"""
+    backend = os.getenv("VECTOR_BACKEND", "memory").lower()
+    if backend not in ("memory", "pgvector"):
+        raise ValueError(f"지원하지 않는 VECTOR_BACKEND입니다: {backend}")
+    return backend
+
+
+def _create_index(table: str, numeric_fields=(), tag_fields=()):
+    """VECTOR_BACKEND에 맞는 인덱스 생성"""
+    if _vector_backend() == "pgvector":
+        from app.services.pgvector_index import PgVectorIndex, get_pgvector_pool
+
+        index_type = os.getenv("PGVECTOR_INDEX_TYPE", "hnsw").lower()
+        default_breadth = "100" if index_type == "hnsw" else "10"
+        return PgVectorIndex(
+            get_pgvector_pool(),
+            table,
+            index_type=index_type,
+            search_breadth=int(os.getenv("PGVECTOR_SEARCH_BREADTH", default_breadth)),
+            numeric_fields=numeric_fields,
+            tag_fields=tag_fields
+        )
+
+    return VectorIndex(
+        nprobe=int(os.getenv("VECTOR_INDEX_NPROBE", "8")),
+        exact_threshold=int(os.getenv("VECTOR_INDEX_EXACT_THRESHOLD", "4096")),
+        numeric_fields=numeric_fields,
+        tag_fields=tag_fields
+    )
+
+
+def get_job_index():
+    """채용 공고 인덱스 싱글톤 (VectorIndex 또는 PgVectorIndex)"""
+    global _job_index
+    if _job_index is None:
+        _job_index = _create_index("ai_job_embeddings")
+    return _job_index
+
+
+def get_candidate_index():
+    """구직자 인덱스 싱글톤 (userId 기준, 경력/희망 직무/기술 필터 지원)"""
+    global _candidate_index
+    if _candidate_index is None:
+        _candidate_index = _create_index(
+            "ai_candidate_embeddings",
+            numeric_fields=("experience",),
+            tag_fields=("desiredPosition", "skills")
+        )
+    return _candidate_index
+
+
+def _index_paths() -> List[Tuple[str, VectorIndex, str]]:
+    """(이름, 인덱스, 저장 경로) 목록 (경로가 비어 있지 않은 인메모리 인덱스만, pgvector는 DB가 영속화)"""
+    if _vector_backend() != "memory":
+        return []
+
+    paths = [
+        ("공고", get_job_index(), os.getenv("JOB_INDEX_PATH", "./data/job_index")),
+        ("구직자", get_candidate_index(), os.getenv("CANDIDATE_INDEX_PATH", "./data/candidate_index")),
+    ]
+    return [(name, index, path) for name, index, path in paths if path]
+
+
+def load_indexes():
+    """저장된 인덱스 로드 (JOB_INDEX_PATH / CANDIDATE_INDEX_PATH)"""
+    for name, index, path in _index_paths():
+        if index.load(path):
+            _saved_versions[path] = index.version
+            print(f"[Vector Index] {name} 인덱스 로드 완료: {len(index)}건")
+
+
+def save_indexes():
+    """변경된 인덱스 저장 (JOB_INDEX_PATH / CANDIDATE_INDEX_PATH)"""
+    with _save_lock:
+        for name, index, path in _index_paths():
+            version = index.version
+            if _saved_versions.get(path) == version:
+                continue
+            index.save(path)
+            _saved_versions[path] = version
+            print(f"[Vector Index] {name} 인덱스 저장 완료: {len(index)}건")
+
+
+async def periodic_save_indexes():
+    """INDEX_SAVE_INTERVAL초마다 변경된 인덱스 저장 (비정상 종료 대비)"""
+    interval = float(os.getenv("INDEX_SAVE_INTERVAL", "300"))
+    if interval <= 0:
+        return
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(save_indexes)
+        except Exception as e:
+            print(f"[Vector Index] 인덱스 저장 오류: {e}")
@@ -0,0 +1,300 @@
+"""
+음성 구간 검출 (VAD) 서비스
+스트리밍 면접에서 WebM 오디오 청크를 누적해 발화 끝을 감지하고, 발화 중간의 쉼마다
+부분 STT 구간을 나눠 발화가 끝나기 전에 변환을 시작할 수 있게 함
+
+- MediaRecorder 청크는 첫 청크에만 WebM 헤더가 있으므로, 헤더를 보관해 뒤 청크 앞에 붙여 디코딩
+- 에너지(RMS, dBFS) 기반 VAD: 조용한 구간으로 잡음 수준을 추정하고 그보다 충분히 큰 프레임을 음성으로 판단
+- 쉼(STREAMING_VAD_PARTIAL_SILENCE_MS) → 부분 구간, 긴 침묵(STREAMING_VAD_SILENCE_MS) → 발화 끝
+- 말하기 전에는 최근 STREAMING_VAD_PREROLL_MS만 남기고 오래된 청크를 버려 버퍼/재디코딩 비용을 일정하게 유지
+- 말하는 중에는 완료된 Cluster의 PCM을 보관하고 아직 자라는 마지막 Cluster만 다시 디코딩 (청크당 비용 일정)
+"""
+
+from typing import List, Optional, Tuple
+import io
+import math
+import os
+import wave
+
+import numpy as np
+
+# WebM(EBML) 파일 시작 / Cluster 요소 ID / Cluster 첫 자식 요소(Timecode) ID
+EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"
+WEBM_TIMECODE_ID = 0xE7
+
+# VAD 분석 형식 (Whisper 권장 형식과 동일한 16kHz 모노 16bit)
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = 30
+_SAMPLES_PER_MS = VAD_SAMPLE_RATE // 1000
+
+# 발화 끝으로 볼 침묵 길이 / 부분 STT를 시작할 쉼 길이 / 발화로 인정할 최소 음성 길이 (ms)
+STREAMING_VAD_SILENCE_MS = int(os.getenv("STREAMING_VAD_SILENCE_MS", "700"))
+STREAMING_VAD_PARTIAL_SILENCE_MS = int(os.getenv("STREAMING_VAD_PARTIAL_SILENCE_MS", "300"))
+STREAMING_VAD_MIN_SPEECH_MS = int(os.getenv("STREAMING_VAD_MIN_SPEECH_MS", "150"))
+# 음성 판단 최소 음량(dBFS)과 추정 잡음 대비 여유(dB)
+STREAMING_VAD_THRESHOLD_DB = float(os.getenv("STREAMING_VAD_THRESHOLD_DB", "-45"))
+STREAMING_VAD_NOISE_MARGIN_DB = float(os.getenv("STREAMING_VAD_NOISE_MARGIN_DB", "10"))
+# 한 발화 최대 길이(초) - 넘으면 발화 끝으로 처리 (버퍼 상한)
+STREAMING_VAD_MAX_UTTERANCE_SEC = float(os.getenv("STREAMING_VAD_MAX_UTTERANCE_SEC", "60"))
+# 말하기 전 보관할 오디오 길이(ms) - 발화 시작 직전 소리를 잃지 않을 만큼만 남김
+STREAMING_VAD_PREROLL_MS = int(os.getenv("STREAMING_VAD_PREROLL_MS", "1000"))
+# 부분 구간 앞뒤 여유 (ms)
+_SEGMENT_PAD_MS = 150
+
+
+def ms_to_samples(ms: int) -> int:
+    """밀리초 → VAD 형식 샘플 수"""
+    return ms * _SAMPLES_PER_MS
+
+
+def decode_webm_pcm(data: bytes) -> np.ndarray:
+    """
+    WebM 오디오 → 16kHz 모노 int16 PCM (CPU 작업, pydub/ffmpeg 필요)
+
+    Args:
+        data: WebM 헤더 + 클러스터 데이터
+
+    Returns:
+        PCM 샘플 배열
+    """
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(io.BytesIO(data), format="webm")
+    audio = audio.set_channels(1).set_frame_rate(VAD_SAMPLE_RATE).set_sample_width(2)
+    return np.frombuffer(audio.raw_data, dtype=np.int16)
+
+
+def last_cluster_start(data: bytes, start: int = 0) -> int:
+    """
+    start 이후 마지막 Cluster 시작 위치 (없으면 -1)
+
+    오디오 데이터 안에 우연히 같은 바이트열이 있을 수 있으므로, ID 뒤 크기(EBML 가변 길이 정수)
+    다음에 Timecode 요소가 오는 경우만 Cluster로 인정한다.
+    """
+    position = len(data)
+    while True:
+        position = data.rfind(WEBM_CLUSTER_ID, start, position)
+        if position < 0:
+            return -1
+        size_offset = position + len(WEBM_CLUSTER_ID)
+        if size_offset < len(data) and data[size_offset]:
+            size_length = 9 - data[size_offset].bit_length()
+            timecode_offset = size_offset + size_length
+            if timecode_offset < len(data) and data[timecode_offset] == WEBM_TIMECODE_ID:
+                return position
+
+
+def pcm_to_wav(pcm: np.ndarray) -> io.BytesIO:
+    """16kHz 모노 int16 PCM → WAV (ffmpeg 불필요)"""
+    wav_io = io.BytesIO()
+    with wave.open(wav_io, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(VAD_SAMPLE_RATE)
+        wav.writeframes(pcm.astype(np.int16).tobytes())
+    wav_io.seek(0)
+    return wav_io
+
+
+class WebmChunkBuffer:
+    """
+    현재 발화의 WebM 청크 버퍼
+
+    스트림 첫 청크에서 헤더(EBML ~ 첫 Cluster 직전)를 떼어 보관하고,
+    발화가 끝나 버퍼를 비운 뒤에도 다음 발화 청크 앞에 붙여 단독 디코딩이 가능하게 한다.
+
+    decode_pcm은 마지막 Cluster 앞까지(더 이상 바뀌지 않는 부분)의 PCM을 보관해 두고
+    그 뒤만 새로 디코딩하므로, 발화가 길어져도 청크마다 전체를 다시 디코딩하지 않는다.
+    """
+
+    def __init__(self):
+        self.header: Optional[bytes] = None
+        self.chunks: List[bytes] = []
+        # 디코딩을 마친 앞부분 (청크를 이은 데이터 기준 바이트 수) 및 그 PCM
+        self._decoded_bytes = 0
+        self._decoded_pcm = np.zeros(0, dtype=np.int16)
+
+    @staticmethod
+    def starts_stream(chunk: bytes) -> bool:
+        """새 녹음 스트림의 첫 청크(WebM 헤더 포함) 여부"""
+        return chunk.startswith(EBML_MAGIC)
+
+    def append(self, chunk: bytes):
+        """청크 추가 (새 스트림이면 헤더 교체)"""
+        if self.starts_stream(chunk):
+            cluster = chunk.find(WEBM_CLUSTER_ID)
+            self._forget_decoded()
+            if cluster < 0:
+                # 헤더만 있는 청크
+                self.header = chunk
+                return
+            self.header = chunk[:cluster]
+            chunk = chunk[cluster:]
+        self.chunks.append(chunk)
+
+    @property
+    def has_audio(self) -> bool:
+        return bool(self.chunks)
+
+    def data(self) -> bytes:
+        """디코딩할 WebM 데이터 (헤더 + 청크)"""
+        return (self.header or b"") + b"".join(self.chunks)
+
+    def decode_pcm(self) -> np.ndarray:
+        """
+        버퍼 전체 PCM (CPU 작업, pydub/ffmpeg 필요)
+
+        마지막 Cluster는 청크가 더 붙을 수 있으므로 매번 다시 디코딩하고, 그 앞의 완료된 Cluster들은
+        한 번만 디코딩해 보관한다. Cluster마다 새로 디코딩을 시작하므로 경계의 몇 ms는 전체를
+        한 번에 디코딩한 결과와 미세하게 다를 수 있다 (길이는 같음).
+
+        Returns:
+            16kHz 모노 int16 PCM
+        """
+        header = self.header or b""
+        body = b"".join(self.chunks)
+
+        last = last_cluster_start(body, self._decoded_bytes + 1)
+        if last > self._decoded_bytes:
+            try:
+                done = decode_webm_pcm(header + body[self._decoded_bytes:last])
+            except Exception as e:
+                # 앞부분만으로는 디코딩되지 않음 (발화 첫 청크가 Cluster 중간 등) - 다음 Cluster에서 다시 시도
+                print(f"[VAD] 완료 구간 디코딩 실패, 전체 디코딩 유지: {e}")
+            else:
+                self._decoded_pcm = np.concatenate([self._decoded_pcm, done])
+                self._decoded_bytes = last
+
+        tail = decode_webm_pcm(header + body[self._decoded_bytes:])
+        return np.concatenate([self._decoded_pcm, tail])
+
+    def _forget_decoded(self):
+        """보관한 PCM 버리기 (앞 청크를 버리거나 스트림이 바뀌어 바이트 위치가 달라질 때)"""
+        self._decoded_bytes = 0
+        self._decoded_pcm = np.zeros(0, dtype=np.int16)
+
+    def trim_preroll(self, duration_ms: int, keep_ms: int = STREAMING_VAD_PREROLL_MS) -> bool:
+        """
+        말하기 전 오래된 청크 버리기
+
+        청크별 길이는 알 수 없으므로 평균 길이(전체 길이 / 청크 수)로 keep_ms만큼의 청크를 남긴다.
+
+        Args:
+            duration_ms: 현재 버퍼를 디코딩한 길이
+
+        Returns:
+            버린 청크가 있으면 True
+        """
+        if duration_ms <= keep_ms or len(self.chunks) <= 1:
+            return False
+        keep = max(1, math.ceil(keep_ms * len(self.chunks) / duration_ms))
+        if keep >= len(self.chunks):
+            return False
+        self.chunks = self.chunks[-keep:]
+        self._forget_decoded()
+        return True
+
+    def reset(self, keep_last: bool = True):
+        """
+        발화 종료 후 버퍼 비우기
+
+        Args:
+            keep_last: 마지막 청크를 남김 (발화 끝 침묵 뒤에 이어진 다음 발화 시작을 잃지 않도록)
+        """
+        self.chunks = self.chunks[-1:] if keep_last else []
+        self._forget_decoded()
+
+
+class EndpointDetector:
+    """
+    발화 1건의 PCM을 받아 부분 STT 구간과 발화 끝을 판단
+
+    feed에는 매번 발화 시작부터의 전체 PCM을 넘기며, 이전에 분석한 이후의 프레임만 분석한다.
+
+    Events:
+        ("partial", 시작 ms, 끝 ms): 쉼이 감지되어 먼저 변환할 수 있는 구간
+        ("end", 시작 ms, 끝 ms): 발화 끝 - 아직 변환하지 않은 나머지 구간
+    """
+
+    def __init__(self):
+        self._analyzed_frames = 0
+        self._noise_db: Optional[float] = None
+        self._speech_run_ms = 0
+        self.speech_started = False
+        self.speech_start_ms = 0
+        self.speech_end_ms = 0
+        self.silence_ms = 0
+        self.committed_ms = 0
+        self.ended = False
+
+    def feed(self, pcm: np.ndarray) -> List[Tuple[str, int, int]]:
+        """새로 들어온 프레임 분석 후 이벤트 반환"""
+        events = []
+        frame_samples = ms_to_samples(VAD_FRAME_MS)
+        total_frames = len(pcm) // frame_samples
+
+        while self._analyzed_frames < total_frames and not self.ended:
+            start = self._analyzed_frames * frame_samples
+            frame = pcm[start:start + frame_samples].astype(np.float32)
+            self._analyzed_frames += 1
+            frame_end_ms = self._analyzed_frames * VAD_FRAME_MS
+
+            rms = float(np.sqrt(np.mean(frame * frame)))
+            level_db = 20 * np.log10(rms / 32768.0 + 1e-10)
+
+            threshold = STREAMING_VAD_THRESHOLD_DB
+            if self._noise_db is not None:
+                threshold = max(threshold, self._noise_db + STREAMING_VAD_NOISE_MARGIN_DB)
+
+            if level_db > threshold:
+                self._speech_run_ms += VAD_FRAME_MS
+                self.silence_ms = 0
+                self.speech_end_ms = frame_end_ms
+                if not self.speech_started and self._speech_run_ms >= STREAMING_VAD_MIN_SPEECH_MS:
+                    self.speech_started = True
+                    self.speech_start_ms = frame_end_ms - self._speech_run_ms
+                    self.committed_ms = max(0, self.speech_start_ms - _SEGMENT_PAD_MS)
+            else:
+                # 조용한 프레임으로 잡음 수준 추정 (지수 이동 평균)
+                self._noise_db = level_db if self._noise_db is None else 0.95 * self._noise_db + 0.05 * level_db
+                self._speech_run_ms = 0
+                self.silence_ms += VAD_FRAME_MS
+
+            # 최대 길이는 말하기 전에도 적용 (음성 없이 버퍼만 커지지 않도록)
+            if frame_end_ms >= STREAMING_VAD_MAX_UTTERANCE_SEC * 1000:
+                events.append(self.finish())
+            elif not self.speech_started:
+                continue
+            elif self.silence_ms >= STREAMING_VAD_SILENCE_MS:
+                events.append(self.finish())
+            elif self.silence_ms == self._round_to_frame(STREAMING_VAD_PARTIAL_SILENCE_MS):
+                segment_end = self.speech_end_ms + _SEGMENT_PAD_MS
+                if segment_end - self.committed_ms >= STREAMING_VAD_MIN_SPEECH_MS:
+                    events.append(("partial", self.committed_ms, segment_end))
+                    self.committed_ms = segment_end
+
+        return events
+
+    @property
+    def waiting_for_speech(self) -> bool:
+        """말하기 전이고 마지막 프레임이 침묵 (앞부분 오디오를 버려도 되는 상태)"""
+        return not self.speech_started and not self.ended and self._speech_run_ms == 0
+
+    def restart(self):
+        """앞부분 오디오를 버린 버퍼를 처음부터 다시 분석 (추정한 잡음 수준은 유지)"""
+        self._analyzed_frames = 0
+        self._speech_run_ms = 0
+        self.speech_end_ms = 0
+        self.silence_ms = 0
+        self.committed_ms = 0
+
+    def finish(self) -> Tuple[str, int, int]:
+        """발화 끝 처리 (침묵/최대 길이/유휴 시간/클라이언트 신호) → 나머지 구간"""
+        self.ended = True
+        return ("end", self.committed_ms, max(self.committed_ms, self.speech_end_ms + _SEGMENT_PAD_MS))
+
+    @staticmethod
+    def _round_to_frame(ms: int) -> int:
+        """프레임 단위로 올림 (침묵 길이 비교용)"""
+        return -(-ms // VAD_FRAME_MS) * VAD_FRAME_MS
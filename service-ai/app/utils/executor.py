@@ -0,0 +1,56 @@
+"""
+작업 스레드 풀 유틸리티
+임베딩 인코딩, 오디오 변환처럼 이벤트 루프를 막는 작업을 전용 스레드 풀에서 실행
+
+- 스레드 수는 CPU_WORKERS로 제한 (기본: min(4, CPU 코어 수))
+- asyncio 기본 스레드 풀과 분리해 다른 to_thread 작업과 경쟁하지 않음
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import asyncio
+import functools
+import os
+import threading
+
+# 전역 스레드 풀 (한 번만 생성)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    """CPU 작업용 스레드 풀 싱글톤"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.getenv("CPU_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cpu-worker")
+            print(f"[Executor] CPU 작업 스레드 풀 초기화: {workers}개")
+        return _executor
+
+
+async def run_cpu_bound(func: Callable, *args, **kwargs) -> Any:
+    """
+    동기 함수를 CPU 작업 스레드 풀에서 실행하고 결과를 기다림
+
+    Args:
+        func: 실행할 동기 함수
+        *args, **kwargs: 함수 인자
+
+    Returns:
+        함수 반환값
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_cpu_executor(),
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+def shutdown_cpu_executor():
+    """스레드 풀 종료 (서버 종료 시)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
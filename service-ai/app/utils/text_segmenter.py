@@ -0,0 +1,93 @@
+"""
+문장 분할 유틸리티
+LLM 스트리밍 토큰을 문장 단위로 끊어 TTS에 바로 넘기기 위한 점진적 분할기
+
+- 문장 끝: . ? ! … 。 (연속 부호 포함) 뒤에 공백/줄바꿈이 올 때, 또는 줄바꿈
+- 3.5, v1.2 처럼 부호 뒤에 공백이 없으면 문장 끝으로 보지 않음
+- 너무 짧은 문장("네.")은 다음 문장과 합쳐 TTS 호출 수를 줄임
+- 긴 텍스트는 문장을 글자 수 제한 안에서 묶어 TTS 요청 단위로 나눔 (pack_sentences)
+"""
+
+from typing import List
+import re
+
+# 문장 끝 부호(연속 허용) + 닫는 따옴표/괄호 + 공백, 또는 줄바꿈
+_SENTENCE_END = re.compile(r"[.?!…。]+[\"'”’)\]]*\s+|\n+")
+
+
+def split_sentences(text: str, min_chars: int = 0) -> List[str]:
+    """완성된 텍스트를 문장 단위로 분할"""
+    segmenter = SentenceSegmenter(min_chars=min_chars)
+    return segmenter.feed(text) + segmenter.flush()
+
+
+def pack_sentences(sentences: List[str], max_chars: int, first_chars: int = 0) -> List[str]:
+    """
+    문장을 글자 수 제한 안에서 묶어 구간으로 만듦
+
+    Args:
+        sentences: 문장 리스트
+        max_chars: 구간 최대 글자 수 (이보다 긴 문장은 공백 기준으로 자름)
+        first_chars: 첫 구간 최대 글자 수 (작게 주면 첫 구간 합성이 빨리 끝남, 0이면 max_chars)
+
+    Returns:
+        구간 리스트 (원래 순서 유지)
+    """
+    pieces = []
+    for sentence in sentences:
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars + 1)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+
+    packed: List[str] = []
+    current = ""
+    for piece in pieces:
+        limit = (first_chars or max_chars) if not packed else max_chars
+        if current and len(current) + 1 + len(piece) > limit:
+            packed.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        packed.append(current)
+    return packed
+
+
+class SentenceSegmenter:
+    """
+    스트리밍 텍스트 → 완성된 문장
+
+    Args:
+        min_chars: 이보다 짧은 문장은 다음 문장과 합쳐서 내보냄
+    """
+
+    def __init__(self, min_chars: int = 0):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """텍스트 조각 추가 후 새로 완성된 문장 반환"""
+        self._buffer += text
+        sentences = []
+
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            sentence = self._buffer[start:match.end()].strip()
+            if len(sentence) < self.min_chars:
+                continue
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """남은 텍스트를 마지막 문장으로 반환"""
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return [rest] if rest else []
@@ -0,0 +1,57 @@
+"""
+토큰 예산 유틸리티
+여러 항목을 한 번의 GPT 요청으로 묶을 때 토큰 수를 추정하고 예산 단위로 분할
+
+- 토크나이저 의존성 없이 문자 종류별 근사치로 추정 (한글은 글자당 약 1토큰, 그 외는 4글자당 약 1토큰)
+- 실제 토큰 수보다 약간 크게 추정되도록 잡아 컨텍스트 초과를 피함
+"""
+
+from typing import Callable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트의 대략적인 토큰 수"""
+    if not text:
+        return 0
+
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣" or "ㄱ" <= ch <= "ㆎ")
+    others = len(text) - hangul
+    return hangul + (others + 3) // 4
+
+
+def chunk_by_token_budget(
+    items: Sequence[T],
+    budget: int,
+    cost: Callable[[T], int]
+) -> List[List[T]]:
+    """
+    순서를 유지하며 항목들을 토큰 예산 이하의 묶음으로 분할
+
+    예산보다 큰 항목은 단독 묶음으로 보낸다.
+
+    Args:
+        items: 분할할 항목
+        budget: 묶음당 최대 토큰 수
+        cost: 항목별 토큰 수 계산 함수
+
+    Returns:
+        항목 묶음 리스트
+    """
+    chunks: List[List[T]] = []
+    current: List[T] = []
+    used = 0
+
+    for item in items:
+        tokens = cost(item)
+        if current and used + tokens > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += tokens
+
+    if current:
+        chunks.append(current)
+
+    return chunks
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+service-ai 동시 처리량 부하 테스트
+동시 요청 수를 늘려 가며 처리량(req/s)과 지연 시간(p50/p95/p99)을 측정한다.
+
+이벤트 루프가 막히지 않으면 OpenAI 지연이 겹쳐 처리되므로
+동시성에 비례해 처리량이 늘고 지연 시간은 거의 그대로 유지된다.
+
+사용법:
+    # 1) OpenAI 목 서버 (실제 API 비용 없이 측정)
+    python benchmarks/mock_openai.py --port 9100 --latency 0.5
+    # 2) 서버 실행
+    OPENAI_BASE_URL=http://127.0.0.1:9100/v1 uvicorn app.main:app --port 8000
+    # 3) 부하 테스트
+    python benchmarks/load_test.py --scenario instant-feedback --concurrency 1,4,16,32
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+# 시나리오: (메서드, 경로, 요청 본문)
+SCENARIOS = {
+    "instant-feedback": (
+        "POST",
+        "/internal/ai/instant-feedback",
+        {
+            "question": "가장 어려웠던 프로젝트 경험에 대해 말씀해주세요.",
+            "answer": "결제 시스템 장애 대응 중 캐시 계층을 재설계해 응답 시간을 절반으로 줄였습니다.",
+            "questionType": "competency",
+        },
+    ),
+    "generate-question": (
+        "POST",
+        "/internal/ai/generate-question",
+        {"isFirstQuestion": True},
+    ),
+    "recommend-jobs": (
+        "POST",
+        "/internal/ai/recommend-jobs",
+        {
+            "candidateProfile": {
+                "userId": "load-test",
+                "skills": ["Python", "FastAPI"],
+                "experience": 3,
+                "desiredPosition": "IT개발",
+            },
+            "jobPostings": [
+                {
+                    "id": f"job-{i}",
+                    "title": f"백엔드 개발자 {i}",
+                    "description": "Python 기반 API 서버 개발",
+                    "position": "IT개발",
+                    "requirements": ["Python", "SQL"],
+                    "experienceMin": i % 5,
+                }
+                for i in range(20)
+            ],
+            "topK": 5,
+            "deferReasons": True,
+        },
+    ),
+    "health": ("GET", "/health/live", None),
+}
+
+
+async def run_level(client: httpx.AsyncClient, scenario: str, concurrency: int, requests: int) -> dict:
+    """동시성 concurrency로 requests건 요청 후 통계 반환"""
+    method, path, body = SCENARIOS[scenario]
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "throughput": requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="service-ai 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="instant-feedback")
+    parser.add_argument("--concurrency", default="1,4,16,32", help="쉼표로 구분한 동시 요청 수 목록")
+    parser.add_argument("--requests-per-worker", type=int, default=4, help="동시성 단계별 요청 수 = 동시성 x 이 값")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120, limits=limits) as client:
+        # 워밍업 (모델 로딩 등 첫 요청 비용 제외)
+        await run_level(client, args.scenario, 1, 1)
+
+        print(f"scenario={args.scenario} base_url={args.base_url}")
+        print(f"{'conc':>5} {'reqs':>5} {'err':>4} {'req/s':>8} {'p50(s)':>8} {'p95(s)':>8} {'p99(s)':>8}")
+        for level in levels:
+            result = await run_level(client, args.scenario, level, level * args.requests_per_worker)
+            print(
+                f"{result['concurrency']:>5} {result['requests']:>5} {result['errors']:>4} "
+                f"{result['throughput']:>8.2f} {result['p50']:>8.3f} {result['p95']:>8.3f} {result['p99']:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
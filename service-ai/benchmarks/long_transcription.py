@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+긴 오디오 분할 병렬 변환 측정
+면접 전체 녹음 길이의 합성 오디오를 침묵 구간에서 나눠 동시 변환 수별 소요 시간을 비교하고,
+이어 붙인 문장이 빠짐/중복 없이 원래 순서와 같은지 확인한다.
+
+합성 오디오는 "문장"마다 음량이 다른 톤과 쉼으로 이루어지며, 가짜 Whisper는 업로드된 WAV에서
+음성 구간을 찾아 음량으로 문장 번호를 복원하고 오디오 길이에 비례해 지연한다. (API 키, ffmpeg 불필요)
+
+사용법:
+    python benchmarks/long_transcription.py --minutes 30 --concurrency 1,4,8
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ["STT_LONG_SEGMENT_FORMAT"] = "wav"
+
+from app.services import long_transcription  # noqa: E402
+from app.services.long_transcription import frame_levels_db  # noqa: E402
+from app.services.voice_activity import VAD_FRAME_MS, VAD_SAMPLE_RATE  # noqa: E402
+
+SENTENCE_SEC = 4.0
+PAUSE_SEC = 0.8
+LEVEL_STEP = 30
+
+
+def synthesize(minutes: float) -> tuple:
+    """문장 i = 진폭 (i % 1000 + 10) * LEVEL_STEP 의 톤"""
+    rng = np.random.default_rng(0)
+    parts, count = [], 0
+    total = int(minutes * 60 * VAD_SAMPLE_RATE)
+    t = np.arange(int(SENTENCE_SEC * VAD_SAMPLE_RATE))
+    length = 0
+    while length < total:
+        tone = ((count % 1000 + 10) * LEVEL_STEP * np.sign(np.sin(2 * np.pi * 200 * t / VAD_SAMPLE_RATE))).astype(np.int16)
+        pause = (rng.standard_normal(int(PAUSE_SEC * VAD_SAMPLE_RATE)) * 5).astype(np.int16)
+        parts += [tone, pause]
+        length += len(tone) + len(pause)
+        count += 1
+    return np.concatenate(parts), count
+
+
+def fake_whisper(seconds_per_audio_minute: float, base_latency: float):
+    async def create(file, **kwargs):
+        with wave.open(io.BytesIO(file[1])) as wav:
+            pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        duration = len(pcm) / VAD_SAMPLE_RATE
+        await asyncio.sleep(base_latency + duration / 60 * seconds_per_audio_minute)
+
+        # 음성 프레임 연속 구간 → 세그먼트 (음량으로 문장 번호 복원)
+        frame = VAD_SAMPLE_RATE * VAD_FRAME_MS // 1000
+        voiced = frame_levels_db(pcm) > -60
+        segments, start = [], None
+        for index, is_voiced in enumerate(np.append(voiced, False)):
+            if is_voiced and start is None:
+                start = index
+            elif not is_voiced and start is not None:
+                amplitude = np.abs(pcm[start * frame:index * frame]).max()
+                segments.append({
+                    "start": start * VAD_FRAME_MS / 1000,
+                    "end": index * VAD_FRAME_MS / 1000,
+                    "text": f"s{int(round(amplitude / LEVEL_STEP)) - 10}",
+                })
+                start = None
+        return SimpleNamespace(text=" ".join(s["text"] for s in segments), segments=segments)
+    return create
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="긴 오디오 분할 병렬 변환 측정")
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--concurrency", default="1,4,8")
+    parser.add_argument("--whisper-speed", type=float, default=1.0, help="오디오 1분당 Whisper 처리 시간 (초)")
+    parser.add_argument("--whisper-base", type=float, default=0.5, help="요청당 고정 지연 (초)")
+    args = parser.parse_args()
+
+    pcm, sentences = synthesize(args.minutes)
+    long_transcription.client.audio.transcriptions.create = fake_whisper(args.whisper_speed, args.whisper_base)
+    expected = [f"s{i % 1000}" for i in range(sentences)]
+
+    print(f"audio: {len(pcm) / VAD_SAMPLE_RATE / 60:.1f} min, {sentences} sentences")
+    print(f"{'concurrency':>11} {'chunks':>7} {'elapsed(s)':>11} {'stitched ok':>12}")
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        long_transcription._segment_semaphore = asyncio.Semaphore(concurrency)
+        started = time.perf_counter()
+        result = await long_transcription.transcribe_long_audio(pcm)
+        elapsed = time.perf_counter() - started
+        stitched = [segment["text"] for segment in result["segments"]]
+        print(f"{concurrency:>11} {result['chunks']:>7} {elapsed:>11.2f} {str(stitched == expected):>12}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
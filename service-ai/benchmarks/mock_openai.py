@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+OpenAI API 목(mock) 서버 (부하 테스트용)
+chat.completions 요청에 고정 지연 후 JSON 응답을 돌려준다.
+
+사용법:
+    python benchmarks/mock_openai.py --port 9100 --latency 0.5
+    OPENAI_BASE_URL=http://127.0.0.1:9100/v1 uvicorn app.main:app --port 8000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI, Request
+import uvicorn
+
+app = FastAPI()
+LATENCY = 0.5
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    """고정 지연 후 JSON 형식 응답 (response_format 요청 여부와 무관)"""
+    body = await request.json()
+    await asyncio.sleep(LATENCY)
+
+    content = json.dumps({
+        "feedback": "구체적인 경험을 잘 설명해주셨습니다.",
+        "strengths": ["명확한 설명"],
+        "improvements": ["결과 수치 보강"],
+        "score": 80,
+        "technical_score": 7,
+        "communication_score": 8,
+        "problem_solving_score": 7,
+        "keywords": [],
+        "depth_level": "보통",
+        "reasoning": "mock",
+    }, ensure_ascii=False)
+
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI API 목 서버")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.5, help="응답 지연 (초)")
+    args = parser.parse_args()
+
+    LATENCY = args.latency
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+스트리밍 면접 첫 오디오 지연 측정
+순차 모드(질문 전체 생성 → TTS)와 파이프라인 모드(문장 단위 TTS)의
+답변 인식 후 첫 오디오 청크까지 걸리는 시간을 비교한다.
+
+LLM/TTS는 지연 모델을 가진 가짜 클라이언트로 대체하므로 API 키 없이 실행된다.
+
+사용법:
+    python benchmarks/streaming_latency.py --token-delay 0.03 --tts-ttfb 0.3 --runs 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("ELEVENLABS_API_KEY", "benchmark")
+# 반복 실행 시 캐시된 음성이 재사용되지 않도록 TTS 캐시 비활성화
+os.environ["TTS_CACHE_ENABLED"] = "false"
+
+from app.api import streaming_interview  # noqa: E402
+
+QUESTION = (
+    "말씀해주신 결제 시스템 장애 대응 경험이 인상적이네요. "
+    "당시 캐시 계층을 재설계하면서 가장 고민했던 트레이드오프는 무엇이었나요? "
+    "그 결정을 팀에 어떻게 설득하셨는지도 구체적으로 말씀해주세요."
+)
+
+
+class FakeWebSocket:
+    """전송 메시지와 시각만 기록"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.messages = []
+
+    async def send_json(self, message):
+        self.messages.append((time.perf_counter() - self.started, message))
+
+
+def fake_llm(token_delay: float, token_chars: int):
+    async def create(**kwargs):
+        async def stream():
+            for i in range(0, len(QUESTION), token_chars):
+                await asyncio.sleep(token_delay)
+                delta = SimpleNamespace(content=QUESTION[i:i + token_chars])
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+        return stream()
+    return create
+
+
+def fake_tts(ttfb: float, chars_per_second: float):
+    async def convert_as_stream(voice_id, text, **kwargs):
+        # 첫 바이트 지연 후 텍스트 길이에 비례해 4개 청크로 나눠 전송
+        await asyncio.sleep(ttfb)
+        for _ in range(4):
+            await asyncio.sleep(len(text) / chars_per_second / 4)
+            yield b"\x00" * 1024
+    return convert_as_stream
+
+
+async def run_once(pipelined: bool) -> tuple:
+    streaming_interview.STREAMING_INTERVIEW_PIPELINED = pipelined
+    websocket = FakeWebSocket()
+    pipeline = streaming_interview.StreamingInterviewPipeline(websocket)
+    pipeline._turn_started = time.perf_counter()
+    websocket.started = pipeline._turn_started
+
+    if pipelined:
+        await pipeline.generate_and_speak("결제 시스템 캐시 계층을 재설계했습니다.")
+    else:
+        question = await pipeline.generate_next_question("결제 시스템 캐시 계층을 재설계했습니다.")
+        await pipeline.speak_question(question)
+
+    first_audio = next(t for t, m in websocket.messages if m["type"] == "ai_audio_chunk")
+    total = websocket.messages[-1][0]
+    return first_audio, total
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="스트리밍 면접 첫 오디오 지연 측정")
+    parser.add_argument("--token-delay", type=float, default=0.03, help="LLM 토큰 간격 (초)")
+    parser.add_argument("--token-chars", type=int, default=3, help="토큰당 글자 수")
+    parser.add_argument("--tts-ttfb", type=float, default=0.3, help="TTS 첫 바이트 지연 (초)")
+    parser.add_argument("--tts-speed", type=float, default=400, help="TTS 합성 속도 (글자/초)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    streaming_interview.openai_client.chat.completions.create = fake_llm(args.token_delay, args.token_chars)
+    streaming_interview.elevenlabs_client.text_to_speech.convert_as_stream = fake_tts(args.tts_ttfb, args.tts_speed)
+
+    print(f"{'mode':>11} {'first audio(s)':>15} {'total(s)':>9}")
+    for pipelined in (False, True):
+        results = [await run_once(pipelined) for _ in range(args.runs)]
+        mode = "pipelined" if pipelined else "sequential"
+        print(
+            f"{mode:>11} {statistics.median(r[0] for r in results):>15.3f} "
+            f"{statistics.median(r[1] for r in results):>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+STT 업로드 변환 비교
+기존 방식(WebM → WAV 재인코딩 후 업로드)과 변환 정책(지원 형식은 원본 그대로)의
+업로드 바이트와 답변 1건의 STT 지연(변환 + 업로드 + 인식)을 비교한다.
+
+Whisper 호출은 업로드 대역폭과 서버 처리 시간을 모델링한 가짜 클라이언트로 대체하므로
+API 키 없이 실행된다. (--input 없이 실행하면 합성 음성을 만들기 위해 ffmpeg 필요)
+
+사용법:
+    python benchmarks/stt_transcoding.py --input answer.webm --uplink-mbps 5 --concurrency 1,8
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.audio_transcoding import prepare_for_transcription  # noqa: E402
+from app.utils.executor import run_cpu_bound  # noqa: E402
+
+
+def synthesize_answer(seconds: float) -> bytes:
+    """테스트용 음성 대역 합성음 → WebM/Opus (MediaRecorder 출력과 같은 형식)"""
+    from pydub import AudioSegment
+    from pydub.generators import Sine
+
+    audio = AudioSegment.silent(duration=0, frame_rate=48000)
+    for i in range(int(seconds * 2)):
+        audio += Sine(180 + (i % 7) * 40).to_audio_segment(duration=350).apply_gain(-12)
+        audio += AudioSegment.silent(duration=150, frame_rate=48000)
+    output = io.BytesIO()
+    audio.set_channels(1).export(output, format="webm", codec="libopus", bitrate="32k")
+    return output.getvalue()
+
+
+def legacy_webm_to_wav(audio_data: bytes) -> bytes:
+    """기존 streaming_interview 변환 (WebM → 무압축 WAV)"""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(io.BytesIO(audio_data), format="webm")
+    wav_io = io.BytesIO()
+    audio.export(wav_io, format="wav")
+    return wav_io.getvalue()
+
+
+async def fake_whisper(size: int, uplink_bps: float, server_latency: float):
+    """업로드 시간(크기/대역폭) + 서버 처리 시간"""
+    await asyncio.sleep(size * 8 / uplink_bps + server_latency)
+
+
+async def run_once(mode: str, audio: bytes, uplink_bps: float, server_latency: float) -> tuple:
+    started = time.perf_counter()
+    if mode == "legacy":
+        payload = await run_cpu_bound(legacy_webm_to_wav, audio)
+    else:
+        _, payload, _ = await prepare_for_transcription(audio, policy=mode)
+    prepared = time.perf_counter()
+    await fake_whisper(len(payload), uplink_bps, server_latency)
+    return len(payload), prepared - started, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="STT 업로드 변환 비교")
+    parser.add_argument("--input", help="WebM 등 오디오 파일 (없으면 합성음 사용)")
+    parser.add_argument("--seconds", type=float, default=20, help="합성음 길이 (초)")
+    parser.add_argument("--uplink-mbps", type=float, default=5, help="Whisper 업로드 대역폭 (Mbps)")
+    parser.add_argument("--server-latency", type=float, default=0.8, help="Whisper 처리 시간 (초)")
+    parser.add_argument("--concurrency", default="1,8", help="동시 답변 수 목록")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, "rb") as f:
+            audio = f.read()
+    else:
+        audio = synthesize_answer(args.seconds)
+    uplink_bps = args.uplink_mbps * 1_000_000
+    print(f"input: {len(audio) / 1024:.1f} KB")
+
+    print(f"{'mode':>8} {'conc':>5} {'upload(KB)':>11} {'prepare(ms)':>12} {'stt p50(s)':>11}")
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        for mode in ("legacy", "auto", "always"):
+            results = []
+            for _ in range(args.runs):
+                results += await asyncio.gather(*(
+                    run_once(mode, audio, uplink_bps, args.server_latency) for _ in range(concurrency)
+                ))
+            print(
+                f"{mode:>8} {concurrency:>5} {results[0][0] / 1024:>11.1f} "
+                f"{statistics.median(r[1] for r in results) * 1000:>12.1f} "
+                f"{statistics.median(r[2] for r in results):>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+STT 업로드 경로 비교
+기존 방식(업로드 전체 읽기 → NamedTemporaryFile 저장 → 다시 열어 전송)과
+스풀 파일을 Whisper 요청으로 바로 스트리밍하는 방식의 지연 시간과 디스크 쓰기량을 비교한다.
+
+Whisper 호출은 전달받은 파일을 끝까지 읽기만 하는 가짜 클라이언트로 대체하므로
+API 키 없이 실행된다. (디스크 쓰기량은 Linux /proc 기반 psutil io_counters 사용)
+
+사용법:
+    python benchmarks/stt_upload.py --sizes 1,5,10,25 --runs 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import httpx
+import psutil
+from fastapi import FastAPI, File, UploadFile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from app.api import stt  # noqa: E402
+
+READ_CHUNK = 64 * 1024
+
+
+async def fake_transcriptions_create(file, **kwargs):
+    """업로드를 흉내 내 파일 내용을 끝까지 읽음"""
+    _, body, _ = file if isinstance(file, tuple) else (None, file, None)
+    while body.read(READ_CHUNK):
+        await asyncio.sleep(0)
+    return SimpleNamespace(text="벤치마크")
+
+
+def build_app() -> FastAPI:
+    stt.configure_upload_spool()
+    app = FastAPI()
+    app.include_router(stt.router, prefix="/stt")
+
+    @app.post("/legacy/transcribe")
+    async def legacy_transcribe(audio: UploadFile = File(...)):
+        # 기존 구현: 전체 읽기 → 임시 파일 저장 → 다시 열어 전송 → 삭제
+        content = await audio.read()
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as temp_audio:
+            temp_audio.write(content)
+            temp_audio_path = temp_audio.name
+        with open(temp_audio_path, "rb") as audio_file:
+            transcription = await stt.client.audio.transcriptions.create(model="whisper-1", file=audio_file)
+        os.unlink(temp_audio_path)
+        return {"text": transcription.text}
+
+    return app
+
+
+def disk_write_bytes() -> int:
+    try:
+        return psutil.Process().io_counters().write_bytes
+    except (AttributeError, psutil.Error):
+        return 0
+
+
+async def measure(client: httpx.AsyncClient, path: str, payload: bytes, runs: int) -> tuple:
+    latencies = []
+    written = disk_write_bytes()
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = await client.post(path, files={"audio": ("answer.webm", payload, "audio/webm")})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    os.sync()
+    return statistics.median(latencies), (disk_write_bytes() - written) / runs
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="STT 업로드 경로 비교")
+    parser.add_argument("--sizes", default="1,5,10,25", help="업로드 크기 목록 (MB)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    stt.client.audio.transcriptions.create = fake_transcriptions_create
+    transport = httpx.ASGITransport(app=build_app())
+
+    print(f"spool in memory up to {stt.STT_SPOOL_MAX_MEMORY / 1024 / 1024:.0f} MB")
+    print(f"{'size(MB)':>8} {'mode':>8} {'p50(ms)':>9} {'disk write(MB)':>15}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for size_mb in (float(s) for s in args.sizes.split(",")):
+            payload = os.urandom(int(size_mb * 1024 * 1024))
+            for mode, path in (("legacy", "/legacy/transcribe"), ("spooled", "/stt/transcribe")):
+                latency, written = await measure(client, path, payload, args.runs)
+                print(f"{size_mb:>8.0f} {mode:>8} {latency * 1000:>9.1f} {written / 1024 / 1024:>15.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""
+매칭 점수 일괄 계산 / 쌍별 계산 일치 테스트
+
+calculate_matching_scores_batch는 calculate_matching_score의 벡터화 버전이므로
+경력 필드가 없거나 None인 프로필을 포함해 같은 점수를 내야 한다.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.services.embedding_service import (
+    COMPETENCY_KEYS,
+    POSITION_WEIGHTS,
+    calculate_matching_score,
+    calculate_matching_scores_batch,
+)
+
+DIM = 32
+SKILLS = ["Python", "Java", "SQL", "React", "Docker", "AWS", "Excel", "영업"]
+POSITIONS = list(POSITION_WEIGHTS) + ["디자인", None]
+# 경력 값 후보 - MISSING은 키 자체가 없는 경우
+MISSING = object()
+EXPERIENCE_VALUES = [MISSING, None, 0, 1, 3, 5, 7.5, 10, 20]
+
+
+def _maybe_set(target: dict, key: str, value):
+    if value is not MISSING:
+        target[key] = value
+
+
+def _random_candidate(rng: random.Random) -> dict:
+    candidate = {"skills": rng.sample(SKILLS, rng.randint(0, 4))}
+    _maybe_set(candidate, "experience", rng.choice(EXPERIENCE_VALUES))
+    if rng.random() < 0.5:
+        candidate["evaluation"] = {key: rng.uniform(0, 100) for key in COMPETENCY_KEYS}
+    return candidate
+
+
+def _random_job(rng: random.Random) -> dict:
+    job = {
+        "position": rng.choice(POSITIONS),
+        "requirements": rng.sample(SKILLS, rng.randint(0, 3)),
+        "preferredSkills": rng.sample(SKILLS, rng.randint(0, 3)),
+    }
+    _maybe_set(job, "experienceMin", rng.choice(EXPERIENCE_VALUES))
+    _maybe_set(job, "experienceMax", rng.choice(EXPERIENCE_VALUES))
+    return job
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_per_pair_for_one_job(seed):
+    """공고 1개 × 구직자 N명: 일괄 점수 == 쌍별 점수"""
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+
+    job = _random_job(rng)
+    job_embedding = np_rng.normal(size=DIM)
+    candidates = [_random_candidate(rng) for _ in range(200)]
+    matrix = np_rng.normal(size=(len(candidates), DIM))
+
+    batch = calculate_matching_scores_batch(job_embedding, matrix, candidates, job)
+    expected = [
+        calculate_matching_score(row, job_embedding, candidate, job)
+        for row, candidate in zip(matrix, candidates)
+    ]
+
+    assert batch.tolist() == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_per_pair_for_one_candidate(seed):
+    """구직자 1명 × 공고 N개: 일괄 점수 == 쌍별 점수"""
+    rng = random.Random(100 + seed)
+    np_rng = np.random.default_rng(100 + seed)
+
+    candidate = _random_candidate(rng)
+    candidate_embedding = np_rng.normal(size=DIM)
+    jobs = [_random_job(rng) for _ in range(200)]
+    matrix = np_rng.normal(size=(len(jobs), DIM))
+
+    batch = calculate_matching_scores_batch(candidate_embedding, matrix, candidate, jobs)
+    expected = [
+        calculate_matching_score(candidate_embedding, row, candidate, job)
+        for row, job in zip(matrix, jobs)
+    ]
+
+    assert batch.tolist() == expected
+
+
+@pytest.mark.parametrize("experience", [MISSING, None])
+def test_missing_experience_gets_no_bonus(experience):
+    """경력이 None이면 예외 없이 경력 보정 없음 (키가 없으면 0년)"""
+    candidate = {"skills": []}
+    _maybe_set(candidate, "experience", experience)
+    job = {"position": "개발", "experienceMin": 0, "experienceMax": 10}
+    # 직교 벡터 - 기본 점수 50점 (클램핑 없이 보정 차이 확인)
+    candidate_embedding, job_embedding = np.eye(DIM)[0], np.eye(DIM)[1]
+
+    with_experience = calculate_matching_score(
+        candidate_embedding, job_embedding, {"skills": [], "experience": 3}, job
+    )
+    score = calculate_matching_score(candidate_embedding, job_embedding, candidate, job)
+
+    if experience is MISSING:
+        # 키가 없으면 기본값 0년으로 보고 범위 안
+        assert score == with_experience
+    else:
+        assert score == with_experience - 5
@@ -0,0 +1,348 @@
+"""
+PgVectorIndex 테스트
+
+PostgreSQL 없이 돌도록 PgVectorIndex가 실행하는 SQL만 해석하는 메모리 커넥션 풀을 쓴다.
+근사 인덱스 동작(검색 폭만큼의 후보에만 필터 적용)을 흉내 내어, 필터 검색이 k개를 채우는지 확인한다.
+"""
+
+import re
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from app.services.pgvector_index import PgVectorIndex
+from app.services.vector_index import VectorIndex
+
+DIM = 16
+NUMERIC_FIELDS = ("experience",)
+TAG_FIELDS = ("region", "skills")
+CONDITION = re.compile(r'^"(?P<column>[^"]+)" (?P<op>IS NOT NULL|>=|<=|@>|&&)')
+
+
+class _Json:
+    def __init__(self, adapted):
+        self.adapted = adapted
+
+
+def _execute_values(cursor, sql, rows, page_size=100):
+    cursor.insert(sql, rows)
+
+
+class _FakeTable:
+    """테이블 한 개 (key → 컬럼 값)"""
+
+    def __init__(self):
+        self.rows = {}
+
+
+class _FakeCursor:
+    """
+    PgVectorIndex가 쓰는 SQL만 해석하는 커서
+
+    벡터 검색은 인덱스 스캔을 흉내 낸다: 검색 폭(ef_search/probes)만큼의 최근접 후보에만 필터를
+    적용하고, iterative scan이 켜져 있거나 enable_indexscan=off면 전체 행에서 정확 검색한다.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.result = []
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def settings(self):
+        return self.connection.settings
+
+    def execute(self, sql, params=()):
+        params = list(params or ())
+        self.result = []
+
+        if sql.startswith("CREATE"):
+            return
+        if sql.startswith("SELECT extversion"):
+            self.result = [(self.connection.pool.extversion,)]
+            return
+        if sql.startswith("SELECT set_config"):
+            literal = re.match(r"SELECT set_config\('([^']+)', '([^']+)', true\)", sql)
+            name, value = literal.groups() if literal else params
+            self.settings[name] = value
+            self.result = [(value,)]
+            return
+
+        table = self._table(sql)
+        if sql.startswith("SELECT COUNT(*)"):
+            self.result = [(len(table.rows),)]
+        elif sql.startswith("SELECT 1"):
+            self.result = [(1,)] if params[0] in table.rows else []
+        elif sql.startswith("SELECT embedding, metadata"):
+            row = table.rows.get(params[0])
+            self.result = [(row["embedding"], row["metadata"])] if row else []
+        elif sql.startswith("DELETE"):
+            self.rowcount = 1 if table.rows.pop(params[0], None) is not None else 0
+        elif sql.startswith("SELECT key, 1 - (embedding <=> %s)"):
+            self.result = self._search(table, sql, params)
+        else:
+            raise AssertionError(f"unexpected SQL: {sql}")
+
+    def insert(self, sql, rows):
+        table = self._table(sql)
+        columns = [column.strip('"') for column in re.search(r"\(([^)]*)\) VALUES", sql).group(1).split(", ")]
+        for row in rows:
+            values = dict(zip(columns, row))
+            values["metadata"] = values["metadata"].adapted
+            values["embedding"] = np.asarray(values["embedding"], dtype=np.float32)
+            table.rows[values["key"]] = values
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return list(self.result)
+
+    def _table(self, sql):
+        name = re.search(r"(?:FROM|INTO) (\w+)", sql).group(1)
+        return self.connection.pool.tables.setdefault(name, _FakeTable())
+
+    def _search(self, table, sql, params):
+        query, k = params[0], params[-1]
+        filters = params[1:-2]
+        where = re.search(r"WHERE (.*) ORDER BY", sql)
+        conditions = where.group(1).split(" AND ") if where else []
+
+        rows = list(table.rows.values())
+        similarities = [float(np.dot(row["embedding"], query)) for row in rows]
+        order = sorted(range(len(rows)), key=lambda i: -similarities[i])
+
+        index_type = self.connection.pool.index_type
+        exact = (
+            self.settings.get("enable_indexscan") == "off"
+            or self.settings.get(f"{index_type}.iterative_scan") in ("strict_order", "relaxed_order")
+        )
+        if not exact:
+            if index_type == "hnsw":
+                breadth = int(self.settings.get("hnsw.ef_search", 40))
+            else:
+                probes = int(self.settings.get("ivfflat.probes", 1))
+                breadth = -(-len(rows) * probes // self.connection.pool.lists)
+            order = order[:breadth]
+
+        matched = [i for i in order if self._matches(rows[i], conditions, filters)]
+        return [
+            (rows[i]["key"], similarities[i], rows[i]["embedding"], rows[i]["metadata"])
+            for i in matched[:k]
+        ]
+
+    @staticmethod
+    def _matches(row, conditions, filters):
+        filters = iter(filters)
+        for condition in conditions:
+            match = CONDITION.match(condition)
+            value = row.get(match.group("column"))
+            op = match.group("op")
+            if op == "IS NOT NULL":
+                if value is None:
+                    return False
+            elif op == ">=":
+                if not value >= next(filters):
+                    return False
+            elif op == "<=":
+                if not value <= next(filters):
+                    return False
+            elif op == "@>":
+                if not set(next(filters)) <= set(value):
+                    return False
+            elif not set(next(filters)) & set(value):
+                return False
+        return True
+
+
+class _FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+        self.settings = {}
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    # set_config(..., true)는 트랜잭션이 끝나면 해제
+    def commit(self):
+        self.settings = {}
+
+    def rollback(self):
+        self.settings = {}
+
+
+class _FakePool:
+    def __init__(self, extversion="0.7.4", index_type="hnsw", lists=100):
+        self.extversion = extversion
+        self.index_type = index_type
+        self.lists = lists
+        self.tables = {}
+
+    def getconn(self):
+        return _FakeConnection(self)
+
+    def putconn(self, connection):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_psycopg2(monkeypatch):
+    """upsert_many가 임포트하는 psycopg2.extras를 메모리 구현으로 대체"""
+    extras = types.ModuleType("psycopg2.extras")
+    extras.Json = _Json
+    extras.execute_values = _execute_values
+    package = types.ModuleType("psycopg2")
+    package.extras = extras
+    monkeypatch.setitem(sys.modules, "psycopg2", package)
+    monkeypatch.setitem(sys.modules, "psycopg2.extras", extras)
+
+
+def _make_index(extversion="0.7.4", index_type="hnsw", search_breadth=40):
+    pool = _FakePool(extversion=extversion, index_type=index_type, lists=20)
+    index = PgVectorIndex(
+        pool,
+        "test_embeddings",
+        dim=DIM,
+        index_type=index_type,
+        search_breadth=search_breadth,
+        numeric_fields=NUMERIC_FIELDS,
+        tag_fields=TAG_FIELDS
+    )
+    index.ivfflat_lists = pool.lists
+    return index
+
+
+def _dataset(size=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(size, DIM)).astype(np.float32)
+    regions = ["서울", "부산", "대구", "광주"]
+    skills = ["Python", "Java", "SQL", "React", "Docker"]
+    keys = [f"job-{i}" for i in range(size)]
+    metadatas = []
+    for i in range(size):
+        metadata = {
+            # 제주 공고는 전체의 2% - 근사 검색 후보에 거의 없음
+            "region": "제주" if i % 50 == 0 else regions[i % len(regions)],
+            "skills": list(rng.choice(skills, size=rng.integers(1, 4), replace=False)),
+        }
+        if i % 7:
+            metadata["experience"] = int(rng.integers(0, 15))
+        metadatas.append(metadata)
+    return keys, vectors, metadatas
+
+
+def _exact_top_k(keys, vectors, metadatas, query, k, predicate):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    similarities = normalized @ (query / np.linalg.norm(query))
+    order = np.argsort(-similarities, kind="stable")
+    return [keys[i] for i in order if predicate(metadatas[i])][:k]
+
+
+@pytest.mark.parametrize("extversion", ["0.7.4", "0.8.0"])
+@pytest.mark.parametrize("index_type", ["hnsw", "ivfflat"])
+def test_filtered_search_returns_k_rows(extversion, index_type):
+    """드문 필터 값도 검색 폭에 가려지지 않고 정확한 상위 k개 반환"""
+    index = _make_index(extversion=extversion, index_type=index_type, search_breadth=1 if index_type == "ivfflat" else 40)
+    keys, vectors, metadatas = _dataset()
+    index.upsert_many(keys, vectors, metadatas)
+
+    query = np.random.default_rng(1).normal(size=DIM).astype(np.float32)
+    results = index.search(query, 10, where={"tags": {"region": (["제주"], False)}})
+
+    expected = _exact_top_k(keys, vectors, metadatas, query, 10, lambda m: m["region"] == "제주")
+    assert len(results) == 10
+    assert [key for key, _, _, _ in results] == expected
+
+
+def test_filtered_search_returns_all_matches_when_fewer_than_k():
+    """필터를 통과한 행이 k개보다 적으면 있는 만큼만 반환"""
+    index = _make_index()
+    keys, vectors, metadatas = _dataset(size=500)
+    index.upsert_many(keys, vectors, metadatas)
+
+    results = index.search(vectors[0], 50, where={"tags": {"region": (["제주"], False)}})
+
+    assert len(results) == sum(1 for m in metadatas if m["region"] == "제주")
+
+
+def test_iterative_scan_detection():
+    """pgvector 0.8 이상에서만 iterative scan 사용"""
+    assert _make_index(extversion="0.8.0").iterative_scan
+    assert _make_index(extversion="0.10.1").iterative_scan
+    assert not _make_index(extversion="0.7.4").iterative_scan
+
+
+def test_upsert_and_delete():
+    """추가/덮어쓰기/배치 내 중복 키/삭제"""
+    index = _make_index()
+    vectors = np.eye(DIM, dtype=np.float32)[:3] * 2
+
+    index.upsert_many(["a", "b", "a"], vectors, [{"region": "서울"}, {"region": "부산"}, {"region": "대구"}])
+    assert len(index) == 2
+    assert "a" in index and "b" in index
+
+    # 같은 배치의 중복 키는 마지막 값 사용, 벡터는 정규화되어 저장
+    vector, metadata = index.get("a")
+    assert metadata == {"region": "대구"}
+    np.testing.assert_allclose(vector, np.eye(DIM)[2])
+
+    index.upsert("b", np.eye(DIM, dtype=np.float32)[5], {"region": "광주", "experience": 3})
+    assert index.get("b")[1] == {"region": "광주", "experience": 3}
+    assert [key for key, *_ in index.search(np.eye(DIM)[5], 1)] == ["b"]
+    assert [key for key, *_ in index.search(np.eye(DIM)[5], 5, where={"ranges": {"experience": (1, 5)}})] == ["b"]
+
+    version = index.version
+    assert index.delete("a")
+    assert not index.delete("a")
+    assert index.version == version + 1
+    assert len(index) == 1
+    assert "a" not in index
+    assert index.get("a") is None
+
+
+@pytest.mark.parametrize("where", [
+    None,
+    {"ranges": {"experience": (3, 8)}},
+    {"ranges": {"experience": (None, 2)}},
+    {"tags": {"region": (["제주", "부산"], False)}},
+    {"tags": {"skills": (["Python", "SQL"], True)}},
+    {"ranges": {"experience": (5, None)}, "tags": {"skills": (["Docker"], False)}},
+])
+def test_search_parity_with_vector_index(where):
+    """같은 데이터/필터에서 NumPy VectorIndex(정확 검색)와 같은 결과"""
+    keys, vectors, metadatas = _dataset(size=1500, seed=3)
+
+    pg_index = _make_index()
+    pg_index.upsert_many(keys, vectors, metadatas)
+    pg_index.delete("job-10")
+
+    np_index = VectorIndex(
+        dim=DIM,
+        exact_threshold=10 ** 6,
+        numeric_fields=NUMERIC_FIELDS,
+        tag_fields=TAG_FIELDS
+    )
+    np_index.upsert_many(keys, vectors, metadatas)
+    np_index.delete("job-10")
+
+    rng = np.random.default_rng(7)
+    for _ in range(5):
+        query = rng.normal(size=DIM).astype(np.float32)
+        pg_results = pg_index.search(query, 20, where=where)
+        np_results = np_index.search(query, 20, where=where)
+
+        assert [key for key, *_ in pg_results] == [key for key, *_ in np_results]
+        np.testing.assert_allclose(
+            [similarity for _, similarity, _, _ in pg_results],
+            [similarity for _, similarity, _, _ in np_results],
+            rtol=1e-5,
+            atol=1e-6
+        )